@@ -0,0 +1,82 @@
+"""
+Peak RSS and upload time of create_job for lists of synthetic addresses, against a local fake API server running in
+a separate process. Every measurement runs in a fresh interpreter so that peak RSS is not shared.
+
+    $ python benchmarks/bench_create_job.py --sizes 10000 1000000 5000000
+"""
+import argparse
+import json
+import multiprocessing
+import resource
+import subprocess
+import sys
+import time
+from neverbounce import NeverBounce
+from neverbounce.testing import FakeNeverBounceServer
+
+
+class CountingServer(FakeNeverBounceServer):
+    """
+    Fake server which only counts the uploaded emails instead of keeping them.
+    """
+    def handle_bulk(self, form):
+        job = super(CountingServer, self).handle_bulk(form)
+        self.jobs[job['job_id']] = []
+        return job
+
+
+def serve(queue):
+    server = CountingServer()
+    queue.put(server.base_url)
+    server.serve_forever()
+
+
+def synthetic_emails(size):
+    return ('user{}@example.com'.format(i) for i in range(size))
+
+
+def measure(base_url, size, mode):
+    client = NeverBounce('user', 'key', base_url)
+    start = time.time()
+    if mode == 'streamed':
+        client.create_job(synthetic_emails(size))
+    else:
+        emails = list(synthetic_emails(size))
+        client.session.post(base_url + '/bulk', {
+            'access_token': client.access_token(), 'input_location': '1', 'input': '\n'.join(emails)
+        })
+    elapsed = time.time() - start
+    max_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        max_rss_kb //= 1024
+    return {'mode': mode, 'size': size, 'seconds': round(elapsed, 3), 'peak_rss_mb': round(max_rss_kb / 1024.0, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 1000000, 5000000])
+    parser.add_argument('--worker', nargs=3, metavar=('BASE_URL', 'SIZE', 'MODE'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker:
+        base_url, size, mode = args.worker
+        print(json.dumps(measure(base_url, int(size), mode)))
+        return
+
+    queue = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(queue,))
+    server.daemon = True
+    server.start()
+    base_url = queue.get()
+    try:
+        print('{:>10} {:>10} {:>10} {:>14}'.format('size', 'mode', 'seconds', 'peak RSS (MB)'))
+        for size in args.sizes:
+            for mode in ('joined', 'streamed'):
+                output = subprocess.check_output([sys.executable, __file__, '--worker', base_url, str(size), mode])
+                result = json.loads(output.decode('utf-8'))
+                print('{size:>10} {mode:>10} {seconds:>10} {peak_rss_mb:>14}'.format(**result))
+    finally:
+        server.terminate()
+
+
+if __name__ == '__main__':
+    main()
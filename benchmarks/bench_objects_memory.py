@@ -0,0 +1,52 @@
+"""
+Memory footprint of verification results held in memory: bytes per result and pickled bytes per result, comparing
+dict-backed objects (as VerifiedEmail used to be) with the slot-based VerifiedEmail and the columnar ResultBatch.
+
+    $ python benchmarks/bench_objects_memory.py --rows 1000000
+"""
+import argparse
+import pickle
+import tracemalloc
+from neverbounce.objects import VerifiedEmail
+from neverbounce.results import ResultBatch
+
+
+class DictVerifiedEmail(object):
+    def __init__(self, email, result_code):
+        self.email = email
+        self.result_code = result_code
+
+
+def build_objects(cls, emails):
+    return [cls(email, i % 5) for i, email in enumerate(emails)]
+
+
+def build_batch(cls, emails):
+    batch = ResultBatch()
+    batch.extend([(email, i % 5) for i, email in enumerate(emails)])
+    return batch
+
+
+def measure(name, build, cls, emails):
+    tracemalloc.start()
+    results = build(cls, emails)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    pickled = len(pickle.dumps(results, pickle.HIGHEST_PROTOCOL))
+    print('{:>16} {:>16.1f} {:>16.1f}'.format(name, size / float(len(emails)), pickled / float(len(emails))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1000000)
+    args = parser.parse_args()
+    emails = ['user{}@example.com'.format(i) for i in range(args.rows)]
+    print('Excluding the email strings shared by all representations.')
+    print('{:>16} {:>16} {:>16}'.format('representation', 'bytes/result', 'pickled/result'))
+    measure('dict objects', build_objects, DictVerifiedEmail, emails)
+    measure('slot objects', build_objects, VerifiedEmail, emails)
+    measure('result batch', build_batch, None, emails)
+
+
+if __name__ == '__main__':
+    main()
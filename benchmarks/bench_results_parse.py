@@ -0,0 +1,74 @@
+"""
+Parse throughput (rows/sec) and allocations (peak traced bytes) of the bulk results download, comparing the previous
+line by line implementation with the chunked parser.
+
+    $ python benchmarks/bench_results_parse.py --rows 1000000
+"""
+import argparse
+import time
+import tracemalloc
+from collections import namedtuple
+from neverbounce.objects import VerifiedEmail
+from neverbounce.results import CHUNK_SIZE, iter_batches, iter_rows
+
+TEXT_CODES = VerifiedEmail.text_codes
+
+
+def synthetic_results(rows):
+    return b''.join('user{}@example.com,{}\n'.format(i, TEXT_CODES[i % 5]).encode('ascii') for i in range(rows))
+
+
+def chunks(data):
+    return (data[i:i + CHUNK_SIZE] for i in range(0, len(data), CHUNK_SIZE))
+
+
+def lines(data):
+    return iter(data.splitlines())
+
+
+def legacy_objects(data):
+    Row = namedtuple('Row', ['email', 'result_text_code'])
+    for line in lines(data):
+        row = Row(*line.decode('utf-8').split(','))
+        yield VerifiedEmail.from_text_code(row.email, row.result_text_code)
+
+
+def objects(data):
+    return (VerifiedEmail(email, result_code) for email, result_code in iter_rows(chunks(data)))
+
+
+def tuples(data):
+    return iter_rows(chunks(data))
+
+
+def batches(data):
+    return iter_batches(chunks(data))
+
+
+def measure(name, parse, data, rows):
+    start = time.time()
+    for _ in parse(data):
+        pass
+    elapsed = time.time() - start
+    tracemalloc.start()
+    for _ in parse(data):
+        pass
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print('{:>16} {:>14,.0f} {:>14,}'.format(name, rows / elapsed, peak))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1000000)
+    args = parser.parse_args()
+    data = synthetic_results(args.rows)
+    print('{:>16} {:>14} {:>14}'.format('parser', 'rows/sec', 'peak bytes'))
+    measure('legacy objects', legacy_objects, data, args.rows)
+    measure('objects', objects, data, args.rows)
+    measure('tuples', tuples, data, args.rows)
+    measure('batches', batches, data, args.rows)
+
+
+if __name__ == '__main__':
+    main()
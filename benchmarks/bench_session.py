@@ -0,0 +1,33 @@
+"""
+Realtime verify throughput with and without connection reuse, against a local fake API server.
+
+    $ python benchmarks/bench_session.py --calls 2000
+"""
+import argparse
+import time
+from neverbounce import NeverBounce
+from neverbounce.testing import FakeNeverBounceServer
+
+
+def run(base_url, calls, keep_alive):
+    with NeverBounce('user', 'key', base_url, keep_alive=keep_alive) as client:
+        client.access_token()
+        start = time.time()
+        for _ in range(calls):
+            client.verify('john.doe@example.com')
+        return calls / (time.time() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--calls', type=int, default=1000)
+    args = parser.parse_args()
+    with FakeNeverBounceServer() as server:
+        before = run(server.base_url, args.calls, keep_alive=False)
+        after = run(server.base_url, args.calls, keep_alive=True)
+    print('new connection per call: {:8.1f} req/s'.format(before))
+    print('pooled keep-alive:       {:8.1f} req/s'.format(after))
+
+
+if __name__ == '__main__':
+    main()
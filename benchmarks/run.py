@@ -0,0 +1,258 @@
+"""
+Benchmark suite of the client against a local fake API server running in a separate process. Measures realtime
+verify throughput and tail latency at several concurrencies, create_job upload time and peak RSS by list size,
+results parse throughput, multiprocess post-processing throughput of a results file, JobStatus construction
+cost and the import time of the package. The results are written as JSON and can be compared with
+the results of another commit. Run it from the root of the repository:
+
+    $ python -m benchmarks.run --output before.json
+    $ python -m benchmarks.run --latency 0.005 --error-rate 0.01 --compare before.json
+"""
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from concurrent.futures import ThreadPoolExecutor
+from neverbounce import NeverBounce, NeverBounceAPIError
+from neverbounce.objects import JobStatus
+from neverbounce.parallel import CountReducer, process_results
+from neverbounce.testing import FakeNeverBounceServer
+
+JOB_STATUS_RESPONSE = {
+    'success': True, 'id': '123456', 'status': '4', 'type': '1', 'orig_name': 'emails.csv',
+    'created': '2016-01-16 04:05:59', 'started': '2016-01-16 04:06:10', 'finished': '2016-01-16 04:06:14',
+    'stats': {'total': 100, 'processed': 100, 'valid': 80, 'invalid': 10, 'catchall': 5, 'disposable': 3,
+              'unknown': 2, 'duplicates': 0, 'bad_syntax': 0, 'billable': 100, 'job_time': 4},
+    'execution_time': 0.01,
+}
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The workers import the package from the same checkout
+WORKER_ENV = dict(os.environ, PYTHONPATH=ROOT)
+
+
+def serve(queue, latency, error_rate):
+    server = FakeNeverBounceServer()
+    server.latency = latency
+    server.error_rate = error_rate
+    queue.put(server.base_url)
+    server.serve_forever()
+
+
+def synthetic_emails(size):
+    return ('user{}@example.com'.format(i) for i in range(size))
+
+
+def create_job(client, size):
+    """
+    Create a job, repeating the upload if the fake server injects an error.
+    """
+    while True:
+        try:
+            return client.create_job(synthetic_emails(size))
+        except NeverBounceAPIError:
+            pass
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100.0 * (len(values) - 1))))]
+
+
+def bench_verify(base_url, calls, concurrency):
+    latencies, errors = [], [0]
+
+    def verify(email):
+        start = time.time()
+        try:
+            client.verify(email)
+        except NeverBounceAPIError:
+            errors[0] += 1
+        latencies.append(time.time() - start)
+
+    with NeverBounce('user', 'key', base_url, pool_maxsize=concurrency) as client:
+        client.access_token()
+        start = time.time()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(verify, synthetic_emails(calls)))
+        elapsed = time.time() - start
+    return {
+        'calls_per_second': round(calls / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p90_ms': round(percentile(latencies, 90) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+        'errors': errors[0],
+    }
+
+
+def bench_create_job(base_url, size):
+    """
+    Runs in a fresh interpreter so that peak RSS is not shared with other benchmarks.
+    """
+    import resource  # Not available on Windows
+    client = NeverBounce('user', 'key', base_url)
+    client.access_token()
+    start = time.time()
+    create_job(client, size)
+    elapsed = time.time() - start
+    max_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        max_rss_kb //= 1024
+    return {'seconds': round(elapsed, 3), 'emails_per_second': round(size / elapsed, 1),
+            'peak_rss_mb': round(max_rss_kb / 1024.0, 1)}
+
+
+def bench_results(base_url, rows):
+    with NeverBounce('user', 'key', base_url) as client:
+        job_id = create_job(client, rows).job_id
+        metrics = {}
+        for name, method in (('rows', client.result_rows), ('objects', client.results)):
+            start = time.time()
+            count = sum(1 for _ in method(job_id))
+            metrics['{}_per_second'.format(name)] = round(count / (time.time() - start), 1)
+    return metrics
+
+
+def email_domain(email, result_code):
+    return email[email.find('@') + 1:]
+
+
+def bench_process_results(rows, processes):
+    fd, path = tempfile.mkstemp(suffix='.csv')
+    try:
+        with io.open(fd, 'w', newline='') as f:
+            for start in range(0, rows, 10000):
+                f.write(''.join('user{},user{}@example{}.com,valid\n'.format(i, i, i % 100)
+                                for i in range(start, min(start + 10000, rows))))
+        metrics = {}
+        for count in processes:
+            start = time.time()
+            process_results(path, email_domain, CountReducer(), processes=count, email_column=1)
+            metrics['rows_per_second[processes={}]'.format(count)] = round(rows / (time.time() - start), 1)
+        return metrics
+    finally:
+        os.remove(path)
+
+
+def bench_job_status(number):
+    seconds = min(timeit.repeat(lambda: JobStatus.from_response(JOB_STATUS_RESPONSE), number=number, repeat=3))
+    job_status = JobStatus.from_response(JOB_STATUS_RESPONSE)
+    access = min(timeit.repeat(lambda: (job_status.created, job_status.stats, job_status.is_completed),
+                               number=number, repeat=3))
+    return {'construct_us': round(seconds / number * 1e6, 3), 'construct_and_access_us':
+            round((seconds + access) / number * 1e6, 3)}
+
+
+def bench_import(repeat):
+    """
+    Cumulative import time of the package and the client in fresh interpreters, the fastest of the runs.
+    """
+    metrics = {}
+    for name, statement in (('package', 'import neverbounce'), ('client', 'from neverbounce import NeverBounce')):
+        times = []
+        for _ in range(repeat):
+            output = subprocess.check_output([sys.executable, '-X', 'importtime', '-c', statement],
+                                             env=WORKER_ENV, stderr=subprocess.STDOUT).decode('utf-8')
+            times.append(sum(int(line.split('|')[1]) for line in output.splitlines()
+                             if line.startswith('import time:') and line.split('|')[2].startswith(' neverbounce')))
+        metrics['{}_ms'.format(name)] = round(min(times) / 1000.0, 2)
+    return metrics
+
+
+def run_worker(base_url, size):
+    output = subprocess.check_output([sys.executable, __file__, '--worker', base_url, str(size)], env=WORKER_ENV)
+    return json.loads(output.decode('utf-8'))
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD']).decode('ascii').strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, stream):
+    """
+    Print the change of every metric relative to the baseline results.
+    """
+    previous = dict((result['name'], result['metrics']) for result in baseline['results'])
+    row = '{:<32} {:<24} {:>12} {:>12} {:>8}\n'
+    stream.write(row.format('benchmark', 'metric', 'baseline', 'current', 'change'))
+    for result in results['results']:
+        for metric, value in sorted(result['metrics'].items()):
+            before = previous.get(result['name'], {}).get(metric)
+            change = '{:+.1%}'.format(value / float(before) - 1) if before else ''
+            stream.write(row.format(result['name'], metric, before, value, change))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--latency', type=float, default=0, help='Seconds the fake server delays every response.')
+    parser.add_argument('--error-rate', type=float, default=0, help='Fraction of failed requests.')
+    parser.add_argument('--calls', type=int, default=2000, help='Number of verify calls per concurrency.')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16, 64])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000],
+                        help='List sizes of create_job.')
+    parser.add_argument('--rows', type=int, default=200000, help='Number of rows of the results.')
+    parser.add_argument('--process-rows', type=int, default=1000000,
+                        help='Number of rows of the results file processed in parallel.')
+    parser.add_argument('--processes', type=int, nargs='+', default=[1, 2, 4],
+                        help='Numbers of worker processes of the parallel processing.')
+    parser.add_argument('--job-statuses', type=int, default=100000, help='Number of JobStatus objects.')
+    parser.add_argument('--output', help='Path to write the JSON results to, stdout by default.')
+    parser.add_argument('--compare', help='Path to JSON results to compare with.')
+    parser.add_argument('--worker', nargs=2, metavar=('BASE_URL', 'SIZE'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker:
+        print(json.dumps(bench_create_job(args.worker[0], int(args.worker[1]))))
+        return
+
+    queue = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(queue, args.latency, args.error_rate))
+    server.daemon = True
+    server.start()
+    base_url = queue.get()
+    results = []
+    try:
+        for concurrency in args.concurrency:
+            results.append({'name': 'verify[concurrency={}]'.format(concurrency),
+                            'metrics': bench_verify(base_url, args.calls, concurrency)})
+        for size in args.sizes:
+            results.append({'name': 'create_job[size={}]'.format(size), 'metrics': run_worker(base_url, size)})
+        results.append({'name': 'results[rows={}]'.format(args.rows), 'metrics': bench_results(base_url, args.rows)})
+    finally:
+        server.terminate()
+    results.append({'name': 'process_results[rows={}]'.format(args.process_rows),
+                    'metrics': bench_process_results(args.process_rows, args.processes)})
+    results.append({'name': 'job_status', 'metrics': bench_job_status(args.job_statuses)})
+    results.append({'name': 'import', 'metrics': bench_import(5)})
+
+    report = {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': int(time.time()),
+        'server': {'latency': args.latency, 'error_rate': args.error_rate},
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+    else:
+        json.dump(report, sys.stdout, indent=2, sort_keys=True)
+        sys.stdout.write('\n')
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f), sys.stdout if args.output else sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
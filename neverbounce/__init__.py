@@ -1,4 +1,33 @@
-from neverbounce.client import NeverBounce
-from neverbounce.exceptions import NeverBounceAPIError
+import sys
+from importlib import import_module
 
 __version__ = '0.2.0'
+
+# Attributes imported on first access, so that importing the package (eg. for the result objects) doesn't import the
+# HTTP stack
+_LAZY_ATTRIBUTES = {
+    'NeverBounce': 'neverbounce.client',
+    'NeverBounceAPIError': 'neverbounce.exceptions',
+    'NeverBounceClientPool': 'neverbounce.pool',
+}
+
+__all__ = sorted(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
+if sys.version_info < (3, 7):  # Module __getattr__ is not supported
+    from neverbounce.client import NeverBounce  # noqa: F401
+    from neverbounce.exceptions import NeverBounceAPIError  # noqa: F401
+    from neverbounce.pool import NeverBounceClientPool  # noqa: F401
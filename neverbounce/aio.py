@@ -0,0 +1,251 @@
+"""
+Asyncio NeverBounce API client, requires the `aiohttp` library (`pip install neverbounce[async]`).
+"""
+import asyncio
+import base64
+import json
+from neverbounce.client import NeverBounce
+from neverbounce.exceptions import AccessTokenExpired, InvalidResponseError
+from neverbounce.objects import Job, JobStatus, Account, VerifiedEmail
+from neverbounce.results import CHUNK_SIZE, ResultsParser
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class AsyncNeverBounce(object):
+    """
+    Asyncio NeverBounce API client with the same API as NeverBounce, all the methods are coroutines.
+    """
+    def __init__(self, api_username, api_key, base_url='https://api.neverbounce.com/v3', session=None,
+                 max_concurrency=10, timeout=None):
+        """
+        :param str api_username: API username.
+        :param str api_key: API secret key.
+        :param str base_url: Base URL of the API.
+        :param ClientSession session: An aiohttp session to use instead of creating a new one. It is not closed by
+            the client.
+        :param int max_concurrency: Maximum number of API calls in flight at the same time.
+        :param float timeout: Default total timeout in seconds for every call.
+        """
+        if aiohttp is None:
+            raise ImportError('AsyncNeverBounce requires the aiohttp library.')
+        self.api_username = api_username
+        self.api_key = api_key
+        self.base_url = base_url
+        self.timeout = timeout
+        self.session = session
+        self._owns_session = session is None
+        self._cached_access_token = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._access_token_lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        """
+        Close the session owned by the client.
+        """
+        if self._owns_session and self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def verify(self, email):
+        """
+        Verify a single email address.
+        :param str email: Email address to verify.
+        :return: A VerifiedEmail object.
+        """
+        resp = await self._call(endpoint='single', data={'email': email})
+        return VerifiedEmail(email, resp['result'])
+
+    async def create_job(self, emails):
+        """
+        Create a new bulk verification job for the list of emails.
+        :param list emails: Email addresses to verify.
+        :return: A Job object.
+        """
+        resp = await self._call(endpoint='bulk', data={'input_location': '1', 'input': '\n'.join(emails)})
+        return Job(resp['job_id'])
+
+    async def check_job(self, job_id):
+        """
+        Check the status of a bulk verification job.
+        :param int job_id: ID of a job to check the status of.
+        :return: A JobStatus object.
+        """
+        resp = await self._call(endpoint='status', data={'job_id': job_id})
+        return JobStatus.from_response(resp)
+
+    async def results(self, job_id):
+        """
+        Asynchronously yield the result of a completed bulk verification job.
+        :param int job_id: ID of a job to retrieve the results for.
+        :yields: The next VerifiedEmail objects.
+        """
+        async with self._semaphore:
+            response = await self._open_stream(endpoint='download', data={'job_id': job_id})
+            try:
+                parser = ResultsParser()
+                async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                    for email, result_code in parser.feed(chunk):
+                        yield VerifiedEmail(email, result_code)
+                for email, result_code in parser.close():
+                    yield VerifiedEmail(email, result_code)
+            finally:
+                response.release()
+
+    async def account(self):
+        """
+        Get the API account details like balance of credits.
+        :return: An Account object.
+        """
+        resp = await self._call(endpoint='account')
+        return Account(resp['credits'], resp['jobs_completed'], resp['jobs_processing'])
+
+    async def access_token(self):
+        """
+        Retrieve and cache an access token to authenticate API calls. Concurrent callers share a single request.
+        :return: An access token string.
+        """
+        if self._cached_access_token is not None:
+            return self._cached_access_token
+        async with self._access_token_lock:
+            if self._cached_access_token is None:
+                # Not subject to the concurrency limit, callers may be holding it while the token is refreshed.
+                response = await self._post(
+                    endpoint='access_token', data={'grant_type': 'client_credentials', 'scope': 'basic user'},
+                    headers={'Authorization': self._basic_auth()}
+                )
+                try:
+                    resp = await self._read_response(response)
+                finally:
+                    response.release()
+                self._cached_access_token = resp['access_token']
+        return self._cached_access_token
+
+    def _basic_auth(self):
+        """
+        :return: HTTP basic auth header value for the API credentials.
+        """
+        credentials = '{}:{}'.format(self.api_username, self.api_key).encode('latin1')
+        return 'Basic {}'.format(base64.b64encode(credentials).decode('ascii'))
+
+    def _expire_access_token(self, token):
+        """
+        Forget the cached access token if it's still the one that expired.
+        :param str token: The expired access token.
+        """
+        if self._cached_access_token == token:
+            self._cached_access_token = None
+
+    async def _call(self, endpoint, data=None):
+        """
+        Make an authorized API call to specified endpoint.
+        :param str endpoint: API endpoint's relative URL, eg. `/account`.
+        :param dict data: POST request data.
+        :return: A dictionary with response data.
+        """
+        data = {} if data is None else data
+        token = await self.access_token()
+        try:
+            data['access_token'] = token
+            return await self._request(endpoint, data)
+        except AccessTokenExpired:
+            self._expire_access_token(token)
+            data['access_token'] = await self.access_token()
+            return await self._request(endpoint, data)
+
+    async def _request(self, endpoint, data):
+        """
+        Make HTTP POST request to an API endpoint.
+        :param str endpoint: API endpoint's relative URL, eg. `/account`.
+        :param dict data: POST request data.
+        :return: A dictionary with response data.
+        """
+        async with self._semaphore:
+            response = await self._post(endpoint, data)
+            try:
+                return await self._read_response(response)
+            finally:
+                response.release()
+
+    async def _open_stream(self, endpoint, data):
+        """
+        Make an authorized API call to an endpoint which responds with an octet-stream.
+        :param str endpoint: API endpoint's relative URL, eg. `/download`.
+        :param dict data: POST request data.
+        :return: An unread ClientResponse, it has to be released by the caller.
+        """
+        for attempt in range(2):
+            token = await self.access_token()
+            data['access_token'] = token
+            response = await self._post(endpoint, data)
+            if response.content_type == 'application/octet-stream':
+                return response
+            try:
+                await self._read_response(response)
+            except AccessTokenExpired:
+                if attempt:
+                    raise
+                self._expire_access_token(token)
+                continue
+            finally:
+                response.release()
+            raise InvalidResponseError('Failed to handle the response content-type {}.'.format(
+                response.headers.get('Content-Type'))
+            )
+
+    async def _post(self, endpoint, data, headers=None):
+        """
+        Send HTTP POST request to an API endpoint.
+        :param str endpoint: API endpoint's relative URL, eg. `/account`.
+        :param dict data: POST request data.
+        :param dict headers: Additional HTTP headers.
+        :return: An unread ClientResponse.
+        """
+        if self.session is None:
+            self.session = aiohttp.ClientSession()
+        url = '{}/{}'.format(self.base_url, endpoint)
+        kwargs = {} if self.timeout is None else {'timeout': aiohttp.ClientTimeout(total=self.timeout)}
+        return await self.session.post(url, data=data, headers=headers, **kwargs)
+
+    @staticmethod
+    async def _read_response(response):
+        """
+        Read the whole response and handle it the same way as the synchronous client.
+        :param ClientResponse response: Response data.
+        :return: A dictionary with response data.
+        """
+        body = await response.read()
+        return NeverBounce._handle_response(BufferedResponse(response.status, response.headers, body))
+
+
+class BufferedResponse(object):
+    """
+    Adapts a fully read aiohttp response to the parts of the requests Response interface used by the response
+    handling.
+    """
+    def __init__(self, status_code, headers, content):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    def json(self):
+        return json.loads(self.content.decode('utf-8'))
+
+    def iter_content(self, chunk_size=1):
+        return iter([self.content])
+
+    def close(self):
+        pass
@@ -0,0 +1,202 @@
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from neverbounce.objects import VerifiedEmail
+
+DAY = 24 * 60 * 60
+
+DEFAULT_TTLS = {
+    'valid': 30 * DAY,
+    'invalid': 30 * DAY,
+    'disposable': 30 * DAY,
+    'catchall': DAY,
+    'unknown': 60 * 60,
+}
+
+
+def normalize_email(email):
+    """
+    :param str email: Email address.
+    :return: The email address without surrounding whitespace, in lower case.
+    """
+    return email.strip().lower()
+
+
+class ResultCache(object):
+    """
+    Base class of the caches of verification results. Each result is kept for the time to live of its result class,
+    hits, misses and evictions are counted.
+    """
+    def __init__(self, ttls=None):
+        """
+        :param dict ttls: Time to live in seconds by result text code (eg. valid, unknown), results without a TTL
+            are not cached. Defaults to DEFAULT_TTLS.
+        """
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, email):
+        """
+        :param str email: Email address.
+        :return: A cached VerifiedEmail object or None.
+        """
+        key = normalize_email(email)
+        with self._lock:
+            cached = self._load(key)
+            if cached is not None and cached[1] <= time.time():
+                self._delete(key)
+                self.evictions += 1
+                cached = None
+            if cached is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return VerifiedEmail(email, cached[0])
+
+    def set(self, verified_email):
+        """
+        :param VerifiedEmail verified_email: Result to cache.
+        """
+        ttl = self.ttls.get(verified_email.result_text)
+        if not ttl:
+            return
+        with self._lock:
+            self._store(normalize_email(verified_email.email), verified_email.result_code, time.time() + ttl)
+
+    def set_many(self, verified_emails):
+        """
+        Cache a batch of results at once, eg. the results of a bulk job.
+        :param iterable verified_emails: VerifiedEmail objects to cache.
+        """
+        now = time.time()
+        entries = []
+        for verified_email in verified_emails:
+            ttl = self.ttls.get(verified_email.result_text)
+            if ttl:
+                entries.append((normalize_email(verified_email.email), verified_email.result_code, now + ttl))
+        if entries:
+            with self._lock:
+                self._store_many(entries)
+
+    @property
+    def stats(self):
+        """
+        :return: A dictionary with the number of hits, misses and evictions.
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+    def _load(self, key):
+        """
+        :return: A tuple of the result code and expiry timestamp, or None.
+        """
+        raise NotImplementedError
+
+    def _store(self, key, result_code, expires_at):
+        raise NotImplementedError
+
+    def _store_many(self, entries):
+        """
+        :param list entries: Tuples of the key, result code and expiry timestamp.
+        """
+        for entry in entries:
+            self._store(*entry)
+
+    def _delete(self, key):
+        raise NotImplementedError
+
+
+class MemoryResultCache(ResultCache):
+    """
+    In-memory cache which evicts the least recently used results when full.
+    """
+    def __init__(self, maxsize=100000, ttls=None):
+        """
+        :param int maxsize: Maximum number of cached results.
+        :param dict ttls: Time to live in seconds by result text code.
+        """
+        super(MemoryResultCache, self).__init__(ttls)
+        self.maxsize = maxsize
+        self._results = OrderedDict()
+
+    def __len__(self):
+        return len(self._results)
+
+    def _load(self, key):
+        cached = self._results.get(key)
+        if cached is not None:
+            self._results[key] = self._results.pop(key)
+        return cached
+
+    def _store(self, key, result_code, expires_at):
+        self._results.pop(key, None)
+        self._results[key] = (result_code, expires_at)
+        while len(self._results) > self.maxsize:
+            self._results.popitem(last=False)
+            self.evictions += 1
+
+    def _delete(self, key):
+        del self._results[key]
+
+
+class SQLiteResultCache(ResultCache):
+    """
+    Cache persisted in an SQLite database, it survives restarts and can be shared by processes. The database is in
+    WAL mode, so readers don't block the writer, and batches of results are stored in a single transaction.
+    """
+    def __init__(self, path, ttls=None):
+        """
+        :param str path: Path to the database file.
+        :param dict ttls: Time to live in seconds by result text code.
+        """
+        super(SQLiteResultCache, self).__init__(ttls)
+        self.path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS results (email TEXT PRIMARY KEY, result_code INTEGER, expires_at REAL)'
+        )
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+
+    def close(self):
+        self._connection.close()
+
+    def purge(self):
+        """
+        Delete all the expired results.
+        """
+        with self._lock:
+            cursor = self._connection.execute('DELETE FROM results WHERE expires_at <= ?', (time.time(),))
+            self.evictions += cursor.rowcount
+
+    def _load(self, key):
+        return self._connection.execute(
+            'SELECT result_code, expires_at FROM results WHERE email = ?', (key,)
+        ).fetchone()
+
+    def _store(self, key, result_code, expires_at):
+        self._connection.execute(
+            'INSERT OR REPLACE INTO results (email, result_code, expires_at) VALUES (?, ?, ?)',
+            (key, result_code, expires_at)
+        )
+
+    def _store_many(self, entries):
+        self._connection.execute('BEGIN')
+        try:
+            self._connection.executemany(
+                'INSERT OR REPLACE INTO results (email, result_code, expires_at) VALUES (?, ?, ?)', entries
+            )
+        except Exception:
+            self._connection.execute('ROLLBACK')
+            raise
+        self._connection.execute('COMMIT')
+
+    def _delete(self, key):
+        self._connection.execute('DELETE FROM results WHERE email = ?', (key,))
@@ -0,0 +1,220 @@
+"""
+Verify a list of emails from a CSV, TSV or plain text file (or stdin) and write the results as they arrive.
+
+    $ neverbounce emails.csv --column email -o verified.csv
+
+Small lists are verified in realtime, each row is written with the result appended as the last column. Lists of at
+least --bulk-threshold emails are verified with bulk jobs, each unique email is written with its result. The input
+is streamed so memory use doesn't grow with its size. With --resume an interrupted run continues after the results
+already written to the output file.
+"""
+import argparse
+import io
+import itertools
+import os
+import sys
+import time
+from collections import deque
+from neverbounce import csvio
+from neverbounce.client import NeverBounce
+from neverbounce.objects import FailedVerification
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='neverbounce', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('input', nargs='?', default='-', help='Input file, stdin by default.')
+    parser.add_argument('-o', '--output', default='-', help='Output file, stdout by default.')
+    parser.add_argument('--api-username', default=os.environ.get('NEVERBOUNCE_API_USERNAME'),
+                        help='Defaults to the NEVERBOUNCE_API_USERNAME environment variable.')
+    parser.add_argument('--api-key', default=os.environ.get('NEVERBOUNCE_API_KEY'),
+                        help='Defaults to the NEVERBOUNCE_API_KEY environment variable.')
+    parser.add_argument('--base-url', default='https://api.neverbounce.com/v3')
+    parser.add_argument('--column', default='0', help='Index or header name of the email column.')
+    parser.add_argument('--delimiter', help='Column delimiter, detected from the first line by default.')
+    parser.add_argument('--header', action='store_true', default=None, help='The first row is a header.')
+    parser.add_argument('--no-header', action='store_false', dest='header', help='There is no header row.')
+    parser.add_argument('--mode', choices=('auto', 'realtime', 'bulk'), default='auto')
+    parser.add_argument('--bulk-threshold', type=int, default=1000,
+                        help='Minimum number of emails verified with bulk jobs in auto mode.')
+    parser.add_argument('--workers', type=int, default=10, help='Concurrent realtime verifications.')
+    parser.add_argument('--rate-limit', type=float, help='Maximum number of API calls per second.')
+    parser.add_argument('--chunk-size', type=int, default=50000, help='Number of emails per bulk job.')
+    parser.add_argument('--parallel-jobs', type=int, default=4, help='Maximum number of bulk jobs in progress.')
+    parser.add_argument('--resume', action='store_true', help='Continue after the results in the output file.')
+    parser.add_argument('--quiet', action='store_true', help='Don\'t report the progress on stderr.')
+    args = parser.parse_args(argv)
+    if not args.api_username or not args.api_key:
+        parser.error('the API username and key are required')
+    if args.resume and args.output == '-':
+        parser.error('--resume requires an --output file')
+    return args
+
+
+class Progress(object):
+    """
+    Reports the number of verified emails and the throughput on stderr, at most once a second.
+    """
+    def __init__(self, stream=None, interval=1.0):
+        self.stream = stream
+        self.interval = interval
+        self.count = 0
+        self._start = time.time()
+        self._reported = self._start
+
+    def update(self, count=1):
+        self.count += count
+        now = time.time()
+        if self.stream is not None and now - self._reported >= self.interval:
+            self._reported = now
+            self._report(now)
+
+    def close(self):
+        if self.stream is not None:
+            self._report(time.time())
+            self.stream.write('\n')
+
+    def _report(self, now):
+        rate = self.count / max(now - self._start, 1e-6)
+        self.stream.write('\r{} emails verified, {:.1f}/s'.format(self.count, rate))
+        self.stream.flush()
+
+
+def open_input(path):
+    if path == '-':
+        return io.open(sys.stdin.fileno(), encoding='utf-8', newline='', closefd=False)
+    return io.open(path, encoding='utf-8', newline='')
+
+
+def read_rows(f, delimiter=None, header=None, column='0'):
+    """
+    :param file f: Input file.
+    :param str delimiter: Column delimiter, detected from the first line if not set.
+    :param bool header: The first row is a header, detected from the email column if not set.
+    :param str column: Index or header name of the email column.
+    :return: A tuple of the header row (None if there is none), the index of the email column and an iterator of
+        the rows.
+    """
+    first = f.readline()
+    if delimiter is None:
+        delimiter = '\t' if '\t' in first else ','
+    rows = csvio.reader(itertools.chain([first], f), delimiter=delimiter)
+    first_row = next(rows, None)
+    if first_row is None:
+        return None, 0, iter(())
+    if column.isdigit():
+        index = int(column)
+        if header is None:
+            header = index >= len(first_row) or '@' not in first_row[index]
+    else:
+        header = True
+        try:
+            index = first_row.index(column)
+        except ValueError:
+            raise SystemExit('neverbounce: column {!r} not found in the header'.format(column))
+    if header:
+        return first_row, index, rows
+    return None, index, itertools.chain([first_row], rows)
+
+
+def resume_output(path, bulk, header):
+    """
+    Drop an incomplete last line of the output file.
+    :param str path: Path to the output file.
+    :param bool bulk: The output holds bulk results.
+    :param bool header: The output starts with a header row.
+    :return: Number of result rows in the output, or with `bulk` a set of emails already verified.
+    """
+    if not os.path.exists(path):
+        return set() if bulk else 0
+    with io.open(path, 'r+b') as f:
+        end = f.seek(0, os.SEEK_END)
+        while end > 0:
+            f.seek(max(0, end - 64 * 1024))
+            block = f.read(end - f.tell())
+            newline = block.rfind(b'\n')
+            if newline >= 0:
+                end = end - len(block) + newline + 1
+                break
+            end -= len(block)
+        f.truncate(end)
+    with io.open(path, encoding='utf-8', newline='') as f:
+        rows = csvio.reader(f)
+        if header:
+            next(rows, None)
+        if bulk:
+            return set(row[0] for row in rows if row)
+        return sum(1 for _ in rows)
+
+
+def verify_realtime(neverbounce, rows, index, writer, progress, workers):
+    """
+    Verify the emails of the rows in realtime and write each row with the result appended.
+    """
+    in_flight = deque()
+
+    def emails():
+        for row in rows:
+            if not row:
+                continue
+            in_flight.append(row)
+            yield row[index] if index < len(row) else ''
+
+    for result in neverbounce.verify_many(emails(), max_workers=workers):
+        row = in_flight.popleft()
+        if isinstance(result, FailedVerification):
+            writer.writerow(row + ['error: {}'.format(result.error)])
+        else:
+            writer.writerow(row + [result.result_text])
+        progress.update()
+
+
+def verify_bulk(neverbounce, emails, writer, progress, chunk_size, parallel_jobs):
+    """
+    Verify the emails with bulk jobs and write each unique email with its result.
+    """
+    for verified_email in neverbounce.verify_bulk(emails, chunk_size, parallel_jobs):
+        writer.writerow([verified_email.email, verified_email.result_text])
+        progress.update()
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    neverbounce = NeverBounce(args.api_username, args.api_key, args.base_url, rate_limit=args.rate_limit,
+                              pool_maxsize=max(10, args.workers))
+    with neverbounce, open_input(args.input) as input_file:
+        header, index, rows = read_rows(input_file, args.delimiter, args.header, args.column)
+        # Blank lines are neither verified nor written, they're dropped before the rows are counted for --resume
+        rows = (row for row in rows if row)
+        bulk = args.mode == 'bulk'
+        if args.mode == 'auto':
+            head = list(itertools.islice(rows, args.bulk_threshold))
+            bulk = len(head) >= args.bulk_threshold
+            rows = itertools.chain(head, rows)
+        done = resume_output(args.output, bulk, bulk or header is not None) if args.resume else None
+        if args.output == '-':
+            output = io.open(sys.stdout.fileno(), 'w', encoding='utf-8', newline='', closefd=False)
+        else:
+            output = io.open(args.output, 'a' if done else 'w', encoding='utf-8', newline='')
+        progress = Progress(None if args.quiet else sys.stderr)
+        with output:
+            writer = csvio.writer(output, delimiter=',', lineterminator='\n')
+            if bulk:
+                if not done:
+                    writer.writerow(['email', 'result'])
+                emails = (row[index] for row in rows if index < len(row))
+                if done:
+                    emails = (email for email in emails if email.strip() not in done)
+                verify_bulk(neverbounce, emails, writer, progress, args.chunk_size, args.parallel_jobs)
+            else:
+                if header is not None and not done:
+                    writer.writerow(header + ['result'])
+                if done:
+                    rows = itertools.islice(rows, done, None)
+                verify_realtime(neverbounce, rows, index, writer, progress, args.workers)
+        progress.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
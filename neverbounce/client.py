@@ -1,19 +1,130 @@
-import requests
+import functools
+import itertools
+import sys
+import threading
+import time
 import warnings
-from collections import namedtuple
-from neverbounce.exceptions import AccessTokenExpired, NeverBounceAPIError, InvalidResponseError
-from neverbounce.objects import Job, JobStatus, Account, VerifiedEmail
+from collections import deque
+from contextlib import contextmanager
+from itertools import islice
+from neverbounce.exceptions import AccessTokenExpired, CircuitOpenError, NeverBounceAPIError, InvalidResponseError, \
+    UnconfirmedJobError
+from neverbounce.instrumentation import RequestInfo, timer
+from neverbounce.objects import Job, JobStatus, Account, VerifiedEmail, FailedVerification
+from neverbounce.ratelimit import RateLimiter
+from neverbounce.results import CHUNK_SIZE, iter_batches, iter_rows
+from neverbounce.retry import RetryPolicy
+from neverbounce.spool import ResultsSpool
+from neverbounce.tokens import AccessTokenCache
+from neverbounce.upload import EmailSource, encode_form
 
 
 class NeverBounce(object):
     """
     NeverBounce API client used to verify an email address in realtime.
     """
-    def __init__(self, api_username, api_key, base_url='https://api.neverbounce.com/v3'):
+    def __init__(self, api_username, api_key, base_url='https://api.neverbounce.com/v3', session=None,
+                 pool_connections=10, pool_maxsize=10, pool_block=False, keep_alive=True, timeout=None,
+                 token_store=None, token_refresh_margin=60, result_cache=None, retry=None, circuit_breaker=None,
+                 rate_limit=None, credit_guard=None, prefilter=None, concurrency_limiter=None,
+                 journal=None, scheduler=None):
+        """
+        :param str api_username: API username.
+        :param str api_key: API secret key.
+        :param str base_url: Base URL of the API.
+        :param Session session: A requests session to use instead of creating a new one. It is not closed by the
+            client.
+        :param int pool_connections: Number of per-host connection pools to cache.
+        :param int pool_maxsize: Maximum number of connections kept alive per host.
+        :param bool pool_block: Block when all connections of a pool are in use instead of opening new ones.
+        :param bool keep_alive: Keep connections open between calls.
+        :param timeout: Default timeout in seconds for every call, a float or a (connect, read) tuple.
+        :param TokenStore token_store: Store to share the access token with other clients, eg. FileTokenStore.
+        :param int token_refresh_margin: Number of seconds before its expiry when the access token is refreshed.
+        :param ResultCache result_cache: Cache of verification results, eg. MemoryResultCache or SQLiteResultCache.
+        :param RetryPolicy retry: Policy for retrying idempotent calls (status checks, downloads, account and access
+            token) on transient errors, a default RetryPolicy if not set, False to disable retries.
+        :param CircuitBreaker circuit_breaker: Circuit breaker failing all the calls fast while the API is down.
+        :param rate_limit: Maximum number of API calls per second shared by all the threads using the client, or a
+            RateLimiter, eg. a FileRateLimiter shared by processes.
+        :param CreditGuard credit_guard: Tracks the balance of credits and refuses verifications when they run out.
+        :param PreFilter prefilter: Verifies emails with an invalid syntax or a known bad domain locally, without
+            calling the API.
+        :param concurrency_limiter: Context manager held during every HTTP request to limit the concurrent calls,
+            eg. a tenant slot of a NeverBounceClientPool.
+        :param RequestJournal journal: Journal of the verifications and jobs sent, so that those whose response was
+            lost to a crash are not paid for again, eg. a FileRequestJournal.
+        :param RequestScheduler scheduler: Scheduler of the requests by priority class, so that realtime
+            verifications go ahead of job polling and bulk transfers.
+        """
         self.api_username = api_username
         self.api_key = api_key
         self.base_url = base_url
-        self._cached_access_token = None
+        self.timeout = timeout
+        self.result_cache = result_cache
+        self.retry = RetryPolicy() if retry is None else retry
+        self.circuit_breaker = circuit_breaker
+        self.rate_limiter = RateLimiter(rate_limit) if isinstance(rate_limit, (int, float)) else rate_limit
+        self.credit_guard = credit_guard
+        self.prefilter = prefilter
+        self.concurrency_limiter = concurrency_limiter
+        self.journal = journal
+        self.scheduler = scheduler
+        self.instruments = []
+        self._access_token_cache = AccessTokenCache(self._fetch_access_token, api_username, token_store,
+                                                    token_refresh_margin)
+        self._owns_session = session is None
+        self._job_waiter = None
+        self._job_waiter_lock = threading.Lock()
+        self._session = session
+        self._session_options = (pool_connections, pool_maxsize, pool_block, keep_alive)
+        self._session_lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Close the connection pools of the session owned by the client and stop waiting for jobs. Waiting for jobs
+        after the client was closed starts a new JobWaiter.
+        """
+        with self._job_waiter_lock:
+            job_waiter, self._job_waiter = self._job_waiter, None
+        if job_waiter is not None:
+            job_waiter.close()
+        if self._owns_session and self._session is not None:
+            self._session.close()
+
+    @property
+    def session(self):
+        """
+        :return: The requests session of the client. It's created on first use, so that the HTTP stack isn't imported
+            until the client makes a call.
+        """
+        session = self._session
+        if session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._create_session(*self._session_options)
+                session = self._session
+        return session
+
+    def add_instrument(self, instrument):
+        """
+        Observe the API calls of the client, their timings and sizes, retries, token refreshes and cache lookups.
+        Without instruments nothing is measured.
+        :param Instrument instrument: An Instrument, eg. a MetricsCollector or a SpanInstrument.
+        """
+        self.instruments = self.instruments + [instrument]
+
+    def remove_instrument(self, instrument):
+        """
+        :param Instrument instrument: An instrument added before.
+        """
+        self.instruments = [i for i in self.instruments if i is not instrument]
 
     def verify(self, email):
         """
@@ -21,40 +132,294 @@ class NeverBounce(object):
         :param str email: Email address to verify.
         :return: A VerifiedEmail object.
         """
-        resp = self._call(endpoint='single', data={'email': email})
-        return VerifiedEmail(email, resp['result'])
+        if self.prefilter is not None:
+            verified_email = self.prefilter.check(email)
+            if verified_email is not None:
+                return verified_email
+        if self.result_cache is not None:
+            verified_email = self.result_cache.get(email)
+            if self.instruments:
+                self._emit('cache_lookup', verified_email is not None)
+            if verified_email is not None:
+                return verified_email
+        key = None
+        if self.journal is not None:
+            from neverbounce.journal import DONE, email_key
+            key = email_key(email)
+            entry = self.journal.lookup(key)
+            if entry is not None and entry['state'] == DONE:
+                return VerifiedEmail(email, entry['response']['result'])
+        with self._spending_credits(1), self._journaling('single', key) as response:
+            resp = self._call(endpoint='single', data={'email': email})
+            response['result'] = resp['result']
+        verified_email = VerifiedEmail(email, resp['result'])
+        if self.result_cache is not None:
+            self.result_cache.set(verified_email)
+        return verified_email
+
+    def verify_many(self, emails, max_workers=10, ordered=True, rate_limit=None):
+        """
+        Verify many email addresses concurrently using single verifications. The emails are consumed lazily, at most
+        twice as many as there are workers are in flight at any time. Keep `max_workers` within the `pool_maxsize`
+        of the client so that all the workers reuse the pooled connections.
+        :param iterable emails: Email addresses to verify.
+        :param int max_workers: Number of worker threads.
+        :param bool ordered: Yield the results in the order of input instead of the order of completion.
+        :param float rate_limit: Maximum number of verifications per second, unlimited by default.
+        :yields: VerifiedEmail objects, or FailedVerification objects for emails that failed to verify.
+        """
+        import requests
+        from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+        limiter = RateLimiter(rate_limit) if rate_limit else None
+
+        def verify(email):
+            if limiter is not None:
+                limiter.acquire()
+            try:
+                return self.verify(email)
+            except (NeverBounceAPIError, InvalidResponseError, AccessTokenExpired, CircuitOpenError,
+                    requests.RequestException) as e:
+                return FailedVerification(email, e)
+
+        emails = iter(emails)
+        window = 2 * max_workers
+        self.access_token()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            if ordered:
+                pending = deque(executor.submit(verify, email) for email in islice(emails, window))
+                while pending:
+                    result = pending.popleft().result()
+                    pending.extend(executor.submit(verify, email) for email in islice(emails, 1))
+                    yield result
+            else:
+                pending = set(executor.submit(verify, email) for email in islice(emails, window))
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    pending.update(executor.submit(verify, email) for email in islice(emails, len(done)))
+                    for future in done:
+                        yield future.result()
 
     def create_job(self, emails):
         """
-        Create a new bulk verification job for the list of emails.
-        :param list emails: Email addresses to verify.
+        Create a new bulk verification job for the list of emails. The emails are streamed to the API in chunks.
+        :param emails: Email addresses to verify, an iterable, a file-like object or a path to a file (eg. a CSV).
         :return: A Job object.
         """
-        resp = self._call(endpoint='bulk', data={'input_location': '1', 'input': '\n'.join(emails)})
+        source = EmailSource(emails)
+        key = None
+        if self.journal is not None:
+            from neverbounce.journal import source_key
+            key = source_key(source)
+            job = self._reattach_job(key)
+            if job is not None:
+                return job
+        with self._spending_credits(len(emails) if isinstance(emails, (list, tuple, set)) else None, source), \
+                self._journaling('bulk', key) as response:
+            resp = self._call(endpoint='bulk', data={'input_location': '1'}, upload=('input', source))
+            response['job_id'] = resp['job_id']
         return Job(resp['job_id'])
 
+    def _reattach_job(self, key):
+        """
+        :param str key: Content hash of the emails of a job.
+        :return: The Job created earlier with the same emails according to the journal, if it exists and hasn't
+            failed.
+        :raises: UnconfirmedJobError if a job with the same emails was sent but it's not known if it was created.
+            The errors of checking the job, other than the API rejecting it, are raised too as the job may still exist.
+        """
+        from neverbounce.journal import DONE, SENT
+        entry = self.journal.lookup(key)
+        if entry is None:
+            return None
+        if entry['state'] == SENT:
+            raise UnconfirmedJobError(entry)
+        if entry['state'] != DONE:
+            return None
+        job_id = entry['response']['job_id']
+        try:
+            job_status = self.check_job(job_id)
+        except NeverBounceAPIError as e:
+            if e.status_code >= 500:
+                raise
+            return None
+        return None if job_status.is_failed else Job(job_id)
+
+    def verify_bulk(self, emails, chunk_size=50000, max_parallel_jobs=4, min_poll_interval=1, max_poll_interval=60):
+        """
+        Verify a large list of emails with bulk jobs. The list is deduplicated and submitted in chunks as parallel
+        jobs, the results of every job are yielded as soon as it completes. See JobPipeline.
+        :param iterable emails: Email addresses to verify.
+        :param int chunk_size: Number of emails per job.
+        :param int max_parallel_jobs: Maximum number of jobs in progress at the same time.
+        :param float min_poll_interval: Minimum number of seconds between two status checks of a job.
+        :param float max_poll_interval: Maximum number of seconds between two status checks of a job.
+        :yields: VerifiedEmail objects, one per unique email address, in the order of completion.
+        """
+        from neverbounce.pipeline import JobPipeline
+        pipeline = JobPipeline(self, chunk_size, max_parallel_jobs, min_poll_interval, max_poll_interval)
+        return pipeline.run(emails)
+
+    def reverify(self, snapshot, emails, output, max_ages=None, chunk_size=50000, max_parallel_jobs=4):
+        """
+        Verify only the emails of a list which are new or stale in the snapshot of its previous results, and write an
+        updated snapshot. See the snapshot module.
+        :param snapshot: A Snapshot or a path to the snapshot of the previous results.
+        :param iterable emails: The current list of email addresses.
+        :param str output: Path to write the updated snapshot to, it can be the path of the previous snapshot.
+        :param dict max_ages: Maximum age in seconds of the results by result text code, see DEFAULT_MAX_AGES.
+        :param int chunk_size: Number of emails per job.
+        :param int max_parallel_jobs: Maximum number of jobs in progress at the same time.
+        :return: A dictionary with the number of `total`, `fresh`, `stale`, `new` and `dropped` emails.
+        """
+        from neverbounce.snapshot import reverify
+        return reverify(self, snapshot, emails, output, max_ages, chunk_size, max_parallel_jobs)
+
     def check_job(self, job_id):
         """
         Check the status of a bulk verification job.
         :param int job_id: ID of a job to check the status of.
         :return: A JobStatus object.
         """
-        resp = self._call(endpoint='status', data={'job_id': job_id})
-        map = {'id': 'job_id', 'status': 'status_code', 'type': 'type_code'}
-        job_status_args = {map.get(k, k): v for k, v in resp.items()}
-        return JobStatus(**job_status_args)
+        resp = self._call(endpoint='status', data={'job_id': job_id}, idempotent=True)
+        return JobStatus.from_response(resp)
+
+    def wait_for_jobs(self, job_ids, callback=None, timeout=None):
+        """
+        Wait for bulk verification jobs to complete. All the jobs of the client are checked by a single JobWaiter
+        which adapts the interval between checks to the progress of each job.
+        :param list job_ids: IDs of the jobs.
+        :param callable callback: Function called with the JobStatus of each completed job.
+        :param float timeout: Maximum number of seconds to wait for all the jobs.
+        :yields: JobStatus objects in the order of completion.
+        :raises: JobFailedError if a job fails, TimeoutError if the jobs don't complete in time.
+        """
+        return self.job_waiter.wait(job_ids, callback, timeout)
 
-    def results(self, job_id):
+    @property
+    def job_waiter(self):
+        """
+        :return: The JobWaiter of the client, eg. to notify it from a WebhookReceiver.
+        """
+        from neverbounce.waiter import JobWaiter
+        with self._job_waiter_lock:
+            if self._job_waiter is None:
+                self._job_waiter = JobWaiter(self)
+            return self._job_waiter
+
+    def results(self, job_id, spool=None):
         """
         Yield the result of a completed bulk verification job.
         :param int job_id: ID of a job to retrieve the results for.
+        :param str spool: Path to a local file to download the results to first, see download_results.
         :yields: The next VerifiedEmail objects.
         """
-        resp = self._call(endpoint='download', data={'job_id': job_id})
-        Row = namedtuple('Row', ['email', 'result_text_code'])
-        for line in resp:
-            row = Row(*line.decode('utf-8').split(','))
-            yield VerifiedEmail.from_text_code(row.email, row.result_text_code)
+        if self.result_cache is None:
+            for email, result_code in self.result_rows(job_id, spool):
+                yield VerifiedEmail(email, result_code)
+            return
+        # Results are cached a batch at a time
+        for batch in self.result_batches(job_id, spool):
+            self.result_cache.set_many(batch)
+            for verified_email in batch:
+                yield verified_email
+
+    def result_rows(self, job_id, spool=None, email_column=0, result_column=-1):
+        """
+        Yield the result of a completed bulk verification job as lightweight tuples.
+        :param int job_id: ID of a job to retrieve the results for.
+        :param str spool: Path to a local file to download the results to first, see download_results.
+        :param int email_column: Index of the email column in the results.
+        :param int result_column: Index of the result column in the results.
+        :yields: The next (email, result_code) tuples.
+        """
+        return iter_rows(self._result_chunks(job_id, spool), email_column, result_column)
+
+    def result_batches(self, job_id, spool=None, batch_size=10000, email_column=0, result_column=-1):
+        """
+        Yield the result of a completed bulk verification job in batches of columns.
+        :param int job_id: ID of a job to retrieve the results for.
+        :param str spool: Path to a local file to download the results to first, see download_results.
+        :param int batch_size: Approximate number of results in a batch.
+        :param int email_column: Index of the email column in the results.
+        :param int result_column: Index of the result column in the results.
+        :yields: The next ResultBatch objects with a list of emails and an array of result codes.
+        """
+        return iter_batches(self._result_chunks(job_id, spool), batch_size, email_column, result_column)
+
+    def results_to_columns(self, job_id, spool=None, email_column=0, result_column=-1):
+        """
+        Parse the results of a completed bulk verification job into columns, without an object per result. See the
+        export module to convert them to NumPy arrays, Arrow tables or Parquet files.
+        :param int job_id: ID of a job to retrieve the results for.
+        :param str spool: Path to a local file to download the results to first, see download_results.
+        :param int email_column: Index of the email column in the results.
+        :param int result_column: Index of the result column in the results.
+        :return: A ResultBatch object with a list of emails and an array of result codes of all the results.
+        """
+        from neverbounce.export import concat
+        return concat(self.result_batches(job_id, spool, email_column=email_column, result_column=result_column))
+
+    def process_results(self, job_id, spool, mapper, reducer, processes=None, email_column=0, result_column=-1):
+        """
+        Download the results of a completed bulk verification job to a local file, then map and reduce them across a
+        pool of processes, see the parallel module.
+        :param int job_id: ID of a job to process the results of.
+        :param str spool: Path to a local file to download the results to, see download_results.
+        :param callable mapper: Picklable function called with the email and result code of every result, returns
+            the value to reduce or None to skip the result.
+        :param Reducer reducer: Reducer of the mapped values, eg. CountReducer or FileReducer.
+        :param int processes: Number of worker processes, the number of CPUs by default.
+        :param int email_column: Index of the email column in the results.
+        :param int result_column: Index of the result column in the results.
+        :return: The result of the reducer.
+        """
+        from neverbounce.parallel import process_results
+        self.download_results(job_id, spool)
+        return process_results(spool, mapper, reducer, processes, email_column=email_column,
+                               result_column=result_column)
+
+    def download_results(self, job_id, path, max_attempts=5, retry_delay=1.0):
+        """
+        Download the raw results of a completed bulk verification job to a local file. The progress is checkpointed,
+        an interrupted download is resumed with an HTTP Range request, or by skipping the bytes already downloaded if
+        the server doesn't support it. A completed download is not repeated.
+        :param int job_id: ID of a job to download the results for.
+        :param str path: Path to the local file.
+        :param int max_attempts: Number of attempts before giving up on a failing download.
+        :param float retry_delay: Seconds to wait before resuming, multiplied by the number of failed attempts.
+        :return: A ResultsSpool object.
+        """
+        import requests
+        from requests.exceptions import ChunkedEncodingError
+        spool = ResultsSpool(path, job_id)
+        attempts = 0
+        while not spool.complete:
+            headers = {'Range': 'bytes={}-'.format(spool.bytes)} if spool.bytes else None
+            try:
+                stream = self._call(endpoint='download', data={'job_id': job_id}, stream=True, headers=headers,
+                                    idempotent=True)
+                spool.write(stream, skip=0 if stream.response.status_code == 206 else spool.bytes)
+            except NeverBounceAPIError as e:
+                # The whole file was downloaded but the download was interrupted before it was marked complete
+                if e.status_code != 416 or e.response.headers.get('Content-Range') != 'bytes */{}'.format(spool.bytes):
+                    raise
+                spool.finish()
+            except (requests.ConnectionError, requests.Timeout, ChunkedEncodingError):
+                attempts += 1
+                if attempts >= max_attempts:
+                    raise
+                time.sleep(retry_delay * attempts)
+        return spool
+
+    def _result_chunks(self, job_id, spool=None):
+        """
+        :param int job_id: ID of a job to retrieve the results for.
+        :param str spool: Path to a local file to download the results to first.
+        :return: An iterator of chunks of bytes of the results.
+        """
+        if spool is not None:
+            return self.download_results(job_id, spool).chunks()
+        return self._call(endpoint='download', data={'job_id': job_id}, stream=True, idempotent=True)
 
     def retrieve_job(self, job_id):
         """
@@ -70,8 +435,11 @@ class NeverBounce(object):
         Get the API account details like balance of credits.
         :return: An Account object.
         """
-        resp = self._call(endpoint='account')
-        return Account(resp['credits'], resp['jobs_completed'], resp['jobs_processing'])
+        resp = self._call(endpoint='account', idempotent=True)
+        account = Account(resp['credits'], resp['jobs_completed'], resp['jobs_processing'])
+        if self.credit_guard is not None:
+            self.credit_guard.update(account.credits)
+        return account
 
     def check_account(self):
         warnings.warn('check_account method is now called account', DeprecationWarning)
@@ -79,47 +447,223 @@ class NeverBounce(object):
 
     def access_token(self):
         """
-        Retrieve and cache an access token to authenticate API calls.
+        Retrieve and cache an access token to authenticate API calls. The token is refreshed before it expires,
+        concurrent callers wait for a single refresh.
         :return: An access token string.
         """
-        if self._cached_access_token is not None:
-            return self._cached_access_token
+        return self._access_token_cache.get()
+
+    def _fetch_access_token(self):
+        """
+        Retrieve a new access token.
+        :return: A tuple of the access token string and its lifetime in seconds.
+        """
+        start = timer()
         resp = self._request(endpoint='access_token', data={'grant_type': 'client_credentials', 'scope': 'basic user'},
-                             auth=(self.api_username, self.api_key))
-        self._cached_access_token = resp['access_token']
-        return self._cached_access_token
+                             auth=(self.api_username, self.api_key), idempotent=True)
+        if self.instruments:
+            self._emit('token_refreshed', timer() - start)
+        return resp['access_token'], resp.get('expires_in')
 
     def get_access_token(self):
         warnings.warn('get_access_token method is now called access_token', DeprecationWarning)
         return self.access_token()
 
-    def _call(self, endpoint, data=None):
+    def _emit(self, event, *args):
+        """
+        Call a method of every instrument.
+        :param str event: Name of an Instrument method, eg. `request_finished`.
+        """
+        for instrument in self.instruments:
+            getattr(instrument, event)(*args)
+
+    @contextmanager
+    def _journaling(self, endpoint, key):
+        """
+        Journal a billable call if the client has a journal, see RequestJournal.record.
+        :yields: A dictionary to fill with the response.
+        """
+        if self.journal is None:
+            yield {}
+            return
+        with self.journal.record(endpoint, key) as response:
+            yield response
+
+    @contextmanager
+    def _spending_credits(self, count, source=None):
+        """
+        Take the credits for a verification from the credit guard, they are returned if the verification fails.
+        :param int count: Number of emails to verify, None if it's not known up front.
+        :param EmailSource source: Source of the emails which counts them as they are uploaded.
+        :raises: InsufficientCreditsError if there are not enough credits.
+        """
+        guard = self.credit_guard
+        if guard is None:
+            yield
+            return
+        guard.spend(count or 0, self.account)
+        try:
+            yield
+        except Exception:
+            guard.refund(count or 0)
+            raise
+        if count is None:
+            guard.charge(source.count)
+
+    def _call(self, endpoint, data=None, upload=None, stream=False, headers=None, idempotent=False):
         """
         Make an authorized API call to specified endpoint.
         :param str endpoint: API endpoint's relative URL, eg. `/account`.
         :param dict data: POST request data.
-        :return: A dictionary or a string with response data.
+        :param tuple upload: Name of a POST request field and the EmailSource streamed as its value.
+        :param bool stream: Download an octet-stream response lazily.
+        :param dict headers: Additional HTTP headers.
+        :param bool idempotent: The call can be safely repeated, it's retried on transient errors.
+        :return: A dictionary or a ResponseStream with response data.
         """
         data = {} if data is None else data
+        data['access_token'] = self.access_token()
         try:
-            data['access_token'] = self.access_token()
-            return self._request(endpoint, data)
+            return self._request(endpoint, data, upload=upload, stream=stream, headers=headers, idempotent=idempotent)
         except AccessTokenExpired:
-            self._cached_access_token = None
+            if upload is not None and not upload[1].replayable:
+                raise
+            self._access_token_cache.invalidate(data['access_token'])
             data['access_token'] = self.access_token()
-            return self._request(endpoint, data)
+            return self._request(endpoint, data, upload=upload, stream=stream, headers=headers, idempotent=idempotent)
 
-    def _request(self, endpoint, data, auth=None):
+    def _request(self, endpoint, data, auth=None, timeout=None, upload=None, stream=False, headers=None,
+                 idempotent=False):
         """
-        Make HTTP POST request to an API endpoint.
+        Make HTTP POST request to an API endpoint through the circuit breaker, retrying idempotent calls.
         :param str endpoint: API endpoint's relative URL, eg. `/account`.
         :param dict data: POST request data.
         :param tuple auth: HTTP basic auth credentials.
-        :return: A dictionary or a string with response data.
+        :param timeout: Timeout for this call, overrides the client default.
+        :param tuple upload: Name of a POST request field and the EmailSource streamed as its value.
+        :param bool stream: Download an octet-stream response lazily.
+        :param dict headers: Additional HTTP headers.
+        :param bool idempotent: The call can be safely repeated, it's retried on transient errors.
+        :return: A dictionary or a ResponseStream with response data.
+        :raises: CircuitOpenError if the circuit breaker is open.
+        """
+        send = self._send
+        if self.instruments:
+            attempts = itertools.count(1)
+
+            def counted_send(*args):
+                return self._send(*args, attempt=next(attempts))
+            send = counted_send
+        if self.concurrency_limiter is not None:
+            send = functools.partial(self._limited_send, send)
+        if self.scheduler is not None:
+            send = functools.partial(self._scheduled_send, send, self.scheduler.priority_class(endpoint))
+        if self.circuit_breaker is not None:
+            send = functools.partial(self.circuit_breaker.call, send)
+        if idempotent and self.retry:
+            return self.retry.call(send, endpoint, data, auth, timeout, upload, stream, headers)
+        return send(endpoint, data, auth, timeout, upload, stream, headers)
+
+    def _limited_send(self, send, *args):
+        """
+        Send a request holding the concurrency limiter. The limiter of a streamed response is held until the stream
+        is closed, as its connection is busy until the body is read.
+        """
+        limiter = self.concurrency_limiter
+        limiter.__enter__()
+        try:
+            result = send(*args)
+        except Exception:
+            limiter.__exit__(*sys.exc_info())
+            raise
+        if isinstance(result, ResponseStream):
+            result.close_callbacks.append(functools.partial(limiter.__exit__, None, None, None))
+        else:
+            limiter.__exit__(None, None, None)
+        return result
+
+    def _scheduled_send(self, send, priority_class, *args):
+        """
+        Send a request in a slot of its priority class of the scheduler. The slot of a streamed response is released
+        when the stream is closed, or when it's garbage collected if it's dropped unread.
         """
+        self.scheduler.acquire(priority_class)
+        try:
+            result = send(*args)
+        except Exception:
+            self.scheduler.release(priority_class)
+            raise
+        if isinstance(result, ResponseStream):
+            result.close_callbacks.append(functools.partial(self.scheduler.release, priority_class))
+        else:
+            self.scheduler.release(priority_class)
+        return result
+
+    def _send(self, endpoint, data, auth=None, timeout=None, upload=None, stream=False, headers=None, attempt=1):
+        """
+        Send a single HTTP POST request to an API endpoint, see _request. The request is observed by the instruments
+        of the client, if there are any.
+        :param int attempt: Number of the attempt of the call, starting with 1.
+        :return: A dictionary or a ResponseStream with response data.
+        """
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        info = None
+        if self.instruments:
+            info = RequestInfo(endpoint, attempt)
+            self._emit('request_started', info)
         url = '{}/{}'.format(self.base_url, endpoint)
-        response = requests.post(url, data, auth=auth)
-        return self._handle_response(response)
+        if upload is not None:
+            field, source = upload
+            data = encode_form(data, field, source.chunks())
+            if info is not None:
+                data = info.count_sent(data)
+            headers = dict(headers or {}, **{'Content-Type': 'application/x-www-form-urlencoded'})
+        if info is None:
+            response = self.session.post(url, data, auth=auth, headers=headers, stream=stream,
+                                         timeout=self.timeout if timeout is None else timeout)
+            return self._handle_response(response)
+        try:
+            response = self.session.post(url, data, auth=auth, headers=headers, stream=stream,
+                                         timeout=self.timeout if timeout is None else timeout)
+            info.response_received(response)
+            result = self._handle_response(response)
+        except Exception as e:
+            info.finish(e)
+            self._emit('request_finished', info)
+            raise
+        if isinstance(result, ResponseStream):
+            result.close_callbacks.append(functools.partial(self._finish_stream, info, result))
+            return result
+        info.finish()
+        self._emit('request_finished', info)
+        return result
+
+    def _finish_stream(self, info, stream):
+        """
+        Finish the request of a streamed response when the stream is closed, once the body was read.
+        :param RequestInfo info: Details of the request.
+        :param ResponseStream stream: The response stream.
+        """
+        info.bytes_received = stream.bytes_received
+        info.finish(stream.error)
+        self._emit('request_finished', info)
+
+    @staticmethod
+    def _create_session(pool_connections, pool_maxsize, pool_block, keep_alive):
+        """
+        Create a requests session with a connection pool of the given size.
+        :return: A Session object.
+        """
+        import requests
+        from requests.adapters import HTTPAdapter
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        if not keep_alive:
+            session.headers['Connection'] = 'close'
+        return session
 
     @staticmethod
     def _handle_response(response):
@@ -132,7 +676,7 @@ class NeverBounce(object):
         if not response.ok:
             raise NeverBounceAPIError(response)
         if response.headers.get('Content-Type') == 'application/octet-stream':
-            return response.iter_lines()
+            return ResponseStream(response)
 
         try:
             resp = response.json()
@@ -146,3 +690,42 @@ class NeverBounce(object):
             else:
                 raise NeverBounceAPIError(response)
         return resp
+
+
+class ResponseStream(object):
+    """
+    Iterates over the content of an octet-stream response in large chunks and releases its connection when done.
+    """
+    def __init__(self, response):
+        """
+        :param Response response: Response data.
+        """
+        self.response = response
+        self.close_callbacks = []
+        self.bytes_received = 0
+        self.error = None
+
+    def __iter__(self):
+        try:
+            for chunk in self.response.iter_content(CHUNK_SIZE):
+                self.bytes_received += len(chunk)
+                yield chunk
+        except Exception as e:
+            self.error = e
+            raise
+        finally:
+            self.close()
+
+    def close(self):
+        """
+        Release the connection of the response.
+        """
+        self.response.close()
+        callbacks, self.close_callbacks = self.close_callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def __del__(self):
+        # A stream dropped unread still releases its connection and the slots held for it
+        if self.close_callbacks:
+            self.close()
@@ -0,0 +1,86 @@
+import threading
+import time
+from neverbounce.exceptions import InsufficientCreditsError
+
+
+class CreditGuard(object):
+    """
+    Tracks the balance of credits locally so that verifications are not started without credits to pay for them. The
+    balance is synchronized with the account details periodically and decremented as credits are spent in between.
+    When the credits run out, work is refused with InsufficientCreditsError or, with `block`, it waits for credits
+    to be added to the account.
+    """
+    def __init__(self, reserve=0, block=False, sync_interval=300, block_interval=60):
+        """
+        :param int reserve: Number of credits which are never spent.
+        :param bool block: Wait for more credits instead of raising InsufficientCreditsError.
+        :param float sync_interval: Number of seconds after which the balance is synchronized with the account.
+        :param float block_interval: Number of seconds between account checks while waiting for more credits.
+        """
+        self.reserve = reserve
+        self.block = block
+        self.sync_interval = sync_interval
+        self.block_interval = block_interval
+        self.credits = None
+        self._synced = None
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+
+    def update(self, credits):
+        """
+        Set the balance from the account details.
+        :param int credits: Number of credits available.
+        """
+        with self._lock:
+            self.credits = int(credits)
+            self._synced = time.time()
+
+    def spend(self, count, account):
+        """
+        Take credits from the balance before verifying emails.
+        :param int count: Number of credits to spend.
+        :param callable account: Function retrieving the account details, called to synchronize the balance.
+        :raises: InsufficientCreditsError if there are not enough credits and the guard doesn't block.
+        """
+        synced = False
+        while True:
+            with self._lock:
+                blocked = synced or self._synced is not None and time.time() - self._synced < self.sync_interval
+                if blocked:
+                    if self.credits - count >= self.reserve:
+                        self.credits -= count
+                        return
+                    if not self.block:
+                        raise InsufficientCreditsError(max(0, self.credits - self.reserve), count)
+            # Wait and synchronize without holding the lock, so that other callers are not held up meanwhile
+            since = time.time()
+            if blocked:
+                time.sleep(self.block_interval)
+            self._sync(account, since)
+            synced = True
+
+    def charge(self, count):
+        """
+        Take credits spent without checking the balance first, eg. when the number of emails of a job was not known.
+        :param int count: Number of credits spent.
+        """
+        self.refund(-count)
+
+    def refund(self, count):
+        """
+        Return credits which were not spent, eg. when a verification failed.
+        :param int count: Number of credits to return.
+        """
+        with self._lock:
+            if self.credits is not None:
+                self.credits += count
+
+    def _sync(self, account, since):
+        """
+        Synchronize the balance with the account unless another caller did it since the given time.
+        """
+        with self._sync_lock:
+            with self._lock:
+                if self._synced is not None and self._synced > since:
+                    return
+            self.update(account().credits)
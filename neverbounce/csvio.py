@@ -0,0 +1,39 @@
+"""
+CSV reading and writing of text. On Python 2 the csv module only handles byte strings, the text is encoded to UTF-8
+for it and the fields are decoded back.
+"""
+import csv
+import io
+import sys
+
+if sys.version_info[0] >= 3:
+    reader = csv.reader
+    writer = csv.writer
+else:  # Python 2
+    def reader(lines, **kwargs):
+        """
+        :param iterable lines: Lines of text, eg. a file opened with io.open.
+        :yields: Rows as lists of text fields.
+        """
+        for row in csv.reader((line.encode('utf-8') for line in lines), **kwargs):
+            yield [field.decode('utf-8') for field in row]
+
+    class writer(object):
+        """
+        Writes rows of text fields to a text file, eg. a file opened with io.open.
+        """
+        def __init__(self, f, **kwargs):
+            self._file = f
+            self._buffer = io.BytesIO()
+            self._writer = csv.writer(self._buffer, **kwargs)
+
+        def writerow(self, row):
+            self._writer.writerow([field.encode('utf-8') if isinstance(field, unicode) else field  # noqa: F821
+                                   for field in row])
+            self._file.write(self._buffer.getvalue().decode('utf-8'))
+            self._buffer.seek(0)
+            self._buffer.truncate()
+
+        def writerows(self, rows):
+            for row in rows:
+                self.writerow(row)
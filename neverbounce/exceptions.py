@@ -2,13 +2,47 @@ class AccessTokenExpired(Exception):
     pass
 
 
+class CircuitOpenError(Exception):
+    def __init__(self, retry_in, *args, **kwargs):
+        self.retry_in = retry_in
+        super(CircuitOpenError, self).__init__(
+            'The API is failing, calls are suspended for {:.1f} seconds'.format(retry_in), *args, **kwargs)
+
+
+class InsufficientCreditsError(Exception):
+    def __init__(self, available, required, *args, **kwargs):
+        self.available = available
+        self.required = required
+        super(InsufficientCreditsError, self).__init__(
+            'Not enough credits, {} available and {} required'.format(available, required), *args, **kwargs)
+
+
 class InvalidResponseError(Exception):
     pass
 
 
+class JobFailedError(Exception):
+    def __init__(self, job_status, *args, **kwargs):
+        self.job_status = job_status
+        super(JobFailedError, self).__init__('Job {} failed'.format(job_status.job_id), *args, **kwargs)
+
+
+class UnconfirmedJobError(Exception):
+    def __init__(self, entry, *args, **kwargs):
+        self.entry = entry
+        super(UnconfirmedJobError, self).__init__(
+            'A job with the same emails was sent before but it is not known whether it was created, check the jobs '
+            'of the account and forget it in the journal to create it again', *args, **kwargs)
+
+
 class NeverBounceAPIError(Exception):
     def __init__(self, response, *args, **kwargs):
-        json = response.json()
+        try:
+            json = response.json()
+        except ValueError:  # Eg. an HTML error page of a proxy
+            json = {}
+        if not isinstance(json, dict):
+            json = {}
         self.errors = []
         if 'error_description' in json:
             self.errors.append(json['error_description'])
@@ -16,6 +50,8 @@ class NeverBounceAPIError(Exception):
             self.errors.append(json['msg'])
         if 'error_msg' in json:
             self.errors.append(json['error_msg'])
+        if not self.errors:
+            self.errors.append('HTTP status {}'.format(response.status_code))
         self.status_code = response.status_code
         self.response = response
         super(NeverBounceAPIError, self).__init__('\n'.join(self.errors), *args, **kwargs)
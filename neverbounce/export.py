@@ -0,0 +1,144 @@
+"""
+Export of bulk verification results in columns, without an object per row. The results are parsed into ResultBatch
+objects holding a list of emails and an array of result codes (see VerifiedEmail.result_codes), which convert to NumPy
+arrays and Arrow tables and are written to Parquet or Feather files batch by batch. NumPy and pyarrow are optional.
+"""
+import importlib
+from itertools import compress
+from neverbounce.objects import VerifiedEmail
+from neverbounce.results import ResultBatch
+
+
+def _import(name, required=True):
+    """
+    Import an optional library on first use, so that it isn't loaded with the client.
+    :param str name: Name of the module, eg. `pyarrow.parquet`.
+    :param bool required: Raise ImportError if the library is not installed, otherwise return None.
+    :return: The module.
+    """
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        if not required:
+            return None
+        library = name.split('.')[0]
+        raise ImportError('Exporting results to {} requires the {} library.'.format(library, library))
+
+
+def concat(batches):
+    """
+    :param iterable batches: ResultBatch objects.
+    :return: A single ResultBatch with the results of all the batches.
+    """
+    result = ResultBatch()
+    for batch in batches:
+        result.emails.extend(batch.emails)
+        result.result_codes.extend(batch.result_codes)
+    return result
+
+
+def count_results(batches):
+    """
+    :param iterable batches: ResultBatch objects.
+    :return: A dictionary with the number of results by result text code, eg. {'valid': 10, 'invalid': 2, ...}.
+    """
+    if isinstance(batches, ResultBatch):
+        batches = [batches]
+    counts = dict.fromkeys(VerifiedEmail.text_codes, 0)
+    for batch in batches:
+        for code, text_code in VerifiedEmail.result_codes.items():
+            counts[text_code] += batch.result_codes.count(code)
+    return counts
+
+
+def filter_results(batches, *result_text_codes):
+    """
+    :param iterable batches: ResultBatch objects.
+    :param str result_text_codes: Results to select, eg. `valid` and `catchall`.
+    :yields: ResultBatch objects with only the selected results.
+    """
+    if isinstance(batches, ResultBatch):
+        batches = [batches]
+    codes = frozenset(VerifiedEmail.result_text_codes[text_code] for text_code in result_text_codes)
+    numpy = _import('numpy', required=False)
+    for batch in batches:
+        if numpy is not None and len(batch):
+            selected = numpy.isin(numpy.frombuffer(batch.result_codes, dtype=numpy.int8), list(codes)).tolist()
+        else:
+            selected = [code in codes for code in batch.result_codes]
+        result = ResultBatch(list(compress(batch.emails, selected)))
+        result.result_codes.extend(compress(batch.result_codes, selected))
+        yield result
+
+
+def to_numpy(batch):
+    """
+    :param ResultBatch batch: Results.
+    :return: A tuple of an array of emails (unicode strings) and an int8 array of result codes sharing the memory of
+        the batch.
+    """
+    numpy = _import('numpy')
+    return numpy.array(batch.emails, dtype=str), numpy.frombuffer(batch.result_codes, dtype=numpy.int8)
+
+
+def to_arrow(batch):
+    """
+    :param ResultBatch batch: Results.
+    :return: A pyarrow RecordBatch with the `email` string column and the `result_code` int8 column.
+    """
+    pyarrow = _import('pyarrow')
+    return pyarrow.RecordBatch.from_arrays([
+        pyarrow.array(batch.emails, type=pyarrow.string()),
+        pyarrow.array(batch.result_codes, type=pyarrow.int8()),
+    ], schema=arrow_schema())
+
+
+def arrow_schema():
+    """
+    :return: The pyarrow Schema of exported results.
+    """
+    pyarrow = _import('pyarrow')
+    return pyarrow.schema([('email', pyarrow.string()), ('result_code', pyarrow.int8())])
+
+
+def to_arrow_table(batches):
+    """
+    :param iterable batches: ResultBatch objects.
+    :return: A pyarrow Table with the results of all the batches.
+    """
+    pyarrow = _import('pyarrow')
+    return pyarrow.Table.from_batches([to_arrow(batch) for batch in batches], schema=arrow_schema())
+
+
+def write_parquet(batches, path, compression='snappy'):
+    """
+    Write the results to a Parquet file, a row group per batch.
+    :param iterable batches: ResultBatch objects.
+    :param str path: Path to the file.
+    :param str compression: Compression codec of the file.
+    :return: Number of results written.
+    """
+    parquet = _import('pyarrow.parquet')
+    count = 0
+    with parquet.ParquetWriter(path, arrow_schema(), compression=compression) as writer:
+        for batch in batches:
+            writer.write_batch(to_arrow(batch))
+            count += len(batch)
+    return count
+
+
+def write_feather(batches, path):
+    """
+    Write the results to a Feather (Arrow IPC) file, a record batch per batch.
+    :param iterable batches: ResultBatch objects.
+    :param str path: Path to the file.
+    :return: Number of results written.
+    """
+    pyarrow = _import('pyarrow')
+    ipc = _import('pyarrow.ipc')
+    count = 0
+    with pyarrow.OSFile(path, 'wb') as sink, ipc.new_file(sink, arrow_schema()) as writer:
+        for batch in batches:
+            writer.write_batch(to_arrow(batch))
+            count += len(batch)
+    return count
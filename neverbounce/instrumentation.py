@@ -0,0 +1,269 @@
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+
+timer = getattr(time, 'perf_counter', time.time)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class RequestInfo(object):
+    """
+    RequestInfo holds the details of a single HTTP request to the API, passed to the instruments of the client.
+    Durations are in seconds, `ttfb` is the time from sending the request to receiving the response headers and
+    `parse` is the time spent handling the response. A streamed download finishes when its stream is closed, its
+    `parse` time includes reading the body and `bytes_received` counts the bytes actually read. The `context`
+    dictionary is free for instruments to store their own data, eg. a span.
+    """
+    __slots__ = ('endpoint', 'attempt', 'start', 'ttfb', 'parse', 'total', 'bytes_sent', 'bytes_received',
+                 'status_code', 'error', 'context')
+
+    def __init__(self, endpoint, attempt=1):
+        self.endpoint = endpoint
+        self.attempt = attempt
+        self.start = timer()
+        self.ttfb = None
+        self.parse = None
+        self.total = None
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.status_code = None
+        self.error = None
+        self.context = {}
+
+    @property
+    def is_retry(self):
+        return self.attempt > 1
+
+    def count_sent(self, chunks):
+        """
+        :param iterable chunks: Chunks of bytes of a streamed request body.
+        :yields: The chunks, counting their size.
+        """
+        for chunk in chunks:
+            self.bytes_sent += len(chunk)
+            yield chunk
+
+    def response_received(self, response):
+        """
+        :param Response response: Response of the request.
+        """
+        self.status_code = response.status_code
+        elapsed = getattr(response, 'elapsed', None)
+        self.ttfb = elapsed.total_seconds() if elapsed is not None else timer() - self.start
+        body = getattr(response.request, 'body', None) if hasattr(response, 'request') else None
+        if body is not None and not self.bytes_sent and hasattr(body, '__len__'):
+            self.bytes_sent = len(body)
+        self.bytes_received = int(response.headers.get('Content-Length') or 0)
+        self.parse = timer()
+
+    def finish(self, error=None):
+        now = timer()
+        if self.parse is not None:
+            self.parse = now - self.parse
+        self.total = now - self.start
+        self.error = error
+
+
+class Instrument(object):
+    """
+    Base class of the instruments observing the API calls of a client, see NeverBounce.add_instrument. The methods
+    are called synchronously by the thread making the call and should be quick.
+    """
+    def request_started(self, info):
+        """
+        :param RequestInfo info: Details of the request, only the endpoint and attempt are known.
+        """
+
+    def request_finished(self, info):
+        """
+        :param RequestInfo info: Details of the request, `error` is set if it failed.
+        """
+
+    def token_refreshed(self, duration):
+        """
+        :param float duration: Number of seconds it took to retrieve a new access token.
+        """
+
+    def cache_lookup(self, hit):
+        """
+        :param bool hit: The result was found in the result cache.
+        """
+
+
+class Histogram(object):
+    """
+    Histogram of observed values with fixed bucket boundaries, cumulative counts are computed on export.
+    """
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """
+        :return: A list of (upper bound, number of values less than or equal to it) tuples, ending with infinity.
+        """
+        total, result = 0, []
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def quantile(self, q):
+        """
+        :param float q: Quantile between 0 and 1.
+        :return: Upper bound of the bucket holding the quantile, None if nothing was observed.
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        for bound, total in self.cumulative():
+            if total >= rank:
+                return bound
+
+
+class MetricsCollector(Instrument):
+    """
+    In-process collector of the counters and latency histograms of the API calls, by endpoint.
+    """
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        """
+        :param tuple buckets: Upper bounds of the latency histogram buckets in seconds.
+        """
+        self.buckets = buckets
+        self.requests = defaultdict(int)
+        self.errors = defaultdict(int)
+        self.retries = defaultdict(int)
+        self.bytes_sent = defaultdict(int)
+        self.bytes_received = defaultdict(int)
+        self.latency = defaultdict(lambda: Histogram(self.buckets))
+        self.ttfb = defaultdict(lambda: Histogram(self.buckets))
+        self.token_refreshes = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._lock = threading.Lock()
+
+    def request_finished(self, info):
+        endpoint = info.endpoint
+        with self._lock:
+            self.requests[endpoint, '' if info.status_code is None else info.status_code] += 1
+            if info.error is not None:
+                self.errors[endpoint, type(info.error).__name__] += 1
+            if info.is_retry:
+                self.retries[endpoint] += 1
+            self.bytes_sent[endpoint] += info.bytes_sent
+            self.bytes_received[endpoint] += info.bytes_received
+            self.latency[endpoint].observe(info.total)
+            if info.ttfb is not None:
+                self.ttfb[endpoint].observe(info.ttfb)
+
+    def token_refreshed(self, duration):
+        with self._lock:
+            self.token_refreshes += 1
+
+    def cache_lookup(self, hit):
+        with self._lock:
+            if hit:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+
+    def prometheus(self, prefix='neverbounce'):
+        """
+        :param str prefix: Prefix of the metric names.
+        :return: The metrics in the Prometheus text exposition format.
+        """
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append('# HELP {}_{} {}'.format(prefix, name, help_text))
+            lines.append('# TYPE {}_{} {}'.format(prefix, name, kind))
+            for suffix, labels, value in samples:
+                label_text = ','.join('{}="{}"'.format(key, _escape(value)) for key, value in labels)
+                lines.append('{}_{}{}{} {}'.format(prefix, name, suffix, '{' + label_text + '}' if labels else '',
+                                                   _format_value(value)))
+
+        def histogram_samples(histograms):
+            for endpoint, histogram in sorted(histograms.items()):
+                for bound, total in histogram.cumulative():
+                    yield '_bucket', (('endpoint', endpoint), ('le', _format_value(bound))), total
+                yield '_sum', (('endpoint', endpoint),), histogram.sum
+                yield '_count', (('endpoint', endpoint),), histogram.count
+
+        with self._lock:
+            metric('requests_total', 'counter', 'API requests by endpoint and HTTP status.',
+                   [('', (('endpoint', endpoint), ('status', status)), count)
+                    for (endpoint, status), count in sorted(self.requests.items(), key=str)])
+            metric('errors_total', 'counter', 'Failed API requests by endpoint and error.',
+                   [('', (('endpoint', endpoint), ('error', error)), count)
+                    for (endpoint, error), count in sorted(self.errors.items())])
+            metric('retries_total', 'counter', 'Retried API requests by endpoint.',
+                   [('', (('endpoint', endpoint),), count) for endpoint, count in sorted(self.retries.items())])
+            metric('sent_bytes_total', 'counter', 'Bytes of request bodies sent by endpoint.',
+                   [('', (('endpoint', endpoint),), count) for endpoint, count in sorted(self.bytes_sent.items())])
+            metric('received_bytes_total', 'counter', 'Bytes of response bodies received by endpoint.',
+                   [('', (('endpoint', endpoint),), count)
+                    for endpoint, count in sorted(self.bytes_received.items())])
+            metric('request_duration_seconds', 'histogram', 'Total duration of API requests.',
+                   histogram_samples(self.latency))
+            metric('time_to_first_byte_seconds', 'histogram', 'Time to the response headers of API requests.',
+                   histogram_samples(self.ttfb))
+            metric('token_refreshes_total', 'counter', 'Access token refreshes.', [('', (), self.token_refreshes)])
+            metric('cache_hits_total', 'counter', 'Result cache hits.', [('', (), self.cache_hits)])
+            metric('cache_misses_total', 'counter', 'Result cache misses.', [('', (), self.cache_misses)])
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value):
+    return '+Inf' if value == float('inf') else str(value)
+
+
+class SpanInstrument(Instrument):
+    """
+    Records every API request as an OpenTelemetry span. It requires the `opentelemetry-api` library unless a
+    compatible tracer is passed.
+    """
+    def __init__(self, tracer=None):
+        """
+        :param Tracer tracer: Tracer to start the spans with, the global `neverbounce` tracer by default.
+        """
+        if tracer is None:
+            try:
+                from opentelemetry import trace
+            except ImportError:
+                raise ImportError('SpanInstrument requires the opentelemetry-api library, or pass a tracer.')
+            tracer = trace.get_tracer('neverbounce')
+        self.tracer = tracer
+
+    def request_started(self, info):
+        info.context['span'] = self.tracer.start_span('neverbounce.{}'.format(info.endpoint), attributes={
+            'neverbounce.endpoint': info.endpoint, 'neverbounce.attempt': info.attempt,
+        })
+
+    def request_finished(self, info):
+        span = info.context.pop('span', None)
+        if span is None:
+            return
+        attributes = {'http.status_code': info.status_code, 'neverbounce.ttfb': info.ttfb,
+                      'neverbounce.parse': info.parse, 'neverbounce.bytes_sent': info.bytes_sent,
+                      'neverbounce.bytes_received': info.bytes_received}
+        for key, value in attributes.items():
+            if value is not None:
+                span.set_attribute(key, value)
+        if info.error is not None:
+            span.record_exception(info.error)
+        span.end()
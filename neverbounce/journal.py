@@ -0,0 +1,337 @@
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from neverbounce.cache import DAY, normalize_email
+from neverbounce.exceptions import AccessTokenExpired, CircuitOpenError, NeverBounceAPIError
+
+SENT = 'sent'
+DONE = 'done'
+FAILED = 'failed'
+
+# Replaces an existing file on Windows as well, Python 2 falls back to rename
+replace = getattr(os, 'replace', os.rename)
+
+
+def email_key(email):
+    """
+    :param str email: Email address of a single verification.
+    :return: Content hash of the verification.
+    """
+    return hashlib.sha256(b'single\n' + normalize_email(email).encode('utf-8')).hexdigest()
+
+
+def not_sent(error):
+    """
+    :param Exception error: Error of an API call.
+    :return: True if the call certainly wasn't billed, the API rejected it or it wasn't sent at all. A server error
+        (5xx) may come from a proxy after the API accepted the call, so its outcome is unknown.
+    """
+    if isinstance(error, (AccessTokenExpired, CircuitOpenError)):
+        return True
+    if isinstance(error, NeverBounceAPIError):
+        return error.status_code < 500
+    import requests
+    return isinstance(error, requests.ConnectTimeout)
+
+
+def source_key(source):
+    """
+    :param EmailSource source: Emails of a bulk verification job.
+    :return: Content hash of the job, None if the emails can only be read once so they can't be hashed before the
+        upload.
+    """
+    if not source.replayable:
+        return None
+    digest = hashlib.sha256(b'bulk\n')
+    for chunk in source.chunks():
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+class RequestJournal(object):
+    """
+    Base class of the append-only journals of billable API calls. Each call is logged with the content hash of its
+    input before it's sent and its response is logged when it completes, so that a verification or a job whose
+    response was lost to a crash is not paid for again. Records are written by a background thread in groups: the
+    record of a call being sent waits for the fsync of its group, the records of completed calls don't wait at all.
+    """
+    def __init__(self, retention=DAY):
+        """
+        :param float retention: Number of seconds the calls are kept in the journal.
+        """
+        self.retention = retention
+        self._entries = {}
+        self._keys = {}
+        self._expiry = deque()
+        self._queue = []
+        self._queued = 0
+        self._flushed = 0
+        self._error = None
+        self._closed = False
+        self._condition = threading.Condition()
+        for record in self._load(time.time() - retention):
+            self._apply(record)
+        self._thread = threading.Thread(target=self._run, name='neverbounce-journal')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        with self._condition:
+            return len(self._entries)
+
+    def lookup(self, key):
+        """
+        :param str key: Content hash of a call.
+        :return: A dictionary of the latest call with the content hash, or None. Its `state` is `sent` if the outcome
+            of the call is unknown, `done` with the `response` or `failed`.
+        """
+        if key is None:
+            return None
+        with self._condition:
+            entry = self._entries.get(self._keys.get(key))
+            if entry is None or entry['time'] < time.time() - self.retention:
+                return None
+            return dict(entry)
+
+    def jobs(self):
+        """
+        :return: A list of the journaled bulk verification jobs which were created, newest last.
+        """
+        with self._condition:
+            entries = [dict(entry) for entry in self._entries.values()
+                       if entry['endpoint'] == 'bulk' and entry['state'] == DONE]
+        return sorted(entries, key=lambda entry: entry['time'])
+
+    def pending(self):
+        """
+        :return: A list of the calls whose outcome is unknown, eg. because the process crashed while they were sent.
+        """
+        with self._condition:
+            return [dict(entry) for entry in self._entries.values() if entry['state'] == SENT]
+
+    @contextmanager
+    def record(self, endpoint, key):
+        """
+        Journal a billable call. The call is logged as sent before the block runs, it's logged as done with the
+        response dictionary filled in by the block, or as failed if the API rejected it or it wasn't sent. If the block
+        fails with any other error, eg. a read timeout, the outcome of the call stays unknown.
+        :param str endpoint: API endpoint, eg. `single` or `bulk`.
+        :param str key: Content hash of the input of the call.
+        :yields: A dictionary to fill with the response.
+        """
+        entry = {'id': uuid.uuid4().hex, 'key': key, 'endpoint': endpoint, 'state': SENT, 'time': time.time(),
+                 'response': None}
+        self._append(entry, durable=True)
+        response = {}
+        try:
+            yield response
+        except Exception as e:
+            if not_sent(e):
+                self._append(dict(entry, state=FAILED), durable=False)
+            raise
+        self._append(dict(entry, state=DONE, response=response), durable=False)
+
+    def forget(self, key):
+        """
+        Forget the calls with a content hash, eg. a job whose outcome is unknown once it's known it wasn't created.
+        :param str key: Content hash of a call.
+        """
+        with self._condition:
+            entry = self._entries.get(self._keys.get(key))
+        if entry is not None:
+            self._append(dict(entry, state=FAILED), durable=True)
+
+    def flush(self):
+        """
+        Wait until all the records are written.
+        """
+        with self._condition:
+            self._wait_flushed(self._queued)
+
+    def close(self):
+        """
+        Write the remaining records and stop the writer thread.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+        self._close()
+
+    def _append(self, record, durable):
+        with self._condition:
+            if self._closed:
+                raise ValueError('The journal is closed.')
+            self._apply(record)
+            self._queue.append(record)
+            self._queued += 1
+            self._condition.notify_all()
+            if durable:
+                self._wait_flushed(self._queued)
+
+    def _apply(self, record):
+        if record['id'] not in self._entries:
+            self._expiry.append((record['time'], record['id']))
+        self._entries[record['id']] = record
+        if record['key'] is not None:
+            self._keys[record['key']] = record['id']
+        self._prune(time.time() - self.retention)
+
+    def _prune(self, since):
+        """
+        Drop the calls older than the retention from memory, roughly in the order they were made.
+        """
+        expiry = self._expiry
+        while expiry and expiry[0][0] < since:
+            _, entry_id = expiry.popleft()
+            entry = self._entries.pop(entry_id, None)
+            if entry is not None and self._keys.get(entry['key']) == entry_id:
+                del self._keys[entry['key']]
+
+    def _wait_flushed(self, sequence):
+        while self._flushed < sequence and self._error is None:
+            self._condition.wait()
+        if self._error is not None:
+            raise self._error
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._queue and not self._closed:
+                    self._condition.wait()
+                if not self._queue:
+                    return
+                records, self._queue = self._queue, []
+                sequence = self._queued
+            try:
+                self._write(records)
+            except Exception as e:
+                with self._condition:
+                    self._error = e
+                    self._condition.notify_all()
+                return
+            with self._condition:
+                self._flushed = sequence
+                self._condition.notify_all()
+
+    def _load(self, since):
+        """
+        :param float since: Timestamp of the oldest call to load, older calls can be dropped.
+        :return: An iterable of the records in the order they were written.
+        """
+        raise NotImplementedError
+
+    def _write(self, records):
+        """
+        Write and fsync a group of records.
+        :param list records: Records to write.
+        """
+        raise NotImplementedError
+
+    def _close(self):
+        pass
+
+
+class FileRequestJournal(RequestJournal):
+    """
+    Journal in a file of JSON lines. It's compacted when opened, calls older than the retention are dropped.
+    """
+    def __init__(self, path, retention=DAY):
+        """
+        :param str path: Path to the journal file.
+        :param float retention: Number of seconds the calls are kept in the journal.
+        """
+        self.path = path
+        self._file = None
+        super(FileRequestJournal, self).__init__(retention)
+        self._file = io.open(path, 'ab')
+
+    def _load(self, since):
+        if not os.path.exists(self.path):
+            return []
+        records = {}
+        with io.open(self.path, 'rb') as f:
+            for line in f:
+                try:
+                    record = json.loads(line.decode('utf-8'))
+                except ValueError:  # A record torn by a crash
+                    continue
+                if record['time'] >= since:
+                    records[record['id']] = record
+        records = sorted(records.values(), key=lambda record: record['time'])
+        temporary = self.path + '.tmp'
+        with io.open(temporary, 'wb') as f:
+            f.writelines(self._encode(record) for record in records)
+            f.flush()
+            os.fsync(f.fileno())
+        replace(temporary, self.path)
+        return records
+
+    def _write(self, records):
+        self._file.write(b''.join(self._encode(record) for record in records))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _close(self):
+        self._file.close()
+
+    @staticmethod
+    def _encode(record):
+        return (json.dumps(record, sort_keys=True) + '\n').encode('utf-8')
+
+
+class SQLiteRequestJournal(RequestJournal):
+    """
+    Journal in an SQLite database, a transaction per group of records.
+    """
+    def __init__(self, path, retention=DAY):
+        """
+        :param str path: Path to the database file.
+        :param float retention: Number of seconds the calls are kept in the journal.
+        """
+        self.path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute('PRAGMA synchronous = FULL')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS journal (id TEXT PRIMARY KEY, key TEXT, endpoint TEXT, state TEXT, '
+            'time REAL, response TEXT)'
+        )
+        super(SQLiteRequestJournal, self).__init__(retention)
+
+    def _load(self, since):
+        self._connection.execute('DELETE FROM journal WHERE time < ?', (since,))
+        rows = self._connection.execute(
+            'SELECT id, key, endpoint, state, time, response FROM journal ORDER BY time'
+        ).fetchall()
+        return [{'id': row[0], 'key': row[1], 'endpoint': row[2], 'state': row[3], 'time': row[4],
+                 'response': json.loads(row[5]) if row[5] is not None else None} for row in rows]
+
+    def _write(self, records):
+        self._connection.execute('BEGIN')
+        try:
+            self._connection.executemany(
+                'INSERT OR REPLACE INTO journal (id, key, endpoint, state, time, response) VALUES (?, ?, ?, ?, ?, ?)',
+                [(record['id'], record['key'], record['endpoint'], record['state'], record['time'],
+                  json.dumps(record['response']) if record['response'] is not None else None)
+                 for record in records]
+            )
+        except Exception:
+            self._connection.execute('ROLLBACK')
+            raise
+        self._connection.execute('COMMIT')
+
+    def _close(self):
+        self._connection.close()
@@ -6,6 +6,8 @@ class VerifiedEmail(object):
     VerifiedEmail holds the information about an email that was verified, like the if it's valid, or disposable
     email address.
     """
+    __slots__ = ('email', 'result_code')
+
     text_codes = ('valid', 'invalid', 'disposable', 'catchall', 'unknown')
 
     result_codes = dict(zip(range(5), text_codes))
@@ -15,6 +17,21 @@ class VerifiedEmail(object):
         self.email = email
         self.result_code = result_code
 
+    def __reduce__(self):
+        return self.__class__, (self.email, self.result_code)
+
+    def __eq__(self, other):
+        if not isinstance(other, VerifiedEmail):
+            return NotImplemented
+        return self.email == other.email and self.result_code == other.result_code
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __hash__(self):
+        return hash((self.email, self.result_code))
+
     @classmethod
     def from_text_code(cls, email, result_text_code):
         """
@@ -75,6 +92,23 @@ class VerifiedEmail(object):
         return self.result_code == 4
 
 
+class FailedVerification(object):
+    """
+    FailedVerification holds an email address that couldn't be verified and the error that occurred.
+    """
+    __slots__ = ('email', 'error')
+
+    def __init__(self, email, error):
+        self.email = email
+        self.error = error
+
+    def __str__(self):
+        """
+        :return: A string representation of FailedVerification.
+        """
+        return '{}: failed ({})'.format(self.email, self.error)
+
+
 class Job(object):
     """
     Job class holds the information about NeverBounce bulk processing job.
@@ -86,29 +120,163 @@ class Job(object):
         return 'job {}'.format(self.job_id).title()
 
 
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def parse_timestamp(value):
+    """
+    Parse a timestamp of the API, eg. `2016-01-16 04:05:59`, without the overhead of strptime.
+    :param str value: Timestamp or None.
+    :return: A datetime object or None.
+    """
+    if value is None:
+        return None
+    if len(value) == 19 and value[4] == '-' and value[7] == '-' and value[10] == ' ':
+        try:
+            return datetime(int(value[0:4]), int(value[5:7]), int(value[8:10]), int(value[11:13]),
+                            int(value[14:16]), int(value[17:19]))
+        except ValueError:
+            pass
+    return datetime.strptime(value, TIMESTAMP_FORMAT)
+
+
+class JobStats(dict):
+    """
+    JobStats holds the statistics of a bulk verification job, the counts are available as integer attributes.
+    """
+    __slots__ = ()
+
+    def _count(name):
+        return property(lambda self: int(self.get(name) or 0))
+
+    total = _count('total')
+    processed = _count('processed')
+    valid = _count('valid')
+    invalid = _count('invalid')
+    disposable = _count('disposable')
+    catchall = _count('catchall')
+    unknown = _count('unknown')
+    duplicates = _count('duplicates')
+    bad_syntax = _count('bad_syntax')
+    billable = _count('billable')
+    job_time = _count('job_time')
+    del _count
+
+
+class _ResponseField(object):
+    """
+    Field of a JobStatus parsed from the response on first access and cached.
+    """
+    def __init__(self, name, key, parse=None):
+        self.name = name
+        self.key = key
+        self.parse = parse
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        try:
+            return instance._parsed[self.name]
+        except KeyError:
+            value = instance._response.get(self.key)
+            if self.parse is not None and value is not None:
+                value = self.parse(value)
+            instance._parsed[self.name] = value
+            return value
+
+    def __set__(self, instance, value):
+        instance._parsed[self.name] = value
+
+
 class JobStatus(object):
     """
-    JobStatus class holds the information about NeverBounce bulk verification job status.
+    JobStatus class holds the information about NeverBounce bulk verification job status. The fields are parsed from
+    the response of the status endpoint when they are first accessed.
     """
+    __slots__ = ('_response', '_parsed')
+
     statuses = ('uploading', 'received', 'parsing', 'parsed', 'running', 'completed', 'failed')
     status_codes = dict(zip(range(-1, 6), statuses))
     type_codes = {0: 'dashboard', 1: 'API'}
 
+    job_id = _ResponseField('job_id', 'id', int)
+    status_code = _ResponseField('status_code', 'status', int)
+    type_code = _ResponseField('type_code', 'type', int)
+    stats = _ResponseField('stats', 'stats', JobStats)
+    orig_name = _ResponseField('orig_name', 'orig_name')
+    created = _ResponseField('created', 'created', parse_timestamp)
+    started = _ResponseField('started', 'started', parse_timestamp)
+    finished = _ResponseField('finished', 'finished', parse_timestamp)
+
     def __init__(self, job_id, status_code, type_code, stats, orig_name, created, started, finished, **kwargs):
-        self.job_id = int(job_id)
-        self.status_code = int(status_code)
-        self.status = self.status_codes.get(self.status_code, '')
-        self.type_code = int(type_code)
-        self.type = self.type_codes.get(self.type_code, '')
-        self.stats = stats
-        self.orig_name = orig_name
-        self.created = datetime.strptime(created, '%Y-%m-%d %H:%M:%S') if created is not None else None
-        self.started = datetime.strptime(started, '%Y-%m-%d %H:%M:%S') if started is not None else None
-        self.finished = datetime.strptime(finished, '%Y-%m-%d %H:%M:%S') if finished is not None else None
+        self._response = dict(kwargs, id=job_id, status=status_code, type=type_code, stats=stats,
+                              orig_name=orig_name, created=created, started=started, finished=finished)
+        self._parsed = {}
+
+    @classmethod
+    def from_response(cls, resp):
+        """
+        Alternative method to create an instance of JobStatus object from the status API response.
+        :param dict resp: Response data of the status endpoint.
+        :return: An instance of object.
+        """
+        job_status = cls.__new__(cls)
+        job_status._response = dict(resp)
+        job_status._parsed = {}
+        return job_status
+
+    def __getstate__(self):
+        return self._response
+
+    def __setstate__(self, state):
+        self._response = state
+        self._parsed = {}
 
     def __str__(self):
         return '{} job {}'.format(self.status, self.job_id).title()
 
+    @property
+    def status(self):
+        return self.status_codes.get(self.status_code, '')
+
+    @property
+    def type(self):
+        return self.type_codes.get(self.type_code, '')
+
+    @property
+    def progress(self):
+        """
+        :return: Fraction of the emails processed, between 0 and 1, or None if the number of emails is not known.
+        """
+        if self.is_completed:
+            return 1.0
+        stats = self.stats
+        if not stats or not stats.total:
+            return None
+        return min(1.0, stats.processed / float(stats.total))
+
+    @property
+    def throughput(self):
+        """
+        :return: Number of emails processed per second since the job started, or None if it's not known yet.
+        """
+        stats = self.stats
+        if not stats or not stats.job_time or not stats.processed:
+            return None
+        return stats.processed / float(stats.job_time)
+
+    @property
+    def eta(self):
+        """
+        :return: Estimated number of seconds until the job completes, or None if it can't be estimated yet.
+        """
+        if self.is_completed or self.is_failed:
+            return 0.0
+        throughput = self.throughput
+        if throughput is None or not self.stats.total:
+            return None
+        return max(0.0, (self.stats.total - self.stats.processed) / throughput)
+
     @property
     def is_uploading(self):
         return self.status_code == -1
@@ -0,0 +1,193 @@
+"""
+Post-processing of large bulk verification results across a pool of processes. The results file (eg. a spool, see
+NeverBounce.download_results) is split into byte-range shards aligned to rows, every worker memory-maps the file and
+parses its shards, applies a mapper to each row and reduces the mapped values, then the partial results of the shards
+are merged in the order of the file.
+
+The mapper and the reducer are sent to the worker processes so they must be picklable, eg. module level functions.
+Shards are aligned to line breaks, results with line breaks inside quoted fields are not supported.
+"""
+import io
+import mmap
+import multiprocessing
+import os
+import shutil
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from neverbounce.results import CHUNK_SIZE, ResultsParser
+
+
+class Reducer(object):
+    """
+    Base class of the reducers combining the mapped values of the results. Every shard is reduced into a partial
+    result in a worker process, the partial results are merged in the parent process.
+    """
+    def start(self, shard):
+        """
+        :param int shard: Index of the shard.
+        :return: The initial accumulator of the shard.
+        """
+        raise NotImplementedError
+
+    def add(self, accumulator, value):
+        """
+        :param accumulator: Accumulator of the shard.
+        :param value: A value returned by the mapper.
+        :return: The updated accumulator.
+        """
+        raise NotImplementedError
+
+    def finish(self, accumulator):
+        """
+        :param accumulator: Accumulator of a shard with all of its values.
+        :return: Picklable partial result of the shard.
+        """
+        return accumulator
+
+    def merge(self, partials):
+        """
+        :param list partials: Partial results of all the shards in the order of the file.
+        :return: The final result.
+        """
+        raise NotImplementedError
+
+
+class CountReducer(Reducer):
+    """
+    Counts the mapped values, eg. domains or (domain, result_code) tuples.
+    """
+    def start(self, shard):
+        return Counter()
+
+    def add(self, accumulator, value):
+        accumulator[value] += 1
+        return accumulator
+
+    def merge(self, partials):
+        total = Counter()
+        for partial in partials:
+            total.update(partial)
+        return total
+
+
+class ListReducer(Reducer):
+    """
+    Collects the mapped values in a list in the order of the file.
+    """
+    def start(self, shard):
+        return []
+
+    def add(self, accumulator, value):
+        accumulator.append(value)
+        return accumulator
+
+    def merge(self, partials):
+        return [value for partial in partials for value in partial]
+
+
+class FileReducer(Reducer):
+    """
+    Writes the mapped values, lines of text, to a file. Every shard is written to a part file next to it, the parts
+    are concatenated in the order of the file.
+    """
+    def __init__(self, path):
+        """
+        :param str path: Path to the output file.
+        """
+        self.path = path
+
+    def start(self, shard):
+        return io.open('{}.part-{:05d}'.format(self.path, shard), 'w', encoding='utf-8')
+
+    def add(self, accumulator, value):
+        accumulator.write(value if value.endswith('\n') else value + '\n')
+        return accumulator
+
+    def finish(self, accumulator):
+        accumulator.close()
+        return accumulator.name
+
+    def merge(self, partials):
+        with io.open(self.path, 'wb') as output:
+            for part in partials:
+                with io.open(part, 'rb') as f:
+                    shutil.copyfileobj(f, output, CHUNK_SIZE)
+                os.remove(part)
+        return self.path
+
+
+def shard_ranges(path, shards):
+    """
+    Split a file into byte ranges of about the same size, starting and ending on line breaks.
+    :param str path: Path to the file.
+    :param int shards: Number of shards.
+    :return: A list of (start, end) tuples of byte offsets.
+    """
+    size = os.path.getsize(path)
+    if not size:
+        return []
+    boundaries = [0]
+    with io.open(path, 'rb') as f:
+        for i in range(1, shards):
+            offset = max(size * i // shards, boundaries[-1])
+            f.seek(offset)
+            f.readline()
+            offset = f.tell()
+            if offset >= size:
+                break
+            if offset > boundaries[-1]:
+                boundaries.append(offset)
+    boundaries.append(size)
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def process_shard(path, shard, start, end, mapper, reducer, email_column=0, result_column=-1):
+    """
+    Parse, map and reduce a shard of a results file, in a worker process.
+    :return: The partial result of the shard.
+    """
+    parser = ResultsParser(email_column, result_column)
+    accumulator = reducer.start(shard)
+    with io.open(path, 'rb') as f:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            for offset in range(start, end, CHUNK_SIZE):
+                rows = parser.feed(data[offset:min(offset + CHUNK_SIZE, end)])
+                accumulator = _reduce_rows(rows, mapper, reducer, accumulator)
+        finally:
+            data.close()
+    accumulator = _reduce_rows(parser.close(), mapper, reducer, accumulator)
+    return reducer.finish(accumulator)
+
+
+def _reduce_rows(rows, mapper, reducer, accumulator):
+    add = reducer.add
+    for email, result_code in rows:
+        value = mapper(email, result_code)
+        if value is not None:
+            accumulator = add(accumulator, value)
+    return accumulator
+
+
+def process_results(path, mapper, reducer, processes=None, shards=None, email_column=0, result_column=-1):
+    """
+    Map and reduce the rows of a results file across a pool of processes.
+    :param str path: Path to the results file, eg. a spool.
+    :param callable mapper: Function called with the email and result code of every row, returns the value to reduce
+        or None to skip the row.
+    :param Reducer reducer: Reducer of the mapped values.
+    :param int processes: Number of worker processes, the number of CPUs by default. With 1 the file is processed
+        in the current process.
+    :param int shards: Number of shards, four per process by default so that the workers are kept busy.
+    :param int email_column: Index of the email column.
+    :param int result_column: Index of the result column.
+    :return: The result of the reducer.
+    """
+    processes = processes or multiprocessing.cpu_count()
+    ranges = shard_ranges(path, shards or processes * 4)
+    args = [(path, shard, start, end, mapper, reducer, email_column, result_column)
+            for shard, (start, end) in enumerate(ranges)]
+    if processes == 1:
+        return reducer.merge([process_shard(*arguments) for arguments in args])
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        return reducer.merge(list(executor.map(process_shard, *zip(*args))))
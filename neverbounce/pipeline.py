@@ -0,0 +1,100 @@
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from neverbounce.cache import normalize_email
+from neverbounce.waiter import JobWaiter
+
+
+class JobPipeline(object):
+    """
+    Verifies a large list of emails with bulk jobs. The list is deduplicated and split in chunks, each chunk is
+    submitted as a separate job, at most `max_parallel_jobs` at a time. The jobs are polled by a JobWaiter with a
+    backoff adapted to their progress and the results of each job are downloaded as soon as it completes.
+    """
+    def __init__(self, client, chunk_size=50000, max_parallel_jobs=4, min_poll_interval=1, max_poll_interval=60):
+        """
+        :param NeverBounce client: Client to make the API calls with.
+        :param int chunk_size: Number of emails per job.
+        :param int max_parallel_jobs: Maximum number of jobs in progress at the same time.
+        :param float min_poll_interval: Minimum number of seconds between two status checks of a job.
+        :param float max_poll_interval: Maximum number of seconds between two status checks of a job.
+        """
+        self.client = client
+        self.chunk_size = chunk_size
+        self.max_parallel_jobs = max_parallel_jobs
+        self.min_poll_interval = min_poll_interval
+        self.max_poll_interval = max_poll_interval
+
+    def run(self, emails):
+        """
+        Verify the emails. Results of the client's prefilter and result cache are yielded right away, the rest as
+        their jobs complete, so the order of results doesn't follow the order of input.
+        :param iterable emails: Email addresses to verify.
+        :yields: VerifiedEmail objects, one per unique email address.
+        :raises: JobFailedError if a job fails.
+        """
+        cache = self.client.result_cache
+        prefilter = self.client.prefilter
+        unique = self._unique if prefilter is None else prefilter.unique
+        waiter = JobWaiter(self.client, self.min_poll_interval, self.max_poll_interval)
+        executor = ThreadPoolExecutor(max_workers=self.max_parallel_jobs)
+        pending = set()
+        try:
+            chunk = []
+            for email in unique(emails):
+                verified_email = prefilter.check(email) if prefilter is not None else None
+                if verified_email is None and cache is not None:
+                    verified_email = cache.get(email)
+                    if self.client.instruments:
+                        self.client._emit('cache_lookup', verified_email is not None)
+                if verified_email is not None:
+                    yield verified_email
+                    continue
+                chunk.append(email)
+                if len(chunk) < self.chunk_size:
+                    continue
+                while len(pending) >= self.max_parallel_jobs:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for verified_email in self._completed(done):
+                        yield verified_email
+                pending.add(executor.submit(self._verify_chunk, chunk, waiter))
+                chunk = []
+            if chunk:
+                pending.add(executor.submit(self._verify_chunk, chunk, waiter))
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for verified_email in self._completed(done):
+                    yield verified_email
+        finally:
+            # On a failed job or an abandoned run don't wait for the other jobs to complete
+            for future in pending:
+                future.cancel()
+            waiter.close()
+            executor.shutdown()
+
+    @staticmethod
+    def _unique(emails):
+        seen = set()
+        for email in emails:
+            key = normalize_email(email)
+            if key and key not in seen:
+                seen.add(key)
+                yield email.strip()
+
+    def _completed(self, futures):
+        cache = self.client.result_cache
+        for future in futures:
+            for batch in future.result():
+                if cache is not None:
+                    cache.set_many(batch)
+                for verified_email in batch:
+                    yield verified_email
+
+    def _verify_chunk(self, emails, waiter):
+        """
+        Submit a chunk of emails as a job, wait for it to complete and download the results.
+        :param list emails: Email addresses to verify.
+        :param JobWaiter waiter: Waiter of the run.
+        :return: A list of ResultBatch objects.
+        """
+        job = self.client.create_job(emails)
+        waiter.add(job.job_id).result()
+        return list(self.client.result_batches(job.job_id))
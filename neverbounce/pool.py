@@ -0,0 +1,212 @@
+import threading
+import time
+from neverbounce.client import NeverBounce
+
+
+class FairShareLimiter(object):
+    """
+    Limits the number of concurrent API calls of many tenants to a total, shared fairly: a tenant with more calls in
+    flight than its share of the total (divided by the number of tenants with calls in flight or waiting) only gets a
+    free slot when no other tenant is waiting for one. A tenant with a large bulk job can use all the slots while it
+    is alone but can't starve the realtime calls of the others.
+    """
+    def __init__(self, max_concurrency=10):
+        """
+        :param int max_concurrency: Maximum number of API calls in flight of all the tenants.
+        """
+        self.max_concurrency = max_concurrency
+        self._active = {}
+        self._waiting = {}
+        self._total = 0
+        self._condition = threading.Condition()
+
+    def share(self):
+        """
+        :return: Number of slots a tenant is guaranteed while the others are busy.
+        """
+        with self._condition:
+            return self._share()
+
+    def in_flight(self, tenant=None):
+        """
+        :param tenant: A tenant, all the tenants if not set.
+        :return: Number of API calls in flight.
+        """
+        with self._condition:
+            return self._total if tenant is None else self._active.get(tenant, 0)
+
+    def acquire(self, tenant):
+        """
+        Wait for a free slot of the tenant.
+        :param tenant: Key of the tenant.
+        """
+        with self._condition:
+            self._waiting[tenant] = self._waiting.get(tenant, 0) + 1
+            try:
+                while not self._available(tenant):
+                    self._condition.wait()
+            finally:
+                self._waiting[tenant] -= 1
+                if not self._waiting[tenant]:
+                    del self._waiting[tenant]
+            self._active[tenant] = self._active.get(tenant, 0) + 1
+            self._total += 1
+
+    def release(self, tenant):
+        """
+        :param tenant: Key of the tenant.
+        """
+        with self._condition:
+            self._active[tenant] -= 1
+            if not self._active[tenant]:
+                del self._active[tenant]
+            self._total -= 1
+            self._condition.notify_all()
+
+    def _share(self):
+        tenants = len(self._active) + sum(1 for tenant in self._waiting if tenant not in self._active)
+        return max(1, self.max_concurrency // max(1, tenants))
+
+    def _available(self, tenant):
+        if self._total >= self.max_concurrency:
+            return False
+        if self._active.get(tenant, 0) < self._share():
+            return True
+        return all(waiting == tenant for waiting in self._waiting)
+
+
+class TenantSlot(object):
+    """
+    Concurrency limiter of a client of a NeverBounceClientPool, holding a slot of the FairShareLimiter during every
+    HTTP request of the tenant.
+    """
+    def __init__(self, limiter, tenant):
+        self.limiter = limiter
+        self.tenant = tenant
+        self.last_used = time.time()
+
+    def __enter__(self):
+        self.limiter.acquire(self.tenant)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.last_used = time.time()
+        self.limiter.release(self.tenant)
+
+
+class NeverBounceClientPool(object):
+    """
+    Pool of NeverBounce clients of many API accounts (tenants), keyed by their credentials. The clients share one
+    bounded HTTP connection pool and a fair share of the concurrent API calls, each keeps its own access token. The
+    least recently used idle clients are evicted when there are too many of them or after they have been idle for a
+    while.
+    """
+    def __init__(self, base_url='https://api.neverbounce.com/v3', max_clients=100, idle_timeout=600,
+                 max_concurrency=10, pool_connections=10, pool_maxsize=None, pool_block=True, keep_alive=True,
+                 **client_options):
+        """
+        :param str base_url: Base URL of the API.
+        :param int max_clients: Maximum number of clients kept, unless all of them are busy.
+        :param float idle_timeout: Number of seconds after which an idle client is evicted, None to keep it.
+        :param int max_concurrency: Maximum number of API calls in flight of all the tenants, see FairShareLimiter.
+        :param int pool_connections: Number of per-host connection pools to cache.
+        :param int pool_maxsize: Maximum number of connections kept alive per host, `max_concurrency` by default.
+        :param bool pool_block: Block when all connections of a pool are in use instead of opening new ones, so that
+            streamed downloads don't exceed the bound.
+        :param bool keep_alive: Keep connections open between calls.
+        :param client_options: Other arguments of the NeverBounce clients, eg. `timeout` or `token_store`.
+        """
+        self.base_url = base_url
+        self.max_clients = max_clients
+        self.idle_timeout = idle_timeout
+        self.limiter = FairShareLimiter(max_concurrency)
+        self.client_options = client_options
+        self.session = NeverBounce._create_session(pool_connections, pool_maxsize or max_concurrency, pool_block,
+                                                   keep_alive)
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._clients)
+
+    def __contains__(self, credentials):
+        with self._lock:
+            return tuple(credentials) in self._clients
+
+    def client(self, api_username, api_key):
+        """
+        :param str api_username: API username of the tenant.
+        :param str api_key: API secret key of the tenant.
+        :return: The NeverBounce client of the tenant, created if it isn't in the pool.
+        """
+        key = (api_username, api_key)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                slot = TenantSlot(self.limiter, key)
+                client = self._clients[key] = NeverBounce(api_username, api_key, self.base_url, session=self.session,
+                                                          concurrency_limiter=slot, **self.client_options)
+            else:
+                client.concurrency_limiter.last_used = time.time()
+            evicted = self._evict(exclude=key)
+        for evicted_client in evicted:
+            evicted_client.close()
+        return client
+
+    def verify(self, api_username, api_key, email):
+        """
+        Verify a single email address with the client of a tenant.
+        :param str api_username: API username of the tenant.
+        :param str api_key: API secret key of the tenant.
+        :param str email: Email address to verify.
+        :return: A VerifiedEmail object.
+        """
+        return self.client(api_username, api_key).verify(email)
+
+    def evict_idle(self):
+        """
+        Close and remove the clients idle for longer than `idle_timeout`, and the least recently used idle clients
+        over `max_clients`.
+        :return: Number of evicted clients.
+        """
+        with self._lock:
+            evicted = self._evict()
+        for client in evicted:
+            client.close()
+        return len(evicted)
+
+    def close(self):
+        """
+        Close all the clients and the shared connection pool.
+        """
+        with self._lock:
+            clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            client.close()
+        self.session.close()
+
+    def _evict(self, exclude=None):
+        idle = sorted((client.concurrency_limiter.last_used, key) for key, client in self._clients.items()
+                      if key != exclude and self._is_idle(key, client))
+        now = time.time()
+        evicted = []
+        for last_used, key in idle:
+            expired = self.idle_timeout is not None and now - last_used > self.idle_timeout
+            if not expired and len(self._clients) <= self.max_clients:
+                break
+            evicted.append(self._clients.pop(key))
+        return evicted
+
+    def _is_idle(self, key, client):
+        """
+        :return: True if the client has no calls in flight and isn't waiting for jobs.
+        """
+        waiter = client._job_waiter
+        return not self.limiter.in_flight(key) and (waiter is None or not waiter.pending)
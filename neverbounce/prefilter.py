@@ -0,0 +1,147 @@
+import io
+import re
+import threading
+from bisect import bisect_left
+from neverbounce.cache import normalize_email
+from neverbounce.objects import VerifiedEmail
+
+# Dot-atom local part and a domain of ASCII labels, IDNs in their IDNA (xn--) form; the top level domain can't be
+# numeric
+EMAIL_PATTERN = re.compile(
+    r'^[a-z0-9!#$%&\'*+/=?^_`{|}~-]+(?:\.[a-z0-9!#$%&\'*+/=?^_`{|}~-]+)*'
+    r'@(?:[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?\.)+[a-z][a-z0-9-]{0,61}[a-z0-9]$'
+)
+
+
+def idna_domain(domain):
+    """
+    :param str domain: Domain name.
+    :return: The domain name in ASCII, internationalized domains encoded with IDNA.
+    :raises: UnicodeError if the domain can't be encoded.
+    """
+    try:
+        domain.encode('ascii')
+        return domain
+    except UnicodeError:
+        return domain.encode('idna').decode('ascii')
+
+
+class DomainIndex(object):
+    """
+    Compact set of domains kept in a sorted list and searched by bisection. A domain matches if it or any of its
+    parent domains is in the index, eg. `mx.example.com` matches `example.com`. Internationalized domains are looked
+    up in their IDNA form, eg. `xn--bcher-kva.de`.
+    """
+    def __init__(self, domains=()):
+        """
+        :param iterable domains: Domain names.
+        """
+        self._domains = sorted(set(domain.strip().lower() for domain in domains if domain.strip()))
+
+    @classmethod
+    def from_file(cls, path):
+        """
+        Load the index from a text file with one domain per line, lines starting with # are ignored.
+        :param str path: Path to the file.
+        :return: A DomainIndex object.
+        """
+        with io.open(path, encoding='utf-8') as f:
+            return cls(line for line in f if not line.startswith('#'))
+
+    def __len__(self):
+        return len(self._domains)
+
+    def __contains__(self, domain):
+        domains = self._domains
+        while True:
+            i = bisect_left(domains, domain)
+            if i < len(domains) and domains[i] == domain:
+                return True
+            dot = domain.find('.')
+            if dot < 0:
+                return False
+            domain = domain[dot + 1:]
+
+
+class PreFilter(object):
+    """
+    Verifies emails locally where possible, so that they don't have to be sent to the API. Emails with an invalid
+    syntax or a domain known to be invalid (eg. without an MX record) are verified as invalid, emails of a known
+    disposable email provider as disposable. The emails resolved this way are counted. Emails which are valid but
+    not in the common form, with a quoted or non-ASCII local part or a domain literal, are left to the API.
+    """
+    def __init__(self, disposable_domains=None, invalid_domains=None):
+        """
+        :param DomainIndex disposable_domains: Domains of disposable email providers.
+        :param DomainIndex invalid_domains: Domains which can't receive emails.
+        """
+        self.disposable_domains = disposable_domains
+        self.invalid_domains = invalid_domains
+        self.checked = 0
+        self.invalid_syntax = 0
+        self.invalid_domain = 0
+        self.disposable = 0
+        self.duplicates = 0
+        self._lock = threading.Lock()
+
+    def check(self, email):
+        """
+        :param str email: Email address.
+        :return: A VerifiedEmail object if the email was verified locally, None if it has to be verified by the API.
+        """
+        key = normalize_email(email)
+        with self._lock:
+            self.checked += 1
+        local_part, _, domain = key.rpartition('@')
+        if local_part.startswith('"') or domain.startswith('['):
+            return None
+        try:
+            local_part.encode('ascii')
+            domain = idna_domain(domain)
+        except UnicodeError:
+            return None
+        if EMAIL_PATTERN.match(local_part + '@' + domain) is None:
+            return self._resolved(email, 'invalid_syntax', 'invalid')
+        if self.invalid_domains is not None and domain in self.invalid_domains:
+            return self._resolved(email, 'invalid_domain', 'invalid')
+        if self.disposable_domains is not None and domain in self.disposable_domains:
+            return self._resolved(email, 'disposable', 'disposable')
+        return None
+
+    def unique(self, emails):
+        """
+        Skip blank emails and the duplicates which differ only in case or surrounding whitespace.
+        :param iterable emails: Email addresses.
+        :yields: The first occurrence of each email address, stripped of whitespace.
+        """
+        seen = set()
+        for email in emails:
+            key = normalize_email(email)
+            if not key:
+                continue
+            if key in seen:
+                with self._lock:
+                    self.duplicates += 1
+                continue
+            seen.add(key)
+            yield email.strip()
+
+    @property
+    def avoided(self):
+        """
+        :return: Number of emails which were not sent to the API.
+        """
+        return self.invalid_syntax + self.invalid_domain + self.disposable + self.duplicates
+
+    @property
+    def stats(self):
+        """
+        :return: A dictionary with the number of emails checked, resolved locally by reason and avoided.
+        """
+        return {'checked': self.checked, 'invalid_syntax': self.invalid_syntax, 'invalid_domain': self.invalid_domain,
+                'disposable': self.disposable, 'duplicates': self.duplicates, 'avoided': self.avoided}
+
+    def _resolved(self, email, counter, result_text_code):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+        return VerifiedEmail.from_text_code(email, result_text_code)
@@ -0,0 +1,107 @@
+import os
+import struct
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+class RateLimiter(object):
+    """
+    Thread-safe token bucket limiting the rate of API calls.
+    """
+    def __init__(self, rate, burst=1):
+        """
+        :param float rate: Allowed number of calls per second.
+        :param int burst: Number of calls that can be made at once after a period of inactivity.
+        """
+        if rate <= 0:
+            raise ValueError('rate must be positive')
+        self.rate = float(rate)
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.time()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Block until a call is allowed.
+        """
+        while True:
+            with self._lock:
+                delay = self._take()
+            if delay <= 0:
+                return
+            time.sleep(delay)
+
+    def _take(self):
+        """
+        Take a token from the bucket if there is one.
+        :return: 0 if a token was taken, otherwise the number of seconds until there is one.
+        """
+        tokens, updated = self._load()
+        now = time.time()
+        tokens = min(self.burst, tokens + max(0.0, now - updated) * self.rate)
+        delay = 0 if tokens >= 1 else (1 - tokens) / self.rate
+        self._store(tokens - 1 if tokens >= 1 else tokens, now)
+        return delay
+
+    def _load(self):
+        return self._tokens, self._updated
+
+    def _store(self, tokens, updated):
+        self._tokens, self._updated = tokens, updated
+
+
+class FileRateLimiter(RateLimiter):
+    """
+    Token bucket shared by the processes on the same machine, its state is kept in a small file locked while a token
+    is taken. Processes sharing the file should use the same rate and burst.
+    """
+    _state = struct.Struct('<dd')
+
+    def __init__(self, path, rate, burst=1):
+        """
+        :param str path: Path to the file.
+        :param float rate: Allowed number of calls per second.
+        :param int burst: Number of calls that can be made at once after a period of inactivity.
+        """
+        super(FileRateLimiter, self).__init__(rate, burst)
+        self.path = path
+        self._file = None
+
+    def _take(self):
+        if self._file is None:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            self._file = os.fdopen(fd, 'r+b')
+        if fcntl is not None:
+            fcntl.flock(self._file, fcntl.LOCK_EX)
+        try:
+            return super(FileRateLimiter, self)._take()
+        finally:
+            if fcntl is not None:
+                fcntl.flock(self._file, fcntl.LOCK_UN)
+
+    def _load(self):
+        self._file.seek(0)
+        data = self._file.read(self._state.size)
+        if len(data) < self._state.size:
+            return float(self.burst), time.time()
+        return self._state.unpack(data)
+
+    def _store(self, tokens, updated):
+        self._file.seek(0)
+        self._file.write(self._state.pack(tokens, updated))
+        self._file.flush()
+
+    def close(self):
+        """
+        Close the state file.
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
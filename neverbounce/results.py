@@ -0,0 +1,136 @@
+import io
+from array import array
+from neverbounce import csvio
+from neverbounce.exceptions import InvalidResponseError
+from neverbounce.objects import VerifiedEmail
+
+CHUNK_SIZE = 256 * 1024
+
+
+class ResultsParser(object):
+    """
+    Incremental parser of the CSV stream of bulk verification results. Chunks of bytes are fed as they are
+    downloaded, rows split across chunks and quoted fields (including those with line breaks) are handled.
+    """
+    def __init__(self, email_column=0, result_column=-1):
+        """
+        :param int email_column: Index of the email column.
+        :param int result_column: Index of the result column, the API appends it as the last column.
+        """
+        self.email_column = email_column
+        self.result_column = result_column
+        self._buffer = b''
+
+    def feed(self, chunk):
+        """
+        :param bytes chunk: The next chunk of the stream.
+        :return: A list of (email, result_code) tuples of the rows completed by the chunk.
+        """
+        data = self._buffer + chunk
+        end = self._last_row_end(data)
+        self._buffer = data[end:]
+        return self._parse(data[:end])
+
+    def close(self):
+        """
+        :return: A list of (email, result_code) tuples of the remaining rows.
+        """
+        data, self._buffer = self._buffer, b''
+        return self._parse(data)
+
+    @staticmethod
+    def _last_row_end(data):
+        """
+        :return: Index after the last line break which is not inside a quoted field.
+        """
+        end = data.rfind(b'\n') + 1
+        if b'"' not in data:
+            return end
+        quotes = data.count(b'"', 0, end)
+        while end and quotes % 2:
+            previous = data.rfind(b'\n', 0, end - 1) + 1
+            quotes -= data.count(b'"', previous, end)
+            end = previous
+        return end
+
+    def _parse(self, data):
+        if not data:
+            return []
+        codes = VerifiedEmail.result_text_codes
+        email_column, result_column = self.email_column, self.result_column
+        text = data.decode('utf-8')
+        if '"' in text:
+            rows = csvio.reader(io.StringIO(text, newline=''))
+        else:
+            rows = (line.rstrip('\r').split(',') for line in text.split('\n'))
+        try:
+            return [(row[email_column], codes[row[result_column]]) for row in rows if row and row != ['']]
+        except (KeyError, IndexError) as e:
+            raise InvalidResponseError('Failed to parse the results row: {!r}'.format(e.args[0]))
+
+
+class ResultBatch(object):
+    """
+    ResultBatch holds a batch of verification results in columns, a list of emails and an array of result codes.
+    """
+    __slots__ = ('emails', 'result_codes')
+
+    def __init__(self, emails=None, result_codes=None):
+        self.emails = [] if emails is None else emails
+        self.result_codes = array('b') if result_codes is None else result_codes
+
+    def __len__(self):
+        return len(self.emails)
+
+    def __iter__(self):
+        """
+        :yields: VerifiedEmail objects of the batch.
+        """
+        for email, result_code in zip(self.emails, self.result_codes):
+            yield VerifiedEmail(email, result_code)
+
+    def extend(self, rows):
+        """
+        :param list rows: (email, result_code) tuples to append.
+        """
+        if rows:
+            emails, result_codes = zip(*rows)
+            self.emails.extend(emails)
+            self.result_codes.extend(result_codes)
+
+
+def iter_rows(chunks, email_column=0, result_column=-1):
+    """
+    Parse a stream of bulk verification results.
+    :param iterable chunks: Chunks of bytes of the stream.
+    :param int email_column: Index of the email column.
+    :param int result_column: Index of the result column.
+    :yields: (email, result_code) tuples.
+    """
+    parser = ResultsParser(email_column, result_column)
+    for chunk in chunks:
+        for row in parser.feed(chunk):
+            yield row
+    for row in parser.close():
+        yield row
+
+
+def iter_batches(chunks, batch_size=10000, email_column=0, result_column=-1):
+    """
+    Parse a stream of bulk verification results into batches of columns.
+    :param iterable chunks: Chunks of bytes of the stream.
+    :param int batch_size: Approximate number of rows in a batch, whole chunks are parsed into the same batch.
+    :param int email_column: Index of the email column.
+    :param int result_column: Index of the result column.
+    :yields: ResultBatch objects.
+    """
+    parser = ResultsParser(email_column, result_column)
+    batch = ResultBatch()
+    for chunk in chunks:
+        batch.extend(parser.feed(chunk))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = ResultBatch()
+    batch.extend(parser.close())
+    if len(batch):
+        yield batch
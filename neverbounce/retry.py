@@ -0,0 +1,155 @@
+import random
+import threading
+import time
+from neverbounce.exceptions import CircuitOpenError, NeverBounceAPIError
+
+RETRY_STATUS_CODES = frozenset((429, 500, 502, 503, 504))
+
+
+def is_transient(error):
+    """
+    :param Exception error: Error of an API call.
+    :return: True if the error is likely temporary, a connection failure, a timeout, rate limiting or a server error.
+    """
+    if isinstance(error, NeverBounceAPIError):
+        return error.status_code in RETRY_STATUS_CODES
+    import requests
+    return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+
+def retry_after(error):
+    """
+    :param Exception error: Error of an API call.
+    :return: Number of seconds to wait according to the Retry-After header of the response, None if there is none.
+    """
+    response = getattr(error, 'response', None)
+    value = response.headers.get('Retry-After') if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        from email.utils import mktime_tz, parsedate_tz
+        date = parsedate_tz(value)
+        return max(0.0, mktime_tz(date) - time.time()) if date else None
+
+
+class RetryPolicy(object):
+    """
+    Retries idempotent API calls that failed with a transient error, with exponential backoff and full jitter, or as
+    long as a Retry-After header asks. Retries are limited by a budget so that they can't multiply the load on an API
+    which is already failing: every call deposits `budget_ratio` of a retry and every retry withdraws one.
+    """
+    def __init__(self, max_attempts=4, backoff=0.5, max_backoff=30, budget_ratio=0.2, min_budget=10):
+        """
+        :param int max_attempts: Maximum number of attempts of a call, including the first one.
+        :param float backoff: Maximum delay in seconds before the first retry, doubled for every next one.
+        :param float max_backoff: Maximum delay in seconds before any retry, including a Retry-After.
+        :param float budget_ratio: Number of retries earned by every call.
+        :param int min_budget: Number of retries available before any calls are made, and the cap of saved retries.
+        """
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.budget_ratio = budget_ratio
+        self.min_budget = min_budget
+        self.retries = 0
+        self._budget = float(min_budget)
+        self._lock = threading.Lock()
+
+    def call(self, function, *args, **kwargs):
+        """
+        Call the function, retrying it on transient errors.
+        :return: Return value of the function.
+        """
+        with self._lock:
+            self._budget = min(self.min_budget, self._budget + self.budget_ratio)
+        attempt = 1
+        while True:
+            try:
+                return function(*args, **kwargs)
+            except Exception as e:
+                if attempt >= self.max_attempts or not is_transient(e) or not self._withdraw():
+                    raise
+                time.sleep(self.delay(attempt, e))
+                attempt += 1
+
+    def delay(self, attempt, error=None):
+        """
+        :param int attempt: Number of the failed attempt, starting with 1.
+        :param Exception error: Error of the failed attempt.
+        :return: Number of seconds to wait before the next attempt.
+        """
+        delay = retry_after(error)
+        if delay is None:
+            delay = random.uniform(0, self.backoff * 2 ** (attempt - 1))
+        return min(delay, self.max_backoff)
+
+    def _withdraw(self):
+        with self._lock:
+            if self._budget < 1:
+                return False
+            self._budget -= 1
+            self.retries += 1
+            return True
+
+
+class CircuitBreaker(object):
+    """
+    Fails API calls fast while the API is down. After `failure_threshold` consecutive transient errors the circuit
+    opens and calls raise CircuitOpenError without being made. After `reset_timeout` seconds a single trial call is
+    let through, its success closes the circuit and its failure opens it again.
+    """
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half-open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        """
+        :param int failure_threshold: Number of consecutive failures which open the circuit.
+        :param float reset_timeout: Number of seconds the circuit stays open before a trial call.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened = None
+        self._lock = threading.Lock()
+
+    def call(self, function, *args, **kwargs):
+        """
+        Call the function unless the circuit is open.
+        :return: Return value of the function.
+        :raises: CircuitOpenError if the circuit is open.
+        """
+        self._before()
+        try:
+            result = function(*args, **kwargs)
+        except Exception as e:
+            if is_transient(e):
+                self._failure()
+            else:
+                self._success()
+            raise
+        self._success()
+        return result
+
+    def _before(self):
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            remaining = self._opened + self.reset_timeout - time.time()
+            if self.state == self.OPEN and remaining <= 0:
+                self.state = self.HALF_OPEN
+                return
+        raise CircuitOpenError(max(0.0, remaining))
+
+    def _success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def _failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened = time.time()
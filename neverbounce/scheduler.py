@@ -0,0 +1,119 @@
+import threading
+from collections import deque
+from neverbounce.instrumentation import Histogram, timer
+
+REALTIME = 'realtime'
+POLLING = 'polling'
+BULK = 'bulk'
+
+# Priority classes from the highest priority to the lowest
+PRIORITY_CLASSES = (REALTIME, POLLING, BULK)
+
+ENDPOINT_CLASSES = {
+    'single': REALTIME,
+    'access_token': REALTIME,
+    'account': REALTIME,
+    'status': POLLING,
+    'bulk': BULK,
+    'download': BULK,
+}
+
+DEFAULT_BUDGETS = {REALTIME: 10, POLLING: 2, BULK: 2}
+
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+class RequestScheduler(object):
+    """
+    Schedules the HTTP requests of a client by priority class: realtime verifications (and the access token and
+    account calls they depend on), job status polling and bulk transfers (job uploads and result downloads). Every
+    class has its own budget of concurrent requests, and all of them share `max_concurrency` connections. When a
+    connection is released the queued requests are served in the order of priority, so realtime verifications go
+    ahead of queued background work. A streamed download holds its slot until the download is done.
+    """
+    def __init__(self, budgets=None, max_concurrency=10):
+        """
+        :param dict budgets: Maximum number of concurrent requests by priority class, see DEFAULT_BUDGETS.
+        :param int max_concurrency: Maximum number of concurrent requests of all the classes, keep it within the
+            `pool_maxsize` of the client.
+        """
+        self.budgets = dict(DEFAULT_BUDGETS, **(budgets or {}))
+        self.max_concurrency = max_concurrency
+        self._in_flight = dict.fromkeys(PRIORITY_CLASSES, 0)
+        self._total = 0
+        self._queues = dict((priority_class, deque()) for priority_class in PRIORITY_CLASSES)
+        self._requests = dict.fromkeys(PRIORITY_CLASSES, 0)
+        self._max_queued = dict.fromkeys(PRIORITY_CLASSES, 0)
+        self._waits = dict((priority_class, Histogram(WAIT_BUCKETS)) for priority_class in PRIORITY_CLASSES)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def priority_class(endpoint):
+        """
+        :param str endpoint: API endpoint, eg. `single`.
+        :return: The priority class of the requests to the endpoint.
+        """
+        return ENDPOINT_CLASSES.get(endpoint, POLLING)
+
+    def acquire(self, priority_class):
+        """
+        Wait for a slot of the priority class.
+        :param str priority_class: Priority class of the request, eg. REALTIME.
+        """
+        start = timer()
+        with self._lock:
+            self._requests[priority_class] += 1
+            queue = self._queues[priority_class]
+            if not queue and self._can_run(priority_class):
+                self._start(priority_class)
+                self._waits[priority_class].observe(0.0)
+                return
+            ready = threading.Event()
+            queue.append(ready)
+            self._max_queued[priority_class] = max(self._max_queued[priority_class], len(queue))
+        ready.wait()
+        with self._lock:
+            self._waits[priority_class].observe(timer() - start)
+
+    def release(self, priority_class):
+        """
+        Release a slot of the priority class and hand the free slots to the queued requests by priority.
+        :param str priority_class: Priority class of the request.
+        """
+        with self._lock:
+            self._in_flight[priority_class] -= 1
+            self._total -= 1
+            for queued_class in PRIORITY_CLASSES:
+                queue = self._queues[queued_class]
+                while queue and self._can_run(queued_class):
+                    self._start(queued_class)
+                    queue.popleft().set()
+
+    @property
+    def stats(self):
+        """
+        :return: A dictionary of the statistics by priority class: the number of requests in flight and queued, the
+            maximum queue depth, the number of requests and the mean, median and 99th percentile wait in seconds
+            (upper bounds of histogram buckets).
+        """
+        with self._lock:
+            return dict((priority_class, self._class_stats(priority_class)) for priority_class in PRIORITY_CLASSES)
+
+    def _class_stats(self, priority_class):
+        waits = self._waits[priority_class]
+        return {
+            'in_flight': self._in_flight[priority_class],
+            'queued': len(self._queues[priority_class]),
+            'max_queued': self._max_queued[priority_class],
+            'requests': self._requests[priority_class],
+            'wait_mean': waits.sum / waits.count if waits.count else None,
+            'wait_p50': waits.quantile(0.5),
+            'wait_p99': waits.quantile(0.99),
+        }
+
+    def _can_run(self, priority_class):
+        return self._total < self.max_concurrency and self._in_flight[priority_class] < self.budgets[priority_class]
+
+    def _start(self, priority_class):
+        self._in_flight[priority_class] += 1
+        self._total += 1
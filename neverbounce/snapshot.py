@@ -0,0 +1,168 @@
+"""
+Incremental re-verification of a list against a snapshot of its previous results. The snapshot is a CSV file of
+emails, results and the times they were verified. It's loaded into an index of email hashes, so no objects are kept
+per email. Only the emails of the new list which are not in the snapshot, or whose result is stale, are submitted as
+bulk jobs. The fresh results are merged with the ones still valid into an updated snapshot.
+"""
+import hashlib
+import io
+import itertools
+import os
+import struct
+import time
+from neverbounce import csvio
+from neverbounce.cache import DAY, normalize_email
+from neverbounce.objects import VerifiedEmail
+
+try:
+    from hashlib import blake2b
+
+    def _digest(data):
+        return blake2b(data, digest_size=8).digest()
+except ImportError:  # Python 2
+    def _digest(data):
+        return hashlib.sha1(data).digest()[:8]
+
+# Replaces an existing file on Windows as well, Python 2 falls back to rename
+replace = getattr(os, 'replace', os.rename)
+
+# Maximum age in seconds of a result before it's verified again, by result text code; None never expires
+DEFAULT_MAX_AGES = {
+    'valid': 90 * DAY,
+    'invalid': 180 * DAY,
+    'disposable': 180 * DAY,
+    'catchall': 30 * DAY,
+    'unknown': 0,
+}
+
+HEADER = ['email', 'result', 'verified_at']
+
+
+def email_hash(email):
+    """
+    :param str email: Email address.
+    :return: A 64-bit hash of the normalized email, the same on every platform and Python version.
+    """
+    return struct.unpack('<Q', _digest(normalize_email(email).encode('utf-8')))[0]
+
+
+class Snapshot(object):
+    """
+    Index of a snapshot of results by the hash of the normalized email. Each entry packs the result code and the
+    time of the verification into a single integer.
+    """
+    def __init__(self, path=None, verified_at=None, email_column=0):
+        """
+        :param str path: Path to a snapshot, eg. written by reverify, or a results file with a header row having
+            `email` and `result` columns. A missing file is an empty snapshot.
+        :param int verified_at: Time of the verification of the results without a `verified_at` column, the
+            modification time of the file by default.
+        :param int email_column: Index of the email column if the file has no `email` column.
+        """
+        self.path = path
+        self._index = {}
+        if path is not None and os.path.exists(path):
+            self._load(path, int(os.path.getmtime(path)) if verified_at is None else int(verified_at), email_column)
+
+    def __len__(self):
+        return len(self._index)
+
+    def get(self, email):
+        """
+        :param str email: Email address.
+        :return: A tuple of the result code and the time of the verification, or None if it's not in the snapshot.
+        """
+        packed = self._index.get(email_hash(email))
+        if packed is None:
+            return None
+        return packed & 7, packed >> 3
+
+    def add(self, email, result_code, verified_at):
+        """
+        :param str email: Email address.
+        :param int result_code: Result code of the verification.
+        :param int verified_at: Time of the verification.
+        """
+        self._index[email_hash(email)] = int(verified_at) << 3 | result_code
+
+    def _load(self, path, verified_at, email_column):
+        codes = VerifiedEmail.result_text_codes
+        with io.open(path, encoding='utf-8', newline='') as f:
+            rows = csvio.reader(f)
+            first = next(rows, None)
+            if first is None:
+                return
+            result_column, time_column = -1, None
+            if 'result' in first:
+                email_column = first.index('email') if 'email' in first else email_column
+                result_column = first.index('result')
+                time_column = first.index('verified_at') if 'verified_at' in first else None
+            else:
+                rows = itertools.chain([first], rows)
+            index = self._index
+            for row in rows:
+                try:
+                    code = codes[row[result_column]]
+                    key = email_hash(row[email_column])
+                    when = int(row[time_column]) if time_column is not None else verified_at
+                except (KeyError, IndexError, ValueError):
+                    continue
+                index[key] = when << 3 | code
+
+
+def reverify(client, snapshot, emails, output, max_ages=None, chunk_size=50000, max_parallel_jobs=4):
+    """
+    Verify the new and stale emails of a list and write the updated snapshot.
+    :param NeverBounce client: Client to verify the emails with.
+    :param snapshot: A Snapshot or a path to the snapshot of the previous results.
+    :param iterable emails: The current list of email addresses.
+    :param str output: Path to write the updated snapshot to, it can be the path of the previous snapshot. It's
+        written to a temporary file and renamed when complete.
+    :param dict max_ages: Maximum age in seconds by result text code, see DEFAULT_MAX_AGES.
+    :param int chunk_size: Number of emails per job.
+    :param int max_parallel_jobs: Maximum number of jobs in progress at the same time.
+    :return: A dictionary with the number of unique emails in the list (`total`), those with a `fresh` result in the
+        snapshot, `stale` and `new` ones which were verified, and the emails of the snapshot `dropped` from the list.
+    """
+    if not isinstance(snapshot, Snapshot):
+        snapshot = Snapshot(snapshot)
+    max_ages = dict(DEFAULT_MAX_AGES, **(max_ages or {}))
+    text_codes = VerifiedEmail.result_codes
+    now = int(time.time())
+    stats = {'total': 0, 'fresh': 0, 'stale': 0, 'new': 0, 'dropped': 0}
+    seen = set()
+    submitted = []
+    temporary = output + '.tmp'
+    try:
+        with io.open(temporary, 'w', encoding='utf-8', newline='') as f:
+            writer = csvio.writer(f, lineterminator='\n')
+            writer.writerow(HEADER)
+            for email in emails:
+                email = email.strip()
+                key = email_hash(email)
+                if not email or key in seen:
+                    continue
+                seen.add(key)
+                stats['total'] += 1
+                previous = snapshot.get(email)
+                if previous is None:
+                    stats['new'] += 1
+                    submitted.append(email)
+                    continue
+                result_code, verified_at = previous
+                max_age = max_ages.get(text_codes[result_code])
+                if max_age is not None and now - verified_at > max_age:
+                    stats['stale'] += 1
+                    submitted.append(email)
+                    continue
+                stats['fresh'] += 1
+                writer.writerow([email, text_codes[result_code], verified_at])
+            stats['dropped'] = len(snapshot) - stats['fresh'] - stats['stale']
+            if submitted:
+                for verified_email in client.verify_bulk(submitted, chunk_size, max_parallel_jobs):
+                    writer.writerow([verified_email.email, verified_email.result_text, int(time.time())])
+    except Exception:
+        os.remove(temporary)
+        raise
+    replace(temporary, output)
+    return stats
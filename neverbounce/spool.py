@@ -0,0 +1,101 @@
+import io
+import json
+import mmap
+import os
+from neverbounce.results import CHUNK_SIZE
+
+CHECKPOINT_INTERVAL = 4 * 1024 * 1024
+
+# Replaces an existing file on Windows as well, Python 2 falls back to rename
+replace = getattr(os, 'replace', os.rename)
+
+
+class ResultsSpool(object):
+    """
+    Local file the raw results of a bulk verification job are downloaded to, along with a checkpoint file recording
+    how much of the download has been committed so that an interrupted download can be resumed.
+    """
+    def __init__(self, path, job_id):
+        """
+        :param str path: Path to the spool file, the checkpoint is stored next to it.
+        :param int job_id: ID of the job whose results are spooled.
+        """
+        self.path = path
+        self.job_id = int(job_id)
+        self.checkpoint_path = path + '.checkpoint'
+        self.bytes = 0
+        self.rows = 0
+        self.complete = False
+        self._load_checkpoint()
+
+    def write(self, chunks, skip=0):
+        """
+        Append the chunks of the download to the spool file, committing a checkpoint periodically and when the
+        download is interrupted.
+        :param iterable chunks: Chunks of bytes of the download.
+        :param int skip: Number of bytes at the start of the chunks that have already been committed.
+        """
+        mode = 'r+b' if os.path.exists(self.path) else 'wb'
+        with io.open(self.path, mode) as f:
+            f.truncate(self.bytes)
+            f.seek(self.bytes)
+            uncommitted = 0
+            try:
+                for chunk in chunks:
+                    if skip:
+                        skipped = min(skip, len(chunk))
+                        chunk, skip = chunk[skipped:], skip - skipped
+                    f.write(chunk)
+                    self.bytes += len(chunk)
+                    self.rows += chunk.count(b'\n')
+                    uncommitted += len(chunk)
+                    if uncommitted >= CHECKPOINT_INTERVAL:
+                        self._commit(f)
+                        uncommitted = 0
+                self.complete = True
+            finally:
+                self._commit(f)
+
+    def finish(self):
+        """
+        Mark the download complete, eg. when the server has no more bytes to send.
+        """
+        self.write(())
+
+    def chunks(self, chunk_size=CHUNK_SIZE):
+        """
+        Read the spooled results, memory-mapped where possible.
+        :param int chunk_size: Size of the chunks in bytes.
+        :yields: The next chunk of bytes.
+        """
+        with io.open(self.path, 'rb') as f:
+            try:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (ValueError, mmap.error):  # Empty file or no mmap support
+                for chunk in iter(lambda: f.read(chunk_size), b''):
+                    yield chunk
+                return
+            try:
+                for offset in range(0, len(data), chunk_size):
+                    yield data[offset:offset + chunk_size]
+            finally:
+                data.close()
+
+    def _commit(self, f):
+        f.flush()
+        os.fsync(f.fileno())
+        checkpoint = {'job_id': self.job_id, 'bytes': self.bytes, 'rows': self.rows, 'complete': self.complete}
+        with open(self.checkpoint_path + '.tmp', 'w') as checkpoint_file:
+            json.dump(checkpoint, checkpoint_file)
+        replace(self.checkpoint_path + '.tmp', self.checkpoint_path)
+
+    def _load_checkpoint(self):
+        try:
+            with open(self.checkpoint_path) as f:
+                checkpoint = json.load(f)
+        except (IOError, ValueError):
+            return
+        if checkpoint.get('job_id') == self.job_id and os.path.exists(self.path):
+            self.bytes = checkpoint['bytes']
+            self.rows = checkpoint['rows']
+            self.complete = checkpoint['complete']
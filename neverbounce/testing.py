@@ -0,0 +1,255 @@
+"""
+A local fake of the NeverBounce API for tests and benchmarks.
+"""
+import itertools
+import json
+import random
+import threading
+import time
+from collections import Counter
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from urllib.parse import parse_qs
+except ImportError:  # Python 2
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    from urlparse import parse_qs
+
+
+class FakeNeverBounceServer(ThreadingMixIn, HTTPServer):
+    """
+    Threaded HTTP server answering the NeverBounce API endpoints with canned responses. It runs in a background
+    thread, use it as a context manager or call `start` and `stop`.
+
+    Every email is verified as `result` unless its local part is one of the result text codes, eg.
+    `catchall@example.com` is verified as catchall. Bulk jobs are processed evenly over `job_duration` seconds.
+    Every verified email takes one of the account's `credits`.
+
+    Downloads support HTTP Range requests unless `range_requests` is disabled. To simulate dropped connections
+    append byte counts to `download_faults`, the next downloads are cut off after that many bytes.
+
+    To simulate an unreliable API append HTTP status codes to `errors`, the next requests fail with them, or set
+    `error_rate` to fail that fraction of requests with `error_status`. Failed requests get an HTML error page and a
+    Retry-After header if `retry_after` is set. Every response is delayed by `latency` seconds, plus a random
+    `latency_jitter`, to simulate the network and the processing time of the API.
+    """
+    daemon_threads = True
+    allow_reuse_address = True
+    text_codes = ('valid', 'invalid', 'disposable', 'catchall', 'unknown')
+
+    def __init__(self, host='127.0.0.1', port=0, access_token='fake_token', result=0):
+        """
+        :param str host: Interface to listen on.
+        :param int port: Port to listen on, 0 picks a free port.
+        :param str access_token: Access token handed out by the access_token endpoint.
+        :param int result: Default result code of verified emails.
+        """
+        HTTPServer.__init__(self, (host, port), FakeNeverBounceHandler)
+        self.access_token = access_token
+        self.result = result
+        self.calls = Counter()
+        self.credits = 1000
+        self.jobs = {}
+        self.job_duration = 0
+        self._job_created = {}
+        self.range_requests = True
+        self.download_faults = []
+        self.errors = []
+        self.error_rate = 0
+        self.error_status = 503
+        self.retry_after = None
+        self.latency = 0
+        self.latency_jitter = 0
+        self._job_ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def base_url(self):
+        """
+        :return: Base URL to pass to the NeverBounce client.
+        """
+        return 'http://{}:{}/v3'.format(*self.server_address[:2])
+
+    @property
+    def requests_count(self):
+        return sum(self.calls.values())
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, kwargs={'poll_interval': 0.05})
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def count_request(self, endpoint):
+        with self._lock:
+            self.calls[endpoint] += 1
+
+    def injected_error(self):
+        """
+        :return: HTTP status code the next request fails with, None if it doesn't fail.
+        """
+        with self._lock:
+            if self.errors:
+                return self.errors.pop(0)
+        if self.error_rate and random.random() < self.error_rate:
+            return self.error_status
+        return None
+
+    def delay(self):
+        """
+        Wait for the simulated latency of a response.
+        """
+        delay = self.latency + (random.uniform(0, self.latency_jitter) if self.latency_jitter else 0)
+        if delay:
+            time.sleep(delay)
+
+    def result_code(self, email):
+        local_part = email.split('@', 1)[0]
+        return self.text_codes.index(local_part) if local_part in self.text_codes else self.result
+
+    def dispatch(self, endpoint, form):
+        """
+        Answer a call to an API endpoint.
+        :param str endpoint: Name of the endpoint, eg. `single`.
+        :param dict form: Parsed POST request data.
+        :return: A dictionary for JSON responses, bytes for octet-stream responses.
+        """
+        handler = getattr(self, 'handle_{}'.format(endpoint), None)
+        if handler is None:
+            return {'success': False, 'msg': 'Unknown endpoint'}
+        if endpoint != 'access_token' and form.get('access_token', [None])[0] != self.access_token:
+            return {'success': False, 'msg': 'Authentication failed'}
+        return handler(form)
+
+    def handle_access_token(self, form):
+        return {'access_token': self.access_token, 'expires_in': 3600}
+
+    def handle_single(self, form):
+        with self._lock:
+            self.credits -= 1
+        return {'success': True, 'result': self.result_code(form['email'][0]), 'result_details': 0,
+                'execution_time': 0.01}
+
+    def handle_bulk(self, form):
+        emails = [email for email in form.get('input', [''])[0].splitlines() if email]
+        with self._lock:
+            job_id = next(self._job_ids)
+            self.credits -= len(emails)
+            self.jobs[job_id] = emails
+            self._job_created[job_id] = time.time()
+        return {'success': True, 'job_status': 0, 'job_id': job_id, 'execution_time': 0.01}
+
+    def handle_status(self, form):
+        job_id = int(form['job_id'][0])
+        emails = self.jobs.get(job_id, [])
+        elapsed = time.time() - self._job_created.get(job_id, 0)
+        completed = elapsed >= self.job_duration
+        processed = len(emails) if completed else int(len(emails) * elapsed / self.job_duration)
+        stats = dict.fromkeys(self.text_codes, 0)
+        for email in emails[:processed]:
+            stats[self.text_codes[self.result_code(email)]] += 1
+        stats.update({'total': len(emails), 'processed': processed, 'billable': processed, 'duplicates': 0,
+                      'bad_syntax': 0, 'job_time': int(elapsed)})
+        return {'success': True, 'id': str(job_id), 'status': '4' if completed else '3', 'type': '1',
+                'orig_name': 'emails.csv', 'created': '2016-01-16 04:05:59', 'started': '2016-01-16 04:06:10',
+                'finished': '2016-01-16 04:06:14' if completed else None, 'stats': stats, 'execution_time': 0.01}
+
+    def handle_download(self, form):
+        emails = self.jobs.get(int(form['job_id'][0]), [])
+        return ''.join('{},{}\n'.format(email, self.text_codes[self.result_code(email)])
+                       for email in emails).encode('utf-8')
+
+    def handle_account(self, form):
+        return {'success': True, 'credits': str(self.credits), 'jobs_completed': str(len(self.jobs)),
+                'jobs_processing': '0', 'execution_time': 0.01}
+
+
+class FakeNeverBounceHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        endpoint = self.path.rstrip('/').rsplit('/', 1)[-1]
+        self.server.count_request(endpoint)
+        form = parse_qs(self.read_body().decode('utf-8'))
+        self.server.delay()
+        status = self.server.injected_error()
+        if status is not None:
+            headers = {'Retry-After': str(self.server.retry_after)} if self.server.retry_after is not None else None
+            body = '<html><body><h1>{} {}</h1></body></html>'.format(status, self.responses.get(status, ('',))[0])
+            self.send_body(body.encode('utf-8'), 'text/html', status, headers)
+            return
+        response = self.server.dispatch(endpoint, form)
+        if isinstance(response, bytes):
+            self.send_download(response)
+        else:
+            self.send_body(json.dumps(response).encode('utf-8'), 'application/json')
+
+    def send_download(self, body):
+        status, headers = 200, {}
+        range_header = self.headers.get('Range', '')
+        if self.server.range_requests and range_header.startswith('bytes=') and range_header.endswith('-'):
+            start = int(range_header[len('bytes='):-1])
+            if start >= len(body):
+                self.send_body(b'', 'text/plain', 416, {'Content-Range': 'bytes */{}'.format(len(body))})
+                return
+            status, headers = 206, {'Content-Range': 'bytes {}-{}/{}'.format(start, len(body) - 1, len(body))}
+            body = body[start:]
+        fault = self.server.download_faults.pop(0) if self.server.download_faults else None
+        self.send_body(body, 'application/octet-stream', status, headers, fault)
+
+    def read_body(self):
+        """
+        :return: The request body, decoded if it was sent with the chunked transfer encoding.
+        """
+        if self.headers.get('Transfer-Encoding', '').lower() != 'chunked':
+            return self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        chunks = []
+        while True:
+            size = int(self.rfile.readline().split(b';', 1)[0], 16)
+            if not size:
+                break
+            chunks.append(self.rfile.read(size))
+            self.rfile.readline()
+        while self.rfile.readline().strip():
+            pass
+        return b''.join(chunks)
+
+    def send_body(self, body, content_type, status=200, headers=None, truncate=None):
+        """
+        :param bytes body: Response body.
+        :param str content_type: Content type of the body.
+        :param int status: HTTP status code.
+        :param dict headers: Additional headers.
+        :param int truncate: Close the connection after sending this many bytes of the body.
+        """
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if self.close_connection:
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        if truncate is not None:
+            self.wfile.write(body[:truncate])
+            self.close_connection = True
+        else:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
@@ -0,0 +1,180 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Replaces an existing file on Windows as well, Python 2 falls back to rename
+replace = getattr(os, 'replace', os.rename)
+
+
+class AccessTokenCache(object):
+    """
+    Thread-safe cache of an access token. The token is refreshed ahead of its expiry and concurrent callers wait for a
+    single refresh in flight. An optional TokenStore shares the token with other clients and processes.
+    """
+    def __init__(self, fetch, key, store=None, refresh_margin=60):
+        """
+        :param callable fetch: Function retrieving a new token, returns a tuple of the token and its lifetime in
+            seconds (None if it's unknown).
+        :param str key: Key of the token in the store, eg. the API username.
+        :param TokenStore store: Store to share the token through.
+        :param int refresh_margin: Number of seconds before the expiry when the token is refreshed, at most half of
+            the lifetime of the token.
+        """
+        self.fetch = fetch
+        self.key = key
+        self.store = store
+        self.refresh_margin = refresh_margin
+        self._current = None
+        self._lifetime = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        """
+        :return: A valid access token string.
+        """
+        current = self._current
+        if self._is_fresh(current):
+            return current[0]
+        with self._lock:
+            if not self._is_fresh(self._current):
+                self._current = self._refresh()
+            return self._current[0]
+
+    def invalidate(self, token):
+        """
+        Forget a token the API rejected, unless it has already been replaced.
+        :param str token: The rejected access token.
+        """
+        with self._lock:
+            if self._current is not None and self._current[0] == token:
+                self._current = None
+        if self.store is not None:
+            self.store.delete(self.key, token)
+
+    def _refresh(self):
+        """
+        :return: A tuple of a fresh token and its expiry timestamp.
+        """
+        if self.store is None:
+            return self._fetch()
+        with self.store.lock(self.key):
+            current = self.store.load(self.key)
+            if not self._is_fresh(current):
+                current = self._fetch()
+                self.store.save(self.key, *current)
+            return current
+
+    def _fetch(self):
+        token, expires_in = self.fetch()
+        self._lifetime = int(expires_in) if expires_in else None
+        return token, time.time() + int(expires_in) if expires_in else None
+
+    def _is_fresh(self, current):
+        if current is None:
+            return False
+        expires_at = current[1]
+        if expires_at is None:
+            return True
+        margin = self.refresh_margin
+        if self._lifetime is not None:
+            margin = min(margin, self._lifetime / 2.0)
+        return time.time() < expires_at - margin
+
+
+class TokenStore(object):
+    """
+    Interface of a store sharing access tokens between clients, eg. in a database or a cache server.
+    """
+    def load(self, key):
+        """
+        :param str key: Key of the token.
+        :return: A tuple of the token and its expiry timestamp (None if it doesn't expire), or None if not stored.
+        """
+        raise NotImplementedError
+
+    def save(self, key, token, expires_at):
+        """
+        :param str key: Key of the token.
+        :param str token: Access token.
+        :param float expires_at: Expiry timestamp of the token or None if it doesn't expire.
+        """
+        raise NotImplementedError
+
+    def delete(self, key, token):
+        """
+        Delete the token if it's still the stored one.
+        :param str key: Key of the token.
+        :param str token: Access token.
+        """
+        raise NotImplementedError
+
+    @contextmanager
+    def lock(self, key):
+        """
+        Exclusive lock held while a token is refreshed, so that other clients wait for it instead of refreshing
+        the token themselves. No locking by default.
+        :param str key: Key of the token.
+        """
+        yield
+
+
+class FileTokenStore(TokenStore):
+    """
+    Stores the tokens in a JSON file, shared by the processes on the same machine.
+    """
+    def __init__(self, path):
+        """
+        :param str path: Path to the file.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+    def load(self, key):
+        token = self._read().get(key)
+        return tuple(token) if token is not None else None
+
+    def save(self, key, token, expires_at):
+        tokens = self._read()
+        tokens[key] = [token, expires_at]
+        self._write(tokens)
+
+    def delete(self, key, token):
+        with self.lock(key):
+            tokens = self._read()
+            if key in tokens and tokens[key][0] == token:
+                del tokens[key]
+                self._write(tokens)
+
+    @contextmanager
+    def lock(self, key):
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self.path + '.lock', 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (IOError, ValueError):
+            return {}
+
+    def _write(self, tokens):
+        fd, path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)))
+        with os.fdopen(fd, 'w') as f:
+            json.dump(tokens, f)
+        replace(path, self.path)
@@ -0,0 +1,115 @@
+import io
+
+try:
+    from urllib.parse import quote_plus, urlencode
+except ImportError:  # Python 2
+    from urllib import quote_plus, urlencode
+
+try:
+    string_types = (basestring,)
+except NameError:
+    string_types = (str,)
+
+
+class EmailSource(object):
+    """
+    Source of the email addresses of a bulk verification job, read in chunks so that the input never has to be held
+    in memory at once.
+    """
+    def __init__(self, emails, chunk_size=64 * 1024):
+        """
+        :param emails: An iterable of email addresses, a file-like object or a path to a file (eg. a CSV).
+        :param int chunk_size: Approximate size of the chunks in bytes.
+        """
+        self.emails = emails
+        self.chunk_size = chunk_size
+        self.count = 0
+        self._consumed = False
+        self._start = None
+        if self.is_file_like and self.replayable:
+            self._start = emails.tell()
+
+    @property
+    def is_path(self):
+        return isinstance(self.emails, string_types) or hasattr(self.emails, '__fspath__')
+
+    @property
+    def is_file_like(self):
+        return hasattr(self.emails, 'read')
+
+    @property
+    def replayable(self):
+        """
+        :return: True if the emails can be read more than once, eg. to resend them.
+        """
+        if self.is_path or isinstance(self.emails, (list, tuple)):
+            return True
+        if self.is_file_like:
+            seekable = getattr(self.emails, 'seekable', None)
+            return seekable() if seekable is not None else hasattr(self.emails, 'seek')
+        return False
+
+    def chunks(self):
+        """
+        Read the emails in chunks of bytes, one email (or a line of the file) per line. The lines read are counted
+        in `count`.
+        :yields: The next chunk of bytes.
+        :raises: ValueError if the source can't be read again.
+        """
+        if self._consumed and not self.replayable:
+            raise ValueError('The emails have already been consumed and can\'t be read again.')
+        self._consumed = True
+        self.count = 0
+        last = b'\n'
+        for chunk in self._chunks():
+            self.count += chunk.count(b'\n')
+            last = chunk[-1:] or last
+            yield chunk
+        if last != b'\n':
+            self.count += 1
+
+    def _chunks(self):
+        if self.is_path:
+            with io.open(self.emails, 'rb') as f:
+                for chunk in self._read_file(f):
+                    yield chunk
+        elif self.is_file_like:
+            if self._start is not None:
+                self.emails.seek(self._start)
+            for chunk in self._read_file(self.emails):
+                yield chunk
+        else:
+            for chunk in self._join(self.emails):
+                yield chunk
+
+    def _read_file(self, f):
+        while True:
+            chunk = f.read(self.chunk_size)
+            if not chunk:
+                return
+            yield chunk if isinstance(chunk, bytes) else chunk.encode('utf-8')
+
+    def _join(self, emails):
+        lines, size = [], 0
+        for email in emails:
+            lines.append(email)
+            size += len(email) + 1
+            if size >= self.chunk_size:
+                yield ('\n'.join(lines) + '\n').encode('utf-8')
+                lines, size = [], 0
+        if lines:
+            yield ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+def encode_form(data, field, chunks):
+    """
+    Encode POST request data as a stream of application/x-www-form-urlencoded bytes.
+    :param dict data: POST request data.
+    :param str field: Name of the field whose value is streamed.
+    :param iterable chunks: Chunks of bytes of the streamed value.
+    :yields: The next chunk of the encoded request body.
+    """
+    prefix = urlencode(sorted(data.items()))
+    yield '{}{}='.format(prefix + '&' if prefix else '', field).encode('ascii')
+    for chunk in chunks:
+        yield quote_plus(chunk).encode('ascii')
@@ -0,0 +1,248 @@
+import heapq
+import itertools
+import json
+import threading
+import time
+from concurrent.futures import Future, as_completed
+from neverbounce.exceptions import JobFailedError
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from urllib.parse import parse_qs
+except ImportError:  # Python 2
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from urlparse import parse_qs
+
+
+class JobWaiter(object):
+    """
+    Waits for many bulk verification jobs to complete with a single scheduler thread. Each job is checked again
+    halfway to its estimated time of completion, based on its progress since the previous check, and immediately when
+    notified, eg. by a WebhookReceiver.
+    """
+    def __init__(self, client, min_poll_interval=1, max_poll_interval=60):
+        """
+        :param NeverBounce client: Client to check the jobs with.
+        :param float min_poll_interval: Minimum number of seconds between two status checks of a job.
+        :param float max_poll_interval: Maximum number of seconds between two status checks of a job.
+        """
+        self.client = client
+        self.min_poll_interval = min_poll_interval
+        self.max_poll_interval = max_poll_interval
+        self._jobs = {}
+        self._schedule = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._thread = None
+        self._stopped = False
+
+    def add(self, job_id, callback=None):
+        """
+        Start waiting for a job, it's checked right away.
+        :param int job_id: ID of the job.
+        :param callable callback: Function called with the JobStatus of the completed job.
+        :return: A Future resolved with the JobStatus of the completed job, or failed with JobFailedError.
+        :raises: ValueError if the waiter is closed.
+        """
+        job_id = int(job_id)
+        with self._condition:
+            if self._stopped:
+                raise ValueError('The job waiter is closed.')
+            job = self._jobs.get(job_id)
+            if job is None:
+                job = self._jobs[job_id] = _WatchedJob(job_id, self.min_poll_interval)
+                self._schedule_check(job, 0)
+            if callback is not None:
+                job.future.add_done_callback(_on_success(callback))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='neverbounce-job-waiter')
+                self._thread.daemon = True
+                self._thread.start()
+            return job.future
+
+    @property
+    def pending(self):
+        """
+        :return: Number of jobs being waited for.
+        """
+        with self._condition:
+            return len(self._jobs)
+
+    def notify(self, job_id):
+        """
+        Check a job right away, eg. when a webhook reports it completed.
+        :param int job_id: ID of the job.
+        """
+        with self._condition:
+            job = self._jobs.get(int(job_id))
+            if job is not None:
+                self._schedule_check(job, 0)
+
+    def wait(self, job_ids, callback=None, timeout=None):
+        """
+        Wait for jobs to complete.
+        :param list job_ids: IDs of the jobs.
+        :param callable callback: Function called with the JobStatus of each completed job.
+        :param float timeout: Maximum number of seconds to wait for all the jobs.
+        :yields: JobStatus objects in the order of completion.
+        :raises: JobFailedError if a job fails, TimeoutError if the jobs don't complete in time.
+        """
+        futures = [self.add(job_id, callback) for job_id in job_ids]
+        for future in as_completed(futures, timeout=timeout):
+            yield future.result()
+
+    def close(self):
+        """
+        Stop the scheduler thread and cancel the futures of the jobs still waited for.
+        """
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+        with self._condition:
+            jobs, self._jobs = list(self._jobs.values()), {}
+        for job in jobs:
+            job.future.cancel()
+
+    def _schedule_check(self, job, delay):
+        job.generation += 1
+        heapq.heappush(self._schedule, (time.time() + delay, next(self._sequence), job, job.generation))
+        self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                due = self._due_jobs()
+                while not due and not self._stopped:
+                    timeout = self._schedule[0][0] - time.time() if self._schedule else None
+                    self._condition.wait(timeout)
+                    due = self._due_jobs()
+                if self._stopped:
+                    return
+            for job in due:
+                self._check(job)
+
+    def _due_jobs(self):
+        due = []
+        now = time.time()
+        while self._schedule and self._schedule[0][0] <= now:
+            _, _, job, generation = heapq.heappop(self._schedule)
+            if generation == job.generation and not job.future.done():
+                due.append(job)
+        return due
+
+    def _check(self, job):
+        try:
+            job_status = self.client.check_job(job.job_id)
+        except Exception as e:
+            self._finish(job, exception=e)
+            return
+        if job_status.is_completed:
+            self._finish(job, result=job_status)
+        elif job_status.is_failed:
+            self._finish(job, exception=JobFailedError(job_status))
+        else:
+            with self._condition:
+                self._schedule_check(job, self._next_interval(job, job_status))
+
+    def _finish(self, job, result=None, exception=None):
+        with self._condition:
+            self._jobs.pop(job.job_id, None)
+        if exception is not None:
+            job.future.set_exception(exception)
+        else:
+            job.future.set_result(result)
+
+    def _next_interval(self, job, job_status):
+        """
+        :return: Number of seconds until the next check, halfway to the estimated time of completion. The progress
+            observed since the previous check is preferred to the job's own ETA, which is based on whole seconds.
+        """
+        now = time.time()
+        processed = job_status.stats.processed if job_status.stats else 0
+        if job.previous is not None and processed > job.previous[1]:
+            rate = (processed - job.previous[1]) / (now - job.previous[0])
+            job.interval = (job_status.stats.total - processed) / rate / 2
+        elif job_status.eta is not None:
+            job.interval = job_status.eta / 2
+        else:
+            job.interval *= 1.5
+        job.interval = min(max(job.interval, self.min_poll_interval), self.max_poll_interval)
+        job.previous = (now, processed)
+        return job.interval
+
+
+def _on_success(callback):
+    def done(future):
+        if future.exception() is None:
+            callback(future.result())
+    return done
+
+
+class _WatchedJob(object):
+    __slots__ = ('job_id', 'future', 'interval', 'previous', 'generation')
+
+    def __init__(self, job_id, interval):
+        self.job_id = job_id
+        self.future = Future()
+        self.interval = interval
+        self.previous = None
+        self.generation = 0
+
+
+class WebhookReceiver(HTTPServer):
+    """
+    Local HTTP server that notifies a JobWaiter when a job completes, so that it's checked right away. It accepts
+    POST requests with a `job_id` in a JSON or form-encoded body.
+    """
+    def __init__(self, waiter, host='127.0.0.1', port=0):
+        """
+        :param JobWaiter waiter: Waiter to notify.
+        :param str host: Interface to listen on.
+        :param int port: Port to listen on, 0 picks a free port.
+        """
+        HTTPServer.__init__(self, (host, port), _WebhookHandler)
+        self.waiter = waiter
+        self._thread = None
+
+    @property
+    def url(self):
+        return 'http://{}:{}/'.format(*self.server_address[:2])
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, kwargs={'poll_interval': 0.1})
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+class _WebhookHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0)).decode('utf-8')
+        try:
+            if self.headers.get('Content-Type', '').startswith('application/json'):
+                job_id = int(json.loads(body)['job_id'])
+            else:
+                job_id = int(parse_qs(body)['job_id'][0])
+        except (KeyError, ValueError, TypeError):
+            self.send_response(400)
+        else:
+            self.server.waiter.notify(job_id)
+            self.send_response(204)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
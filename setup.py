@@ -21,7 +21,9 @@ setup(
     license='MIT',
     description='API library for the NeverBounce email verification service.',
     long_description=long_description,
-    install_requires=['requests>=2.9.0'],
+    install_requires=['requests>=2.9.0', 'futures>=3.0.0; python_version < "3"'],
+    extras_require={'async': ['aiohttp>=3.0'], 'numpy': ['numpy>=1.9'], 'arrow': ['pyarrow>=1.0']},
+    entry_points={'console_scripts': ['neverbounce = neverbounce.cli:main']},
     keywords=['api', 'email', 'verification'],
     classifiers=[
         'Development Status :: 3 - Alpha',
@@ -36,5 +38,5 @@ setup(
         'Programming Language :: Python :: 3.4',
         'Programming Language :: Python :: 3.5',
     ],
-    tests_require=['responses>=0.5.0']
+    tests_require=['responses>=0.5.0', 'mock>=2.0.0; python_version < "3.3"']
 )
@@ -0,0 +1,69 @@
+import asyncio
+from unittest import TestCase, skipIf
+from neverbounce.exceptions import NeverBounceAPIError
+from neverbounce.testing import FakeNeverBounceServer
+
+try:
+    import aiohttp
+    from neverbounce.aio import AsyncNeverBounce
+except ImportError:
+    aiohttp = None
+
+
+@skipIf(aiohttp is None, 'aiohttp is not installed')
+class AsyncClientTestCase(TestCase):
+    def setUp(self):
+        self.server = FakeNeverBounceServer().start()
+        self.addCleanup(self.server.stop)
+
+    def run_with_client(self, coroutine_function, **kwargs):
+        async def main():
+            async with AsyncNeverBounce('fake_user_name', 'fake_api_key', self.server.base_url, **kwargs) as client:
+                return await coroutine_function(client)
+        return asyncio.run(main())
+
+    def test_access_token(self):
+        self.assertEqual(self.run_with_client(lambda client: client.access_token()), 'fake_token')
+
+    def test_verify(self):
+        verified_email = self.run_with_client(lambda client: client.verify('catchall@email.com'))
+        self.assertEqual(str(verified_email), 'catchall@email.com: catchall')
+
+    def test_account(self):
+        account = self.run_with_client(lambda client: client.account())
+        self.assertEqual(str(account), 'Credits: 1000, Jobs Completed: 0, Jobs Processing: 0')
+
+    def test_bulk_job(self):
+        async def bulk(client):
+            job = await client.create_job(['john.doe@gmail.com', 'catchall@example.com', 'invalid@example.com'])
+            job_status = await client.check_job(job.job_id)
+            return job_status, [str(verified) async for verified in client.results(job.job_id)]
+
+        job_status, results = self.run_with_client(bulk)
+        self.assertEqual(str(job_status), 'Completed Job 1')
+        self.assertListEqual(
+            results, ['john.doe@gmail.com: valid', 'catchall@example.com: catchall', 'invalid@example.com: invalid']
+        )
+
+    def test_invalid_credentials(self):
+        self.server.handle_access_token = lambda form: {'success': False, 'msg': 'Invalid credentials'}
+        with self.assertRaises(NeverBounceAPIError):
+            self.run_with_client(lambda client: client.verify('john.doe@gmail.com'))
+
+    def test_expired_access_token_is_refreshed_once(self):
+        async def burst(client):
+            client._cached_access_token = 'expired_token'
+            return await asyncio.gather(*[client.verify('john.doe@gmail.com') for _ in range(20)])
+
+        results = self.run_with_client(burst, max_concurrency=5)
+        self.assertEqual(len(results), 20)
+        self.assertEqual(self.server.calls['access_token'], 1)
+        self.assertEqual(self.server.calls['single'], 40)
+
+    def test_expired_access_token_results(self):
+        async def results(client):
+            job = await client.create_job(['john.doe@gmail.com'])
+            client._cached_access_token = 'expired_token'
+            return [str(verified) async for verified in client.results(job.job_id)]
+
+        self.assertListEqual(self.run_with_client(results, max_concurrency=1), ['john.doe@gmail.com: valid'])
@@ -0,0 +1,117 @@
+import os
+import shutil
+import tempfile
+import time
+from unittest import TestCase
+from neverbounce.cache import MemoryResultCache, SQLiteResultCache, normalize_email
+from neverbounce.client import NeverBounce
+from neverbounce.objects import VerifiedEmail
+from neverbounce.testing import FakeNeverBounceServer
+
+
+class NormalizeEmailTestCase(TestCase):
+    def test_normalize_email(self):
+        self.assertEqual(normalize_email(' John.Doe@Example.com\n'), 'john.doe@example.com')
+
+
+class ResultCacheTestMixin(object):
+    def create_cache(self, **kwargs):
+        raise NotImplementedError
+
+    def test_miss(self):
+        cache = self.create_cache()
+        self.assertIsNone(cache.get('john.doe@example.com'))
+        self.assertEqual(cache.stats, {'hits': 0, 'misses': 1, 'evictions': 0})
+
+    def test_hit(self):
+        cache = self.create_cache()
+        cache.set(VerifiedEmail('john.doe@example.com', 0))
+        verified_email = cache.get(' John.Doe@example.com')
+        self.assertEqual(verified_email.email, ' John.Doe@example.com')
+        self.assertTrue(verified_email.is_valid)
+        self.assertEqual(cache.stats, {'hits': 1, 'misses': 0, 'evictions': 0})
+
+    def test_ttl_by_result(self):
+        cache = self.create_cache(ttls={'valid': 60, 'unknown': 0.01, 'catchall': None})
+        cache.set(VerifiedEmail('valid@example.com', 0))
+        cache.set(VerifiedEmail('unknown@example.com', 4))
+        cache.set(VerifiedEmail('catchall@example.com', 3))
+        time.sleep(0.02)
+        self.assertIsNotNone(cache.get('valid@example.com'))
+        self.assertIsNone(cache.get('unknown@example.com'))
+        self.assertIsNone(cache.get('catchall@example.com'))
+        self.assertEqual(cache.stats, {'hits': 1, 'misses': 2, 'evictions': 1})
+
+    def test_set_many(self):
+        cache = self.create_cache(ttls={'valid': 60, 'catchall': None})
+        cache.set_many([VerifiedEmail('valid@example.com', 0), VerifiedEmail('catchall@example.com', 3)])
+        self.assertTrue(cache.get('Valid@example.com').is_valid)
+        self.assertIsNone(cache.get('catchall@example.com'))
+        self.assertEqual(len(cache), 1)
+
+
+class MemoryResultCacheTestCase(ResultCacheTestMixin, TestCase):
+    def create_cache(self, **kwargs):
+        return MemoryResultCache(**kwargs)
+
+    def test_lru_eviction(self):
+        cache = self.create_cache(maxsize=2)
+        cache.set(VerifiedEmail('first@example.com', 0))
+        cache.set(VerifiedEmail('second@example.com', 0))
+        cache.get('first@example.com')
+        cache.set(VerifiedEmail('third@example.com', 0))
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get('second@example.com'))
+        self.assertIsNotNone(cache.get('first@example.com'))
+        self.assertEqual(cache.evictions, 1)
+
+
+class SQLiteResultCacheTestCase(ResultCacheTestMixin, TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.path = os.path.join(self.directory, 'results.sqlite')
+
+    def create_cache(self, **kwargs):
+        cache = SQLiteResultCache(self.path, **kwargs)
+        self.addCleanup(cache.close)
+        return cache
+
+    def test_persisted(self):
+        self.create_cache().set(VerifiedEmail('john.doe@example.com', 1))
+        self.assertTrue(self.create_cache().get('john.doe@example.com').is_invalid)
+
+    def test_wal_mode(self):
+        cache = self.create_cache()
+        self.assertEqual(cache._connection.execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+
+    def test_purge(self):
+        cache = self.create_cache(ttls={'valid': 0.01, 'invalid': 60})
+        cache.set(VerifiedEmail('valid@example.com', 0))
+        cache.set(VerifiedEmail('invalid@example.com', 1))
+        time.sleep(0.02)
+        cache.purge()
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.evictions, 1)
+
+
+class ClientResultCacheTestCase(TestCase):
+    def setUp(self):
+        self.server = FakeNeverBounceServer().start()
+        self.addCleanup(self.server.stop)
+        self.cache = MemoryResultCache()
+        self.neverbounce = NeverBounce('fake_user_name', 'fake_api_key', self.server.base_url,
+                                       result_cache=self.cache)
+        self.addCleanup(self.neverbounce.close)
+
+    def test_verify(self):
+        self.assertTrue(self.neverbounce.verify('john.doe@example.com').is_valid)
+        self.assertTrue(self.neverbounce.verify('JOHN.DOE@example.com').is_valid)
+        self.assertEqual(self.server.calls['single'], 1)
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_results_are_cached(self):
+        job = self.neverbounce.create_job(['john.doe@example.com', 'catchall@example.com'])
+        list(self.neverbounce.results(job.job_id))
+        self.assertTrue(self.neverbounce.verify('catchall@example.com').is_catchall)
+        self.assertEqual(self.server.calls['single'], 0)
@@ -0,0 +1,82 @@
+import io
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from neverbounce.cli import main
+from neverbounce.testing import FakeNeverBounceServer
+
+
+class CliTestCase(TestCase):
+    def setUp(self):
+        self.server = FakeNeverBounceServer().start()
+        self.addCleanup(self.server.stop)
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.input = os.path.join(self.directory, 'emails.csv')
+        self.output = os.path.join(self.directory, 'verified.csv')
+
+    def write_input(self, text):
+        with io.open(self.input, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+    def read_output(self):
+        with io.open(self.output, encoding='utf-8') as f:
+            return f.read().splitlines()
+
+    def run_cli(self, *args):
+        argv = [self.input, '-o', self.output, '--api-username', 'fake_user_name', '--api-key', 'fake_api_key',
+                '--base-url', self.server.base_url, '--quiet']
+        return main(argv + list(args))
+
+    def test_realtime(self):
+        self.write_input('id,name,email\n1,John,john@example.com\n2,Jane,invalid@example.com\n')
+        self.assertEqual(self.run_cli('--column', 'email'), 0)
+        self.assertListEqual(self.read_output(), ['id,name,email,result', '1,John,john@example.com,valid',
+                                                  '2,Jane,invalid@example.com,invalid'])
+        self.assertEqual(self.server.calls['single'], 2)
+
+    def test_tsv_without_header(self):
+        self.write_input('1\tjohn@example.com\n2\tcatchall@example.com\n')
+        self.run_cli('--column', '1')
+        self.assertListEqual(self.read_output(), ['1,john@example.com,valid', '2,catchall@example.com,catchall'])
+
+    def test_non_ascii(self):
+        self.write_input(u'name,email\n"Döe, Jöhn",jöhn@example.com\n')
+        self.run_cli('--column', 'email')
+        self.assertListEqual(self.read_output(), [u'name,email,result', u'"Döe, Jöhn",jöhn@example.com,valid'])
+
+    def test_realtime_resume(self):
+        self.write_input('email\n' + ''.join('user{}@example.com\n'.format(i) for i in range(5)))
+        with io.open(self.output, 'w', encoding='utf-8') as f:
+            f.write(u'email,result\nuser0@example.com,valid\nuser1@example.com,valid\nuser2@exa')
+        self.run_cli('--resume')
+        self.assertListEqual(self.read_output(), ['email,result'] + ['user{}@example.com,valid'.format(i)
+                                                                     for i in range(5)])
+        self.assertEqual(self.server.calls['single'], 3)
+
+    def test_realtime_resume_with_blank_lines(self):
+        self.write_input('email\nuser0@example.com\n\nuser1@example.com\n\nuser2@example.com\nuser3@example.com\n')
+        with io.open(self.output, 'w', encoding='utf-8') as f:
+            f.write(u'email,result\nuser0@example.com,valid\nuser1@example.com,valid\n')
+        self.run_cli('--resume')
+        self.assertListEqual(self.read_output(), ['email,result'] + ['user{}@example.com,valid'.format(i)
+                                                                     for i in range(4)])
+        self.assertEqual(self.server.calls['single'], 2)
+
+    def test_bulk(self):
+        self.write_input(''.join('user{}@example.com\n'.format(i) for i in range(20)) + 'USER1@example.com\n')
+        self.run_cli('--bulk-threshold', '10', '--chunk-size', '8')
+        output = self.read_output()
+        self.assertEqual(output[0], 'email,result')
+        self.assertListEqual(sorted(output[1:]), sorted('user{}@example.com,valid'.format(i) for i in range(20)))
+        self.assertEqual(self.server.calls['bulk'], 3)
+        self.assertEqual(self.server.calls['single'], 0)
+
+    def test_bulk_resume(self):
+        self.write_input(''.join('user{}@example.com\n'.format(i) for i in range(20)))
+        with io.open(self.output, 'w', encoding='utf-8') as f:
+            f.write(u'email,result\n' + u''.join(u'user{}@example.com,valid\n'.format(i) for i in range(15)))
+        self.run_cli('--mode', 'bulk', '--resume')
+        self.assertEqual(len(self.read_output()), 21)
+        self.assertEqual(len(self.server.jobs[1]), 5)
@@ -1,6 +1,14 @@
+import requests
 import responses
+import time
 from unittest import TestCase
+try:
+    from unittest import mock
+except ImportError:  # Python 2
+    import mock
 from neverbounce.client import NeverBounce, NeverBounceAPIError
+from neverbounce.objects import VerifiedEmail, FailedVerification
+from neverbounce.testing import FakeNeverBounceServer
 
 
 class ClientTestCase(TestCase):
@@ -142,3 +150,97 @@ class ClientTestCase(TestCase):
                 [str(email) for email in self.neverbounce.results(56789)],
                 ['john.doe@gmail.com: valid', 'admin@example.com: catchall', 'jane.doe@example.com: invalid']
             )
+
+    def test_session_is_reused(self):
+        with responses.RequestsMock(assert_all_requests_are_fired=True) as rsps:
+            rsps.add(**self.access_token_response)
+            rsps.add(
+                responses.POST, self.base_url + '/single', status=200, content_type='application/json',
+                json={'success': True, 'result': 0, 'result_details': 0, 'execution_time': 0.5}
+            )
+            session = self.neverbounce.session
+            self.neverbounce.verify('valid@email.com')
+            self.neverbounce.verify('valid@email.com')
+            self.assertIs(self.neverbounce.session, session)
+            self.assertEqual(len(rsps.calls), 3)
+
+    def test_timeout(self):
+        neverbounce = NeverBounce('fake_user_name', 'fake_api_key', self.base_url, timeout=(1, 5))
+        with responses.RequestsMock() as rsps:
+            rsps.add(**self.access_token_response)
+            with mock.patch.object(neverbounce.session, 'post', wraps=neverbounce.session.post) as post:
+                neverbounce.access_token()
+                self.assertEqual(post.call_args[1]['timeout'], (1, 5))
+
+    def test_context_manager_closes_session(self):
+        with mock.patch('requests.Session.close') as close:
+            with NeverBounce('fake_user_name', 'fake_api_key', self.base_url) as neverbounce:
+                self.assertIsNotNone(neverbounce.session)
+            self.assertTrue(close.called)
+
+    def test_shared_session_is_not_closed(self):
+        session = requests.Session()
+        with mock.patch.object(session, 'close') as close:
+            with NeverBounce('fake_user_name', 'fake_api_key', self.base_url, session=session) as neverbounce:
+                self.assertIs(neverbounce.session, session)
+            self.assertFalse(close.called)
+
+    def test_result_rows(self):
+        with responses.RequestsMock(assert_all_requests_are_fired=True) as rsps:
+            rsps.add(**self.access_token_response)
+            rsps.add(
+                responses.POST, self.base_url + '/download', status=200, content_type='application/octet-stream',
+                body=b'john.doe@gmail.com,valid\n"admin,@example.com",catchall\n'
+            )
+            self.assertListEqual(
+                list(self.neverbounce.result_rows(56789)),
+                [('john.doe@gmail.com', 0), ('admin,@example.com', 3)]
+            )
+
+    def test_result_batches(self):
+        with responses.RequestsMock(assert_all_requests_are_fired=True) as rsps:
+            rsps.add(**self.access_token_response)
+            rsps.add(
+                responses.POST, self.base_url + '/download', status=200, content_type='application/octet-stream',
+                body=b'john.doe@gmail.com,valid\nadmin@example.com,catchall\n'
+            )
+            batch, = self.neverbounce.result_batches(56789)
+            self.assertListEqual(batch.emails, ['john.doe@gmail.com', 'admin@example.com'])
+            self.assertListEqual(list(batch.result_codes), [0, 3])
+
+
+class VerifyManyTestCase(TestCase):
+    def setUp(self):
+        self.server = FakeNeverBounceServer().start()
+        self.addCleanup(self.server.stop)
+        self.neverbounce = NeverBounce('fake_user_name', 'fake_api_key', self.server.base_url)
+        self.addCleanup(self.neverbounce.close)
+        self.emails = ['{}@example.com'.format(text_code) for text_code in VerifiedEmail.text_codes] * 10
+
+    def test_ordered(self):
+        results = list(self.neverbounce.verify_many(self.emails, max_workers=4))
+        self.assertListEqual([str(result) for result in results], [
+            '{0}@example.com: {0}'.format(text_code) for text_code in VerifiedEmail.text_codes
+        ] * 10)
+        self.assertEqual(self.server.calls['access_token'], 1)
+
+    def test_unordered(self):
+        results = self.neverbounce.verify_many(iter(self.emails), max_workers=4, ordered=False)
+        self.assertListEqual(sorted(result.email for result in results), sorted(self.emails))
+
+    def test_failed_verification(self):
+        handle_single = self.server.handle_single
+        self.server.handle_single = lambda form: (
+            {'success': False, 'error_msg': 'Failed'} if form['email'][0] == 'invalid@example.com'
+            else handle_single(form)
+        )
+        results = list(self.neverbounce.verify_many(self.emails[:5], max_workers=2))
+        self.assertIsInstance(results[1], FailedVerification)
+        self.assertEqual(str(results[1]), 'invalid@example.com: failed (Failed)')
+        self.assertListEqual([result.is_valid for result in results if isinstance(result, VerifiedEmail)],
+                             [True, False, False, False])
+
+    def test_rate_limit(self):
+        start = time.time()
+        list(self.neverbounce.verify_many(self.emails[:6], max_workers=3, rate_limit=50))
+        self.assertGreaterEqual(time.time() - start, 0.1)
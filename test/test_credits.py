@@ -0,0 +1,109 @@
+import threading
+import time
+from unittest import TestCase
+from neverbounce.client import NeverBounce
+from neverbounce.credits import CreditGuard
+from neverbounce.exceptions import InsufficientCreditsError, NeverBounceAPIError
+from neverbounce.objects import Account
+from neverbounce.testing import FakeNeverBounceServer
+
+
+class CreditGuardTestCase(TestCase):
+    def setUp(self):
+        self.synced = []
+
+    def account(self, credits=10):
+        def account():
+            self.synced.append(credits)
+            return Account(credits, 0, 0)
+        return account
+
+    def test_spend(self):
+        guard = CreditGuard(reserve=2)
+        guard.spend(5, self.account())
+        guard.spend(3, self.account())
+        self.assertEqual(guard.credits, 2)
+        self.assertEqual(len(self.synced), 1)
+        with self.assertRaises(InsufficientCreditsError) as cm:
+            guard.spend(1, self.account())
+        self.assertEqual((cm.exception.available, cm.exception.required), (0, 1))
+        guard.refund(1)
+        guard.spend(1, self.account())
+
+    def test_sync_interval(self):
+        guard = CreditGuard(sync_interval=0)
+        guard.spend(5, self.account())
+        guard.spend(5, self.account())
+        self.assertEqual(guard.credits, 5)
+        self.assertEqual(len(self.synced), 2)
+
+    def test_block(self):
+        guard = CreditGuard(block=True, block_interval=0.01)
+        guard.update(0)
+        guard.sync_interval = 60
+        thread = threading.Thread(target=guard.spend, args=(5, self.account(100)))
+        thread.start()
+        thread.join(1)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(guard.credits, 95)
+
+    def test_spend_during_sync(self):
+        guard = CreditGuard(sync_interval=0.05)
+        guard.spend(1, self.account())
+        started, finish = threading.Event(), threading.Event()
+
+        def slow_account():
+            started.set()
+            finish.wait(1)
+            return self.account()()
+        threads = [threading.Thread(target=guard.spend, args=(1, slow_account)) for _ in range(3)]
+        time.sleep(0.05)
+        for thread in threads:
+            thread.start()
+        started.wait(1)
+        guard.refund(1)
+        self.assertEqual(guard.credits, 10)
+        finish.set()
+        for thread in threads:
+            thread.join(1)
+        self.assertEqual(guard.credits, 7)
+        self.assertEqual(len(self.synced), 2)
+
+
+class ClientCreditGuardTestCase(TestCase):
+    def setUp(self):
+        self.server = FakeNeverBounceServer().start()
+        self.addCleanup(self.server.stop)
+        self.server.credits = 10
+        self.guard = CreditGuard(reserve=2)
+        self.neverbounce = NeverBounce('fake_user_name', 'fake_api_key', self.server.base_url,
+                                       credit_guard=self.guard)
+        self.addCleanup(self.neverbounce.close)
+
+    def test_verify(self):
+        for _ in range(8):
+            self.neverbounce.verify('john.doe@example.com')
+        with self.assertRaises(InsufficientCreditsError):
+            self.neverbounce.verify('john.doe@example.com')
+        self.assertEqual(self.server.calls['single'], 8)
+        self.assertEqual(self.server.calls['account'], 1)
+
+    def test_refund_failed_verification(self):
+        self.neverbounce.account()
+        self.server.errors.append(400)
+        with self.assertRaises(NeverBounceAPIError):
+            self.neverbounce.verify('john.doe@example.com')
+        self.assertEqual(self.guard.credits, 10)
+
+    def test_create_job(self):
+        with self.assertRaises(InsufficientCreditsError):
+            self.neverbounce.create_job(['user{}@example.com'.format(i) for i in range(9)])
+        self.neverbounce.create_job(iter(['user{}@example.com'.format(i) for i in range(5)]))
+        self.assertEqual(self.guard.credits, 5)
+        self.assertEqual(self.server.calls['bulk'], 1)
+
+    def test_verify_bulk(self):
+        emails = ['user{}@example.com'.format(i) for i in range(12)]
+        with self.assertRaises(InsufficientCreditsError):
+            list(self.neverbounce.verify_bulk(emails, chunk_size=4, max_parallel_jobs=1))
+        self.assertEqual(self.server.calls['bulk'], 2)
@@ -0,0 +1,88 @@
+import os
+import shutil
+import sys
+import tempfile
+from unittest import TestCase, skipIf
+try:
+    from unittest import mock
+except ImportError:  # Python 2
+    import mock
+from neverbounce import export
+from neverbounce.client import NeverBounce
+from neverbounce.export import concat, count_results, filter_results
+from neverbounce.results import ResultBatch
+from neverbounce.testing import FakeNeverBounceServer
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+def batch(rows):
+    result = ResultBatch()
+    result.extend(rows)
+    return result
+
+
+class ExportTestCase(TestCase):
+    def setUp(self):
+        self.batches = [batch([('a@example.com', 0), ('b@example.com', 1), ('c@example.com', 0)]),
+                        batch([('d@example.com', 3), ('e@example.com', 2)])]
+
+    def test_concat(self):
+        columns = concat(self.batches)
+        self.assertListEqual(columns.emails, ['a@example.com', 'b@example.com', 'c@example.com', 'd@example.com',
+                                              'e@example.com'])
+        self.assertListEqual(columns.result_codes.tolist(), [0, 1, 0, 3, 2])
+
+    def test_count_results(self):
+        self.assertDictEqual(count_results(self.batches),
+                             {'valid': 2, 'invalid': 1, 'disposable': 1, 'catchall': 1, 'unknown': 0})
+        self.assertEqual(count_results(self.batches[1])['catchall'], 1)
+
+    def test_filter_results(self):
+        valid = concat(filter_results(self.batches, 'valid', 'catchall'))
+        self.assertListEqual(valid.emails, ['a@example.com', 'c@example.com', 'd@example.com'])
+        self.assertListEqual(valid.result_codes.tolist(), [0, 0, 3])
+
+    def test_results_to_columns(self):
+        with FakeNeverBounceServer() as server:
+            with NeverBounce('fake_user_name', 'fake_api_key', server.base_url) as neverbounce:
+                emails = ['user{}@example.com'.format(i) for i in range(100)] + ['invalid@example.com']
+                job_id = neverbounce.create_job(emails).job_id
+                columns = neverbounce.results_to_columns(job_id)
+        self.assertListEqual(columns.emails, emails)
+        self.assertEqual(count_results(columns), {'valid': 100, 'invalid': 1, 'disposable': 0, 'catchall': 0,
+                                                  'unknown': 0})
+
+    @skipIf(numpy is None, 'numpy is not installed')
+    def test_to_numpy(self):
+        emails, result_codes = export.to_numpy(self.batches[0])
+        self.assertListEqual(emails.tolist(), ['a@example.com', 'b@example.com', 'c@example.com'])
+        self.assertEqual(str(result_codes.dtype), 'int8')
+        self.assertEqual(int((result_codes == 0).sum()), 2)
+
+    @skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_parquet_and_feather(self):
+        import pyarrow.feather
+        import pyarrow.parquet as parquet
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        parquet_path = os.path.join(directory, 'results.parquet')
+        feather_path = os.path.join(directory, 'results.feather')
+        self.assertEqual(export.write_parquet(self.batches, parquet_path), 5)
+        self.assertEqual(export.write_feather(self.batches, feather_path), 5)
+        for table in (parquet.read_table(parquet_path), pyarrow.feather.read_table(feather_path)):
+            self.assertListEqual(table.column('result_code').to_pylist(), [0, 1, 0, 3, 2])
+        self.assertEqual(export.to_arrow_table(self.batches).num_rows, 5)
+
+    def test_missing_pyarrow(self):
+        with mock.patch.dict(sys.modules, {'pyarrow': None}):
+            with self.assertRaises(ImportError):
+                export.to_arrow(self.batches[0])
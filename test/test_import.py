@@ -0,0 +1,44 @@
+import os
+import subprocess
+import sys
+from unittest import TestCase, skipIf
+import neverbounce
+from neverbounce.client import NeverBounce
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def imported_modules(statement):
+    """
+    :param str statement: Python code to run in a fresh interpreter.
+    :return: A set of the names of the modules it imports. The import time is measured by the benchmarks.
+    """
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    output = subprocess.check_output([sys.executable, '-X', 'importtime', '-c', statement], env=env,
+                                     stderr=subprocess.STDOUT).decode('utf-8')
+    return set(line.split('|')[2].strip() for line in output.splitlines()
+               if line.startswith('import time:') and 'cumulative' not in line)
+
+
+@skipIf(sys.version_info < (3, 7), 'Lazy imports and -X importtime require Python 3.7')
+class ImportTestCase(TestCase):
+    def test_lazy_attributes(self):
+        self.assertIs(neverbounce.NeverBounce, NeverBounce)
+        self.assertIn('NeverBounceClientPool', dir(neverbounce))
+        with self.assertRaises(AttributeError):
+            neverbounce.Missing
+
+    def test_http_stack_is_not_imported(self):
+        for statement in ('import neverbounce', 'from neverbounce.objects import VerifiedEmail',
+                          'from neverbounce import NeverBounce; NeverBounce("user", "key")'):
+            modules = imported_modules(statement)
+            self.assertNotIn('requests', modules, statement)
+
+    def test_optional_libraries_are_not_imported(self):
+        modules = imported_modules('from neverbounce.client import NeverBounce')
+        self.assertNotIn('numpy', modules)
+        self.assertNotIn('pyarrow', modules)
+
+    def test_client_is_not_imported(self):
+        modules = imported_modules('import neverbounce')
+        self.assertNotIn('neverbounce.client', modules)
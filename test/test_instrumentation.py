@@ -0,0 +1,139 @@
+from unittest import TestCase
+from requests.exceptions import ChunkedEncodingError, ConnectionError
+from neverbounce.cache import MemoryResultCache
+from neverbounce.client import NeverBounce
+from neverbounce.exceptions import NeverBounceAPIError
+from neverbounce.instrumentation import Histogram, Instrument, MetricsCollector, SpanInstrument
+from neverbounce.retry import RetryPolicy
+from neverbounce.testing import FakeNeverBounceServer
+
+
+class RecordingInstrument(Instrument):
+    def __init__(self):
+        self.events = []
+
+    def request_started(self, info):
+        self.events.append(('started', info.endpoint, info.attempt))
+
+    def request_finished(self, info):
+        self.events.append(('finished', info.endpoint, info.status_code))
+
+
+class FakeSpan(object):
+    def __init__(self, name, attributes):
+        self.name = name
+        self.attributes = dict(attributes)
+        self.exceptions = []
+        self.ended = False
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def record_exception(self, exception):
+        self.exceptions.append(exception)
+
+    def end(self):
+        self.ended = True
+
+
+class FakeTracer(object):
+    def __init__(self):
+        self.spans = []
+
+    def start_span(self, name, attributes=None):
+        span = FakeSpan(name, attributes or {})
+        self.spans.append(span)
+        return span
+
+
+class HistogramTestCase(TestCase):
+    def test_observe(self):
+        histogram = Histogram((0.1, 1))
+        for value in (0.05, 0.1, 0.5, 5):
+            histogram.observe(value)
+        self.assertListEqual(histogram.cumulative(), [(0.1, 2), (1, 3), (float('inf'), 4)])
+        self.assertEqual(histogram.quantile(0.5), 0.1)
+        self.assertEqual(histogram.quantile(0.99), float('inf'))
+        self.assertAlmostEqual(histogram.sum, 5.65)
+
+
+class InstrumentationTestCase(TestCase):
+    def setUp(self):
+        self.server = FakeNeverBounceServer().start()
+        self.addCleanup(self.server.stop)
+        self.neverbounce = NeverBounce('fake_user_name', 'fake_api_key', self.server.base_url,
+                                       result_cache=MemoryResultCache(), retry=RetryPolicy(backoff=0.01))
+        self.addCleanup(self.neverbounce.close)
+        self.metrics = MetricsCollector()
+        self.neverbounce.add_instrument(self.metrics)
+
+    def test_hooks(self):
+        instrument = RecordingInstrument()
+        self.neverbounce.add_instrument(instrument)
+        self.neverbounce.verify('john.doe@example.com')
+        self.assertListEqual(instrument.events, [
+            ('started', 'access_token', 1), ('finished', 'access_token', 200),
+            ('started', 'single', 1), ('finished', 'single', 200),
+        ])
+        self.neverbounce.remove_instrument(instrument)
+        self.neverbounce.verify('jane.doe@example.com')
+        self.assertEqual(len(instrument.events), 4)
+
+    def test_metrics(self):
+        self.neverbounce.verify('john.doe@example.com')
+        self.neverbounce.verify('john.doe@example.com')
+        job_id = self.neverbounce.create_job(['user{}@example.com'.format(i) for i in range(100)]).job_id
+        self.server.errors.append(503)
+        self.neverbounce.check_job(job_id)
+        list(self.neverbounce.results(job_id))
+        self.server.errors.append(400)
+        with self.assertRaises(NeverBounceAPIError):
+            self.neverbounce.account()
+
+        self.assertEqual(self.metrics.requests['single', 200], 1)
+        self.assertEqual(self.metrics.requests['status', 503], 1)
+        self.assertEqual(self.metrics.requests['status', 200], 1)
+        self.assertEqual(self.metrics.retries['status'], 1)
+        self.assertEqual(self.metrics.errors['account', 'NeverBounceAPIError'], 1)
+        self.assertEqual(self.metrics.token_refreshes, 1)
+        self.assertEqual((self.metrics.cache_hits, self.metrics.cache_misses), (1, 1))
+        self.assertGreater(self.metrics.bytes_sent['bulk'], 100 * len('user0@example.com'))
+        self.assertEqual(self.metrics.bytes_received['download'],
+                         sum(len('user{}@example.com,valid\n'.format(i)) for i in range(100)))
+        self.assertEqual(self.metrics.latency['single'].count, 1)
+        self.assertLessEqual(self.metrics.ttfb['single'].sum, self.metrics.latency['single'].sum)
+
+        text = self.metrics.prometheus()
+        self.assertIn('# TYPE neverbounce_request_duration_seconds histogram\n', text)
+        self.assertIn('neverbounce_requests_total{endpoint="status",status="503"} 1\n', text)
+        self.assertIn('neverbounce_request_duration_seconds_bucket{endpoint="single",le="+Inf"} 1\n', text)
+        self.assertIn('neverbounce_retries_total{endpoint="status"} 1\n', text)
+        self.assertIn('neverbounce_cache_hits_total 1\n', text)
+
+    def test_truncated_download(self):
+        job_id = self.neverbounce.create_job(['user{}@example.com'.format(i) for i in range(100)]).job_id
+        self.server.download_faults.append(1000)
+        instrument = RecordingInstrument()
+        self.neverbounce.add_instrument(instrument)
+        stream = self.neverbounce._call(endpoint='download', data={'job_id': job_id}, stream=True)
+        self.assertListEqual(instrument.events, [('started', 'download', 1)])
+        with self.assertRaises((ChunkedEncodingError, ConnectionError)):
+            list(stream)
+        self.assertListEqual(instrument.events, [('started', 'download', 1), ('finished', 'download', 200)])
+        self.assertLessEqual(self.metrics.bytes_received['download'], 1000)
+        self.assertEqual(sum(count for (endpoint, _), count in self.metrics.errors.items() if endpoint == 'download'),
+                         1)
+
+    def test_spans(self):
+        tracer = FakeTracer()
+        self.neverbounce.add_instrument(SpanInstrument(tracer))
+        self.neverbounce.access_token()
+        self.server.errors.append(400)
+        with self.assertRaises(NeverBounceAPIError):
+            self.neverbounce.account()
+        self.assertListEqual([span.name for span in tracer.spans], ['neverbounce.access_token', 'neverbounce.account'])
+        span = tracer.spans[1]
+        self.assertTrue(span.ended)
+        self.assertEqual(span.attributes['http.status_code'], 400)
+        self.assertEqual(span.attributes['neverbounce.endpoint'], 'account')
+        self.assertIsInstance(span.exceptions[0], NeverBounceAPIError)
@@ -0,0 +1,164 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+from unittest import TestCase
+from neverbounce.client import NeverBounce
+from neverbounce.exceptions import NeverBounceAPIError, UnconfirmedJobError
+from neverbounce.journal import FileRequestJournal, SQLiteRequestJournal, email_key, source_key
+from neverbounce.testing import FakeNeverBounceServer
+from neverbounce.upload import EmailSource
+
+
+class JournalTestCaseMixin(object):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, 'journal')
+
+    def test_record(self):
+        with self.journal_class(self.path) as journal:
+            with journal.record('bulk', 'abc') as response:
+                self.assertEqual(journal.lookup('abc')['state'], 'sent')
+                response['job_id'] = 123
+        with self.journal_class(self.path) as journal:
+            entry = journal.lookup('abc')
+            self.assertEqual(entry['state'], 'done')
+            self.assertDictEqual(entry['response'], {'job_id': 123})
+            self.assertListEqual([entry['response'] for entry in journal.jobs()], [{'job_id': 123}])
+            self.assertIsNone(journal.lookup('def'))
+
+    def test_unknown_outcome(self):
+        with self.journal_class(self.path) as journal:
+            with self.assertRaises(IOError):
+                with journal.record('bulk', 'abc'):
+                    raise IOError('Read timed out')
+        with self.journal_class(self.path) as journal:
+            self.assertEqual([entry['key'] for entry in journal.pending()], ['abc'])
+            journal.forget('abc')
+            self.assertEqual(journal.lookup('abc')['state'], 'failed')
+            self.assertListEqual(journal.pending(), [])
+
+    def test_retention(self):
+        with self.journal_class(self.path) as journal:
+            with journal.record('single', 'abc') as response:
+                response['result'] = 0
+        time.sleep(0.01)
+        with self.journal_class(self.path, retention=0.005) as journal:
+            self.assertIsNone(journal.lookup('abc'))
+            self.assertEqual(len(journal), 0)
+
+    def test_expired_calls_are_pruned(self):
+        with self.journal_class(self.path, retention=0.05) as journal:
+            for key in ('abc', 'def'):
+                with journal.record('single', key) as response:
+                    response['result'] = 0
+                time.sleep(0.1)
+            with journal.record('single', 'ghi') as response:
+                response['result'] = 0
+            self.assertEqual(len(journal), 1)
+            self.assertListEqual(list(journal._keys), ['ghi'])
+
+
+class FileRequestJournalTestCase(JournalTestCaseMixin, TestCase):
+    journal_class = FileRequestJournal
+
+    def test_torn_record(self):
+        with self.journal_class(self.path) as journal:
+            with journal.record('bulk', 'abc') as response:
+                response['job_id'] = 123
+        with io.open(self.path, 'ab') as f:
+            f.write(b'{"id": "torn')
+        with self.journal_class(self.path) as journal:
+            self.assertEqual(journal.lookup('abc')['response'], {'job_id': 123})
+        with io.open(self.path, 'rb') as f:
+            self.assertListEqual([json.loads(line)['state'] for line in f], ['done'])
+
+
+class SQLiteRequestJournalTestCase(JournalTestCaseMixin, TestCase):
+    journal_class = SQLiteRequestJournal
+
+
+class ContentKeyTestCase(TestCase):
+    def test_keys(self):
+        self.assertEqual(email_key(' John@Example.com'), email_key('john@example.com'))
+        self.assertNotEqual(email_key('a@example.com'), email_key('b@example.com'))
+        self.assertEqual(source_key(EmailSource(['a@example.com', 'b@example.com'])),
+                         source_key(EmailSource(('a@example.com', 'b@example.com'))))
+        self.assertIsNone(source_key(EmailSource(iter(['a@example.com']))))
+
+
+class ClientJournalTestCase(TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, 'journal')
+        self.server = FakeNeverBounceServer().start()
+        self.addCleanup(self.server.stop)
+        self.emails = ['a@example.com', 'invalid@example.com']
+
+    def client(self, **kwargs):
+        neverbounce = NeverBounce('fake_user_name', 'fake_api_key', self.server.base_url,
+                                  journal=FileRequestJournal(self.path), **kwargs)
+        self.addCleanup(neverbounce.journal.close)
+        self.addCleanup(neverbounce.close)
+        return neverbounce
+
+    def test_verify_after_restart(self):
+        neverbounce = self.client()
+        self.assertEqual(neverbounce.verify('invalid@example.com').result_text, 'invalid')
+        neverbounce.journal.close()
+        self.assertEqual(self.client().verify('invalid@example.com').result_text, 'invalid')
+        self.assertEqual(self.server.calls['single'], 1)
+
+    def test_reattach_job(self):
+        neverbounce = self.client()
+        job_id = neverbounce.create_job(self.emails).job_id
+        neverbounce.journal.close()
+        self.assertEqual(self.client().create_job(list(self.emails)).job_id, job_id)
+        self.assertEqual(self.server.calls['bulk'], 1)
+        self.assertEqual(self.server.calls['status'], 1)
+
+    def test_reattach_server_error(self):
+        neverbounce = self.client()
+        neverbounce.create_job(self.emails)
+        neverbounce.journal.close()
+        neverbounce = self.client(retry=False)
+        neverbounce.access_token()
+        self.server.errors = [503]
+        with self.assertRaises(NeverBounceAPIError):
+            neverbounce.create_job(list(self.emails))
+        self.assertEqual(self.server.calls['bulk'], 1)
+
+    def test_rejected_job_is_created_again(self):
+        neverbounce = self.client()
+        neverbounce.access_token()
+        self.server.errors = [400]
+        with self.assertRaises(NeverBounceAPIError):
+            neverbounce.create_job(self.emails)
+        neverbounce.create_job(self.emails)
+        self.assertEqual(self.server.calls['bulk'], 2)
+
+    def test_server_error_is_unconfirmed(self):
+        neverbounce = self.client()
+        neverbounce.access_token()
+        self.server.errors = [502]
+        with self.assertRaises(NeverBounceAPIError):
+            neverbounce.create_job(self.emails)
+        with self.assertRaises(UnconfirmedJobError):
+            neverbounce.create_job(self.emails)
+        self.assertEqual(self.server.calls['bulk'], 1)
+
+    def test_unconfirmed_job(self):
+        neverbounce = self.client()
+        key = source_key(EmailSource(self.emails))
+        with self.assertRaises(IOError):
+            with neverbounce.journal.record('bulk', key):
+                raise IOError('Read timed out')
+        with self.assertRaises(UnconfirmedJobError):
+            neverbounce.create_job(self.emails)
+        neverbounce.journal.forget(key)
+        neverbounce.create_job(self.emails)
+        self.assertEqual(self.server.calls['bulk'], 1)
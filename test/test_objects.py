@@ -1,7 +1,9 @@
+import copy
+import pickle
 from collections import OrderedDict
 from datetime import datetime
 from unittest import TestCase
-from neverbounce.objects import VerifiedEmail, Job, JobStatus, Account
+from neverbounce.objects import VerifiedEmail, Job, JobStatus, Account, parse_timestamp
 
 
 class VerifiedEmailTestCase(TestCase):
@@ -39,6 +41,20 @@ class VerifiedEmailTestCase(TestCase):
                 else:
                     self.assertFalse(getattr(email, flag))
 
+    def test_slots(self):
+        for email in self.emails.values():
+            self.assertFalse(hasattr(email, '__dict__'))
+
+    def test_equality(self):
+        self.assertEqual(VerifiedEmail('valid@emailaddress.com', 0), self.emails['valid'])
+        self.assertNotEqual(VerifiedEmail('valid@emailaddress.com', 1), self.emails['valid'])
+        self.assertEqual(len({VerifiedEmail('valid@emailaddress.com', 0), self.emails['valid']}), 1)
+
+    def test_pickle(self):
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            for email in self.emails.values():
+                self.assertEqual(pickle.loads(pickle.dumps(email, protocol)), email)
+
 
 class JobTestCase(TestCase):
     def setUp(self):
@@ -101,6 +117,12 @@ class JobStatusTestCase(TestCase):
             }
         )
 
+    def test_pickle(self):
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            job_status = pickle.loads(pickle.dumps(self.job_status, protocol))
+            self.assertEqual(str(job_status), 'Completed Job 123456')
+            self.assertEqual(job_status.finished, datetime(2016, 1, 16, 4, 6, 14))
+
     def test_flags(self):
         for status in JobStatus.statuses:
             flag = 'is_{}'.format(status)
@@ -124,4 +146,53 @@ class AccountTestCase(TestCase):
         self.assertEqual(self.account.jobs_completed, 5)
 
     def test_account_jobs_processing(self):
-        self.assertEqual(self.account.jobs_processing, 1)
\ No newline at end of file
+        self.assertEqual(self.account.jobs_processing, 1)
+
+
+class LazyJobStatusTestCase(TestCase):
+    def setUp(self):
+        self.response = {
+            'success': True, 'id': '123456', 'status': '3', 'type': '1', 'orig_name': 'emails.csv',
+            'created': '2016-01-16 04:05:59', 'started': '2016-01-16 04:06:10', 'finished': None,
+            'stats': {'total': '1000', 'processed': '250', 'valid': 200, 'invalid': 50, 'job_time': 5},
+        }
+        self.job_status = JobStatus.from_response(self.response)
+
+    def test_parsed_on_access(self):
+        job_status = JobStatus.from_response(dict(self.response, id='not parsed yet'))
+        self.assertEqual(job_status.status_code, 3)
+        with self.assertRaises(ValueError):
+            job_status.job_id
+
+    def test_response_is_not_shared(self):
+        response = copy.deepcopy(self.response)
+        self.job_status.status_code = 4
+        self.assertEqual(self.job_status.stats.total, 1000)
+        self.assertDictEqual(self.response, response)
+        self.response['orig_name'] = 'other.csv'
+        self.assertEqual(self.job_status.orig_name, 'emails.csv')
+
+    def test_timestamps(self):
+        self.assertEqual(self.job_status.started, datetime(2016, 1, 16, 4, 6, 10))
+        self.assertIsNone(self.job_status.finished)
+        self.assertEqual(parse_timestamp('2016-1-6 4:06:10'), datetime(2016, 1, 6, 4, 6, 10))
+
+    def test_stats(self):
+        stats = self.job_status.stats
+        self.assertEqual((stats.total, stats.processed, stats.valid, stats.invalid, stats.catchall),
+                         (1000, 250, 200, 50, 0))
+        self.assertEqual(stats['processed'], '250')
+
+    def test_progress(self):
+        self.assertEqual(self.job_status.progress, 0.25)
+        self.assertEqual(self.job_status.throughput, 50.0)
+        self.assertEqual(self.job_status.eta, 15.0)
+
+    def test_progress_unknown(self):
+        self.response['stats'] = {'total': 0, 'processed': 0, 'job_time': 0}
+        job_status = JobStatus.from_response(self.response)
+        self.assertIsNone(job_status.progress)
+        self.assertIsNone(job_status.eta)
+        self.response['status'] = '4'
+        job_status = JobStatus.from_response(self.response)
+        self.assertEqual((job_status.progress, job_status.eta), (1.0, 0.0))
@@ -0,0 +1,69 @@
+import io
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from neverbounce.client import NeverBounce
+from neverbounce.parallel import CountReducer, FileReducer, ListReducer, process_results, shard_ranges
+from neverbounce.testing import FakeNeverBounceServer
+
+
+def domain(email, result_code):
+    return email.rsplit('@', 1)[-1]
+
+
+def valid_email(email, result_code):
+    return email if result_code == 0 else None
+
+
+class ParallelTestCase(TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, 'results.csv')
+        self.rows = ['user{}@example{}.com,{}'.format(i, i % 3, 'valid' if i % 4 else 'invalid') for i in range(1000)]
+        with io.open(self.path, 'w', newline='') as f:
+            f.write(''.join(row + '\n' for row in self.rows))
+
+    def test_shard_ranges(self):
+        ranges = shard_ranges(self.path, 7)
+        self.assertEqual(len(ranges), 7)
+        self.assertEqual(ranges[0][0], 0)
+        self.assertEqual(ranges[-1][1], os.path.getsize(self.path))
+        with io.open(self.path, 'rb') as f:
+            data = f.read()
+        for start, end in ranges:
+            self.assertTrue(start == 0 or data[start - 1:start] == b'\n')
+        self.assertEqual(b''.join(data[start:end] for start, end in ranges), data)
+
+    def test_shard_ranges_small_file(self):
+        with io.open(self.path, 'w') as f:
+            f.write('a@example.com,valid\n')
+        self.assertListEqual(shard_ranges(self.path, 4), [(0, 20)])
+        with io.open(self.path, 'w') as f:
+            f.write('')
+        self.assertListEqual(shard_ranges(self.path, 4), [])
+
+    def test_count(self):
+        counts = process_results(self.path, domain, CountReducer(), processes=1, shards=5)
+        self.assertDictEqual(dict(counts), {'example0.com': 334, 'example1.com': 333, 'example2.com': 333})
+
+    def test_list_in_order(self):
+        emails = process_results(self.path, valid_email, ListReducer(), processes=2)
+        self.assertListEqual(emails, [row.split(',')[0] for row in self.rows if row.endswith(',valid')])
+
+    def test_file(self):
+        output = self.path + '.valid'
+        self.assertEqual(process_results(self.path, valid_email, FileReducer(output), processes=2), output)
+        with io.open(output) as f:
+            self.assertListEqual(f.read().splitlines(), [row.split(',')[0] for row in self.rows
+                                                         if row.endswith(',valid')])
+        self.assertListEqual(os.listdir(os.path.dirname(output)), ['results.csv', 'results.csv.valid'])
+
+    def test_client_process_results(self):
+        with FakeNeverBounceServer() as server:
+            with NeverBounce('fake_user_name', 'fake_api_key', server.base_url) as neverbounce:
+                emails = ['user{}@example{}.com'.format(i, i % 2) for i in range(100)]
+                job_id = neverbounce.create_job(emails).job_id
+                counts = neverbounce.process_results(job_id, self.path, domain, CountReducer(), processes=2)
+        self.assertDictEqual(dict(counts), {'example0.com': 50, 'example1.com': 50})
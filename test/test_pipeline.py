@@ -0,0 +1,83 @@
+import time
+from unittest import TestCase
+from neverbounce.cache import MemoryResultCache
+from neverbounce.client import NeverBounce
+from neverbounce.exceptions import JobFailedError
+from neverbounce.pipeline import JobPipeline
+from neverbounce.testing import FakeNeverBounceServer
+
+
+class JobPipelineTestCase(TestCase):
+    def setUp(self):
+        self.server = FakeNeverBounceServer().start()
+        self.addCleanup(self.server.stop)
+        self.neverbounce = NeverBounce('fake_user_name', 'fake_api_key', self.server.base_url)
+        self.addCleanup(self.neverbounce.close)
+        self.emails = ['user{}@example.com'.format(i) for i in range(100)] + ['catchall@example.com']
+
+    def test_verify_bulk(self):
+        results = list(self.neverbounce.verify_bulk(self.emails, chunk_size=30, max_parallel_jobs=2,
+                                                    min_poll_interval=0.01))
+        self.assertListEqual(sorted(result.email for result in results), sorted(self.emails))
+        self.assertTrue(next(result for result in results if result.email == 'catchall@example.com').is_catchall)
+        self.assertEqual(self.server.calls['bulk'], 4)
+        self.assertEqual(self.server.calls['download'], 4)
+
+    def test_deduplicated(self):
+        emails = self.emails + [' USER1@example.com', 'user2@EXAMPLE.com', '']
+        results = list(self.neverbounce.verify_bulk(emails, chunk_size=1000, min_poll_interval=0.01))
+        self.assertEqual(len(results), len(self.emails))
+        self.assertEqual(len(self.server.jobs[1]), len(self.emails))
+
+    def test_cached_results_are_not_submitted(self):
+        self.neverbounce.result_cache = MemoryResultCache()
+        list(self.neverbounce.verify_bulk(self.emails[:50], chunk_size=1000, min_poll_interval=0.01))
+        results = list(self.neverbounce.verify_bulk(self.emails, chunk_size=1000, min_poll_interval=0.01))
+        self.assertEqual(len(results), len(self.emails))
+        self.assertListEqual(self.server.jobs[2], self.emails[50:])
+
+    def test_parallel_jobs(self):
+        self.server.job_duration = 0.3
+        start = time.time()
+        results = list(self.neverbounce.verify_bulk(self.emails, chunk_size=26, max_parallel_jobs=4,
+                                                    min_poll_interval=0.05))
+        self.assertEqual(len(results), len(self.emails))
+        self.assertLess(time.time() - start, 1.0)
+
+    def test_failed_job(self):
+        handle_status = self.server.handle_status
+        self.server.handle_status = lambda form: dict(handle_status(form), status='5')
+        with self.assertRaises(JobFailedError):
+            list(self.neverbounce.verify_bulk(self.emails, min_poll_interval=0.01))
+
+    def test_failed_job_does_not_wait_for_other_jobs(self):
+        self.server.job_duration = 30
+        handle_status = self.server.handle_status
+        self.server.handle_status = lambda form: dict(handle_status(form), status='5' if form['job_id'][0] == '1'
+                                                      else '3')
+        start = time.time()
+        with self.assertRaises(JobFailedError):
+            list(self.neverbounce.verify_bulk(self.emails, chunk_size=30, max_parallel_jobs=4,
+                                              min_poll_interval=0.01))
+        self.assertLess(time.time() - start, 5)
+
+    def test_abandoned_run(self):
+        self.server.job_duration = 30
+        handle_status = self.server.handle_status
+        self.server.handle_status = lambda form: dict(handle_status(form), **(
+            {'status': '4', 'stats': None} if form['job_id'][0] == '1' else {}))
+        results = self.neverbounce.verify_bulk(self.emails, chunk_size=30, max_parallel_jobs=4,
+                                               min_poll_interval=0.01)
+        start = time.time()
+        next(results)
+        results.close()
+        self.assertLess(time.time() - start, 5)
+
+    def test_concurrent_runs(self):
+        pipeline = JobPipeline(self.neverbounce, chunk_size=30, min_poll_interval=0.01)
+        first = pipeline.run(self.emails[:50])
+        second = pipeline.run(self.emails[50:])
+        results = [next(first), next(second)]
+        second.close()
+        results.extend(first)
+        self.assertEqual(len(results), 51)
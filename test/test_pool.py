@@ -0,0 +1,109 @@
+import threading
+import time
+from unittest import TestCase
+from neverbounce.pool import FairShareLimiter, NeverBounceClientPool
+from neverbounce.testing import FakeNeverBounceServer
+
+
+class FairShareLimiterTestCase(TestCase):
+    def test_alone_uses_all_slots(self):
+        limiter = FairShareLimiter(3)
+        for _ in range(3):
+            limiter.acquire('a')
+        self.assertEqual(limiter.in_flight('a'), 3)
+        self.assertEqual(limiter.in_flight(), 3)
+
+    def test_share(self):
+        limiter = FairShareLimiter(4)
+        self.assertEqual(limiter.share(), 4)
+        limiter.acquire('a')
+        limiter.acquire('b')
+        self.assertEqual(limiter.share(), 2)
+
+    def test_waiting_tenant_goes_first(self):
+        limiter = FairShareLimiter(2)
+        limiter.acquire('a')
+        limiter.acquire('a')
+        order = []
+
+        def acquire(tenant):
+            limiter.acquire(tenant)
+            order.append(tenant)
+
+        threads = [threading.Thread(target=acquire, args=('a',))]
+        threads[0].start()
+        time.sleep(0.05)
+        threads.append(threading.Thread(target=acquire, args=('b',)))
+        threads[1].start()
+        time.sleep(0.05)
+        self.assertListEqual(order, [])
+        limiter.release('a')
+        threads[1].join(1)
+        self.assertListEqual(order, ['b'])
+        limiter.release('a')
+        threads[0].join(1)
+        self.assertListEqual(order, ['b', 'a'])
+
+
+class NeverBounceClientPoolTestCase(TestCase):
+    def setUp(self):
+        self.server = FakeNeverBounceServer().start()
+        self.addCleanup(self.server.stop)
+        self.pool = NeverBounceClientPool(self.server.base_url, max_clients=2, max_concurrency=4)
+        self.addCleanup(self.pool.close)
+
+    def test_client_per_credentials(self):
+        client = self.pool.client('user1', 'key1')
+        self.assertIs(self.pool.client('user1', 'key1'), client)
+        self.assertIsNot(self.pool.client('user2', 'key2'), client)
+        self.assertIs(client.session, self.pool.session)
+        self.assertEqual(len(self.pool), 2)
+
+    def test_verify(self):
+        self.assertEqual(self.pool.verify('user1', 'key1', 'a@example.com').result_text, 'valid')
+        self.assertEqual(self.pool.verify('user2', 'key2', 'b@example.com').result_text, 'valid')
+        self.assertEqual(self.server.calls['access_token'], 2)
+        self.assertEqual(self.pool.limiter.in_flight(), 0)
+
+    def test_lru_eviction(self):
+        self.pool.client('user1', 'key1')
+        self.pool.client('user2', 'key2')
+        time.sleep(0.01)
+        self.pool.client('user1', 'key1')
+        self.pool.client('user3', 'key3')
+        self.assertEqual(len(self.pool), 2)
+        self.assertIn(('user1', 'key1'), self.pool)
+        self.assertNotIn(('user2', 'key2'), self.pool)
+
+    def test_busy_client_is_not_evicted(self):
+        self.pool.client('user1', 'key1')
+        self.pool.limiter.acquire(('user1', 'key1'))
+        self.pool.client('user2', 'key2')
+        self.pool.client('user3', 'key3')
+        self.assertIn(('user1', 'key1'), self.pool)
+        self.pool.limiter.release(('user1', 'key1'))
+
+    def test_idle_timeout(self):
+        self.pool.idle_timeout = 0
+        self.pool.client('user1', 'key1')
+        time.sleep(0.01)
+        self.assertEqual(self.pool.evict_idle(), 1)
+        self.assertEqual(len(self.pool), 0)
+
+    def test_streamed_download_holds_slot(self):
+        client = self.pool.client('user1', 'key1')
+        job_id = client.create_job(['a@example.com', 'b@example.com']).job_id
+        stream = client._call(endpoint='download', data={'job_id': job_id}, stream=True)
+        self.assertEqual(self.pool.limiter.in_flight(('user1', 'key1')), 1)
+        self.assertEqual(len(list(stream)), 1)
+        self.assertEqual(self.pool.limiter.in_flight(), 0)
+
+    def test_evicted_client_can_wait_for_jobs(self):
+        self.pool.idle_timeout = 0
+        client = self.pool.client('user1', 'key1')
+        job_id = client.create_job(['a@example.com']).job_id
+        list(client.wait_for_jobs([job_id]))
+        time.sleep(0.01)
+        self.assertEqual(self.pool.evict_idle(), 1)
+        statuses = list(client.wait_for_jobs([job_id], timeout=5))
+        self.assertTrue(statuses[0].is_completed)
@@ -0,0 +1,88 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from neverbounce.client import NeverBounce
+from neverbounce.prefilter import DomainIndex, PreFilter
+from neverbounce.testing import FakeNeverBounceServer
+
+
+class DomainIndexTestCase(TestCase):
+    def test_contains(self):
+        index = DomainIndex(['mailinator.com', ' Example.ORG ', ''])
+        self.assertEqual(len(index), 2)
+        self.assertIn('mailinator.com', index)
+        self.assertIn('mx.mailinator.com', index)
+        self.assertIn('example.org', index)
+        self.assertNotIn('inator.com', index)
+        self.assertNotIn('com', index)
+
+    def test_from_file(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'domains.txt')
+        with open(path, 'w') as f:
+            f.write('# Disposable domains\nmailinator.com\nyopmail.com\n')
+        index = DomainIndex.from_file(path)
+        self.assertEqual(len(index), 2)
+        self.assertIn('yopmail.com', index)
+
+
+class PreFilterTestCase(TestCase):
+    def setUp(self):
+        self.prefilter = PreFilter(disposable_domains=DomainIndex(['mailinator.com']),
+                                   invalid_domains=DomainIndex(['nomx.example']))
+
+    def test_check(self):
+        self.assertIsNone(self.prefilter.check(' John.Doe+tag@Example.com '))
+        for email in ('john.doe', 'john..doe@example.com', '.john@example.com', 'john@example', 'john@-example.com',
+                      'john doe@example.com', '@example.com'):
+            self.assertEqual(self.prefilter.check(email).result_text, 'invalid', email)
+        self.assertEqual(self.prefilter.check('john@nomx.example').result_text, 'invalid')
+        verified_email = self.prefilter.check('john@Mailinator.com')
+        self.assertEqual((verified_email.email, verified_email.result_text), ('john@Mailinator.com', 'disposable'))
+        self.assertDictEqual(self.prefilter.stats, {'checked': 10, 'invalid_syntax': 7, 'invalid_domain': 1,
+                                                    'disposable': 1, 'duplicates': 0, 'avoided': 9})
+
+    def test_deferred_to_api(self):
+        for email in ('user@example.xn--p1ai', 'user@example.co2', 'user@b\u00fccher.de', 'jos\u00e9@example.com',
+                      '"john doe"@example.com', 'user@[192.168.0.1]'):
+            self.assertIsNone(self.prefilter.check(email), email)
+        self.assertEqual(self.prefilter.check('user@example.123').result_text, 'invalid')
+        self.assertEqual(self.prefilter.check('user@example.-com').result_text, 'invalid')
+        self.assertEqual(self.prefilter.avoided, 2)
+
+    def test_internationalized_domain(self):
+        prefilter = PreFilter(disposable_domains=DomainIndex(['xn--bcher-kva.de']))
+        self.assertEqual(prefilter.check('user@B\u00fccher.de').result_text, 'disposable')
+
+    def test_unique(self):
+        emails = ['john@example.com', ' JOHN@example.com', '', 'jane@example.com', 'john@example.com\n']
+        self.assertListEqual(list(self.prefilter.unique(emails)), ['john@example.com', 'jane@example.com'])
+        self.assertEqual(self.prefilter.duplicates, 2)
+
+
+class ClientPreFilterTestCase(TestCase):
+    def setUp(self):
+        self.server = FakeNeverBounceServer().start()
+        self.addCleanup(self.server.stop)
+        self.prefilter = PreFilter(disposable_domains=DomainIndex(['mailinator.com']))
+        self.neverbounce = NeverBounce('fake_user_name', 'fake_api_key', self.server.base_url,
+                                       prefilter=self.prefilter)
+        self.addCleanup(self.neverbounce.close)
+
+    def test_verify(self):
+        self.assertEqual(self.neverbounce.verify('john@mailinator.com').result_text, 'disposable')
+        self.assertEqual(self.neverbounce.verify('john.doe').result_text, 'invalid')
+        self.assertEqual(self.neverbounce.verify('john@example.com').result_text, 'valid')
+        self.assertEqual(self.server.calls['single'], 1)
+
+    def test_verify_bulk(self):
+        emails = ['user{}@example.com'.format(i) for i in range(10)]
+        emails += ['USER1@example.com', 'john@mailinator.com', 'not an email']
+        results = {v.email: v.result_text for v in self.neverbounce.verify_bulk(emails, chunk_size=100)}
+        self.assertEqual(len(results), 12)
+        self.assertEqual(results['john@mailinator.com'], 'disposable')
+        self.assertEqual(results['not an email'], 'invalid')
+        self.assertEqual(len(self.server.jobs[1]), 10)
+        self.assertEqual(self.prefilter.avoided, 3)
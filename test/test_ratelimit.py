@@ -0,0 +1,53 @@
+import os
+import shutil
+import tempfile
+import time
+from unittest import TestCase
+from neverbounce.client import NeverBounce
+from neverbounce.ratelimit import FileRateLimiter, RateLimiter
+from neverbounce.testing import FakeNeverBounceServer
+
+
+class RateLimiterTestCase(TestCase):
+    def test_burst(self):
+        limiter = RateLimiter(1, burst=5)
+        start = time.time()
+        for _ in range(5):
+            limiter.acquire()
+        self.assertLess(time.time() - start, 0.5)
+
+    def test_rate(self):
+        limiter = RateLimiter(100)
+        start = time.time()
+        for _ in range(11):
+            limiter.acquire()
+        self.assertGreaterEqual(time.time() - start, 0.09)
+
+    def test_invalid_rate(self):
+        with self.assertRaises(ValueError):
+            RateLimiter(0)
+
+
+class FileRateLimiterTestCase(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.path = os.path.join(self.directory, 'ratelimit')
+
+    def test_shared_rate(self):
+        limiters = [FileRateLimiter(self.path, 100) for _ in range(2)]
+        for limiter in limiters:
+            self.addCleanup(limiter.close)
+        start = time.time()
+        for _ in range(6):
+            for limiter in limiters:
+                limiter.acquire()
+        self.assertGreaterEqual(time.time() - start, 0.1)
+
+    def test_client_rate_limit(self):
+        with FakeNeverBounceServer() as server:
+            with NeverBounce('fake_user_name', 'fake_api_key', server.base_url, rate_limit=100) as neverbounce:
+                neverbounce.access_token()
+                start = time.time()
+                list(neverbounce.verify_many(['john.doe@example.com'] * 11, max_workers=4))
+                self.assertGreaterEqual(time.time() - start, 0.09)
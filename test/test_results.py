@@ -0,0 +1,67 @@
+from unittest import TestCase
+from neverbounce.exceptions import InvalidResponseError
+from neverbounce.results import ResultsParser, ResultBatch, iter_batches, iter_rows
+
+
+def split(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class ResultsParserTestCase(TestCase):
+    def setUp(self):
+        self.data = b'john.doe@gmail.com,valid\nadmin@example.com,catchall\njane.doe@example.com,invalid\n'
+        self.rows = [('john.doe@gmail.com', 0), ('admin@example.com', 3), ('jane.doe@example.com', 1)]
+
+    def test_chunk_boundaries(self):
+        for size in range(1, len(self.data) + 1):
+            self.assertListEqual(list(iter_rows(split(self.data, size))), self.rows)
+
+    def test_without_trailing_line_break(self):
+        self.assertListEqual(list(iter_rows([self.data.rstrip(b'\n')])), self.rows)
+
+    def test_crlf_and_blank_lines(self):
+        data = self.data.replace(b'\n', b'\r\n') + b'\r\n'
+        self.assertListEqual(list(iter_rows(split(data, 7))), self.rows)
+
+    def test_extra_columns(self):
+        data = b'john.doe@gmail.com,John,Doe,valid\nadmin@example.com,,,catchall\n'
+        self.assertListEqual(list(iter_rows([data])), [('john.doe@gmail.com', 0), ('admin@example.com', 3)])
+
+    def test_email_column(self):
+        data = b'John,john.doe@gmail.com,valid\n'
+        self.assertListEqual(list(iter_rows([data], email_column=1)), [('john.doe@gmail.com', 0)])
+
+    def test_quoted_fields(self):
+        data = b'"doe, john@gmail.com","Doe,\nJohn",valid\n"admin@example.com",x,catchall\n'
+        expected = [('doe, john@gmail.com', 0), ('admin@example.com', 3)]
+        for size in range(1, len(data) + 1):
+            self.assertListEqual(list(iter_rows(split(data, size))), expected)
+
+    def test_non_ascii(self):
+        data = 'jöhn@exämple.com,valid\n'.encode('utf-8')
+        self.assertListEqual(list(iter_rows(split(data, 3))), [('jöhn@exämple.com', 0)])
+
+    def test_quoted_non_ascii(self):
+        data = '"jöhn@exämple.com","Döe, Jöhn",valid\n'.encode('utf-8')
+        self.assertListEqual(list(iter_rows(split(data, 3))), [('jöhn@exämple.com', 0)])
+
+    def test_invalid_result(self):
+        with self.assertRaises(InvalidResponseError):
+            ResultsParser().feed(b'john.doe@gmail.com,maybe\n')
+
+
+class ResultBatchTestCase(TestCase):
+    def test_batches(self):
+        data = b''.join('user{}@example.com,unknown\n'.format(i).encode('ascii') for i in range(100))
+        batches = list(iter_batches(split(data, 100), batch_size=30))
+        self.assertTrue(all(len(batch) >= 30 for batch in batches[:-1]))
+        self.assertEqual(sum(len(batch) for batch in batches), 100)
+        self.assertEqual(batches[0].emails[0], 'user0@example.com')
+        self.assertEqual(batches[0].result_codes.typecode, 'b')
+        self.assertEqual(set(batches[-1].result_codes), {4})
+
+    def test_iter(self):
+        batch = ResultBatch()
+        batch.extend([('john.doe@gmail.com', 0), ('admin@example.com', 3)])
+        self.assertListEqual([str(verified) for verified in batch],
+                             ['john.doe@gmail.com: valid', 'admin@example.com: catchall'])
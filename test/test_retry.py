@@ -0,0 +1,124 @@
+import time
+from email.utils import formatdate
+from unittest import TestCase
+import requests
+from neverbounce.client import NeverBounce
+from neverbounce.exceptions import CircuitOpenError, NeverBounceAPIError
+from neverbounce.retry import CircuitBreaker, RetryPolicy, is_transient, retry_after
+from neverbounce.testing import FakeNeverBounceServer
+
+
+class RetryPolicyTestCase(TestCase):
+    def test_delay(self):
+        policy = RetryPolicy(backoff=1, max_backoff=3)
+        for attempt in range(1, 5):
+            self.assertLessEqual(policy.delay(attempt), min(2 ** (attempt - 1), 3))
+
+    def test_is_transient(self):
+        self.assertTrue(is_transient(requests.ConnectionError()))
+        self.assertTrue(is_transient(requests.Timeout()))
+        self.assertFalse(is_transient(ValueError()))
+
+    def test_retry_after_date(self):
+        error = requests.HTTPError(response=requests.Response())
+        error.response.headers['Retry-After'] = formatdate(time.time() + 30, usegmt=True)
+        self.assertTrue(25 < retry_after(error) <= 30)
+
+    def test_budget(self):
+        policy = RetryPolicy(max_attempts=10, backoff=0, budget_ratio=0, min_budget=3)
+        calls = []
+
+        def fail():
+            calls.append(1)
+            raise requests.ConnectionError()
+
+        with self.assertRaises(requests.ConnectionError):
+            policy.call(fail)
+        self.assertEqual(len(calls), 4)
+        with self.assertRaises(requests.ConnectionError):
+            policy.call(fail)
+        self.assertEqual(len(calls), 5)
+        self.assertEqual(policy.retries, 3)
+
+
+class RetryTestCase(TestCase):
+    def setUp(self):
+        self.server = FakeNeverBounceServer().start()
+        self.addCleanup(self.server.stop)
+        self.neverbounce = NeverBounce('fake_user_name', 'fake_api_key', self.server.base_url,
+                                       retry=RetryPolicy(backoff=0.01))
+        self.addCleanup(self.neverbounce.close)
+        self.neverbounce.access_token()
+
+    def test_retry_idempotent_call(self):
+        job_id = self.neverbounce.create_job(['john.doe@example.com']).job_id
+        self.server.errors.extend([503, 502])
+        self.assertTrue(self.neverbounce.check_job(job_id).is_completed)
+        self.assertEqual(self.server.calls['status'], 3)
+        self.server.errors.append(500)
+        self.assertEqual([v.email for v in self.neverbounce.results(job_id)], ['john.doe@example.com'])
+        self.assertEqual(self.server.calls['download'], 2)
+
+    def test_no_retry_of_billable_call(self):
+        self.server.errors.append(503)
+        with self.assertRaises(NeverBounceAPIError) as cm:
+            self.neverbounce.create_job(['john.doe@example.com'])
+        self.assertEqual(cm.exception.status_code, 503)
+        self.assertEqual(str(cm.exception), 'HTTP status 503')
+        self.assertEqual(self.server.calls['bulk'], 1)
+
+    def test_retry_after(self):
+        self.server.errors.append(429)
+        self.server.retry_after = 0.2
+        start = time.time()
+        self.neverbounce.account()
+        self.assertGreaterEqual(time.time() - start, 0.2)
+        self.assertEqual(self.server.calls['account'], 2)
+
+    def test_max_attempts(self):
+        self.server.errors.extend([503] * 5)
+        with self.assertRaises(NeverBounceAPIError):
+            self.neverbounce.account()
+        self.assertEqual(self.server.calls['account'], 4)
+
+    def test_error_rate(self):
+        self.server.error_rate = 0.1
+        for _ in range(20):
+            self.neverbounce.account()
+        self.assertGreaterEqual(self.server.calls['account'], 20)
+
+
+class CircuitBreakerTestCase(TestCase):
+    def setUp(self):
+        self.server = FakeNeverBounceServer().start()
+        self.addCleanup(self.server.stop)
+        self.circuit_breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.2)
+        self.neverbounce = NeverBounce('fake_user_name', 'fake_api_key', self.server.base_url, retry=False,
+                                       circuit_breaker=self.circuit_breaker)
+        self.addCleanup(self.neverbounce.close)
+        self.neverbounce.access_token()
+
+    def test_open_and_close(self):
+        self.server.errors.extend([503, 503, 503])
+        for _ in range(2):
+            with self.assertRaises(NeverBounceAPIError):
+                self.neverbounce.account()
+        with self.assertRaises(CircuitOpenError) as cm:
+            self.neverbounce.account()
+        self.assertLessEqual(cm.exception.retry_in, 0.2)
+        self.assertEqual(self.server.calls['account'], 2)
+        time.sleep(0.2)
+        with self.assertRaises(NeverBounceAPIError):
+            self.neverbounce.account()
+        self.assertEqual(self.circuit_breaker.state, CircuitBreaker.OPEN)
+        time.sleep(0.2)
+        self.neverbounce.account()
+        self.assertEqual(self.circuit_breaker.state, CircuitBreaker.CLOSED)
+        self.assertEqual(self.server.calls['account'], 4)
+
+    def test_client_errors_keep_circuit_closed(self):
+        self.server.errors.extend([400, 400, 400])
+        for _ in range(3):
+            with self.assertRaises(NeverBounceAPIError):
+                self.neverbounce.account()
+        self.assertEqual(self.circuit_breaker.state, CircuitBreaker.CLOSED)
@@ -0,0 +1,83 @@
+import gc
+import threading
+import time
+from unittest import TestCase
+from neverbounce.client import NeverBounce
+from neverbounce.scheduler import BULK, POLLING, REALTIME, RequestScheduler
+from neverbounce.testing import FakeNeverBounceServer
+
+
+class RequestSchedulerTestCase(TestCase):
+    def queue(self, scheduler, priority_class, order):
+        def acquire():
+            scheduler.acquire(priority_class)
+            order.append(priority_class)
+        thread = threading.Thread(target=acquire)
+        thread.start()
+        time.sleep(0.02)
+        return thread
+
+    def test_priority_class(self):
+        self.assertEqual(RequestScheduler.priority_class('single'), REALTIME)
+        self.assertEqual(RequestScheduler.priority_class('status'), POLLING)
+        self.assertEqual(RequestScheduler.priority_class('download'), BULK)
+
+    def test_realtime_goes_first(self):
+        scheduler = RequestScheduler(max_concurrency=1)
+        scheduler.acquire(BULK)
+        order = []
+        threads = [self.queue(scheduler, priority_class, order) for priority_class in (BULK, POLLING, REALTIME)]
+        self.assertEqual(scheduler.stats[BULK]['queued'], 1)
+        for _ in threads:
+            scheduler.release(BULK if not order else order[-1])
+            time.sleep(0.02)
+        for thread in threads:
+            thread.join(1)
+        self.assertListEqual(order, [REALTIME, POLLING, BULK])
+
+    def test_budgets(self):
+        scheduler = RequestScheduler({BULK: 1}, max_concurrency=3)
+        scheduler.acquire(BULK)
+        order = []
+        thread = self.queue(scheduler, BULK, order)
+        scheduler.acquire(REALTIME)
+        self.assertListEqual(order, [])
+        stats = scheduler.stats
+        self.assertEqual(stats[BULK]['in_flight'], 1)
+        self.assertEqual(stats[BULK]['queued'], 1)
+        self.assertEqual(stats[REALTIME]['in_flight'], 1)
+        scheduler.release(BULK)
+        thread.join(1)
+        self.assertListEqual(order, [BULK])
+        self.assertEqual(scheduler.stats[BULK]['max_queued'], 1)
+        self.assertGreater(scheduler.stats[BULK]['wait_mean'], 0)
+
+
+class ClientSchedulerTestCase(TestCase):
+    def test_scheduled_calls(self):
+        scheduler = RequestScheduler()
+        with FakeNeverBounceServer() as server:
+            with NeverBounce('fake_user_name', 'fake_api_key', server.base_url, scheduler=scheduler) as neverbounce:
+                neverbounce.verify('a@example.com')
+                job_id = neverbounce.create_job(['b@example.com', 'c@example.com']).job_id
+                neverbounce.check_job(job_id)
+                stream = neverbounce._call(endpoint='download', data={'job_id': job_id}, stream=True)
+                self.assertEqual(scheduler.stats[BULK]['in_flight'], 1)
+                self.assertEqual(len(list(stream)), 1)
+        stats = scheduler.stats
+        self.assertDictEqual(dict((name, stats[name]['requests']) for name in stats),
+                             {REALTIME: 2, POLLING: 1, BULK: 2})
+        self.assertEqual(sum(stats[name]['in_flight'] for name in stats), 0)
+
+    def test_dropped_stream_releases_slot(self):
+        scheduler = RequestScheduler({BULK: 1})
+        with FakeNeverBounceServer() as server:
+            with NeverBounce('fake_user_name', 'fake_api_key', server.base_url, scheduler=scheduler) as neverbounce:
+                job_id = neverbounce.create_job(['a@example.com']).job_id
+                stream = neverbounce._call(endpoint='download', data={'job_id': job_id}, stream=True)
+                self.assertEqual(scheduler.stats[BULK]['in_flight'], 1)
+                del stream
+                gc.collect()
+                self.assertEqual(scheduler.stats[BULK]['in_flight'], 0)
+                stream = neverbounce._call(endpoint='download', data={'job_id': job_id}, stream=True)
+                self.assertEqual(len(list(stream)), 1)
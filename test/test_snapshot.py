@@ -0,0 +1,100 @@
+import csv
+import io
+import os
+import shutil
+import tempfile
+import time
+from unittest import TestCase
+from neverbounce.cache import DAY
+from neverbounce.client import NeverBounce
+from neverbounce.exceptions import JobFailedError
+from neverbounce.snapshot import Snapshot, email_hash
+from neverbounce.testing import FakeNeverBounceServer
+
+
+class SnapshotTestCase(TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, 'snapshot.csv')
+
+    def write(self, text):
+        with io.open(self.path, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+    def test_load(self):
+        self.write('email,result,verified_at\nJohn@Example.com,valid,1000\nb@example.com,catchall,2000\n'
+                   'c@example.com,bogus,3000\n')
+        snapshot = Snapshot(self.path)
+        self.assertEqual(len(snapshot), 2)
+        self.assertEqual(snapshot.get(' john@example.com'), (0, 1000))
+        self.assertEqual(snapshot.get('b@example.com'), (3, 2000))
+        self.assertIsNone(snapshot.get('c@example.com'))
+
+    def test_non_ascii(self):
+        self.write(u'email,result,verified_at\n"jöhn@exämple.com",invalid,1000\n')
+        self.assertEqual(Snapshot(self.path).get(u'Jöhn@exämple.com'), (1, 1000))
+
+    def test_results_file_without_times(self):
+        self.write('email,result\na@example.com,invalid\n')
+        self.assertEqual(Snapshot(self.path, verified_at=500).get('a@example.com'), (1, 500))
+        self.write('name,a@example.com,valid\n')
+        self.assertEqual(Snapshot(self.path, verified_at=500, email_column=1).get('a@example.com'), (0, 500))
+
+    def test_missing_file(self):
+        self.assertEqual(len(Snapshot(self.path)), 0)
+
+    def test_email_hash(self):
+        self.assertEqual(email_hash(' John@Example.com'), email_hash('john@example.com'))
+        self.assertNotEqual(email_hash('a@example.com'), email_hash('b@example.com'))
+        self.assertLess(email_hash('a@example.com'), 2 ** 64)
+
+
+class ReverifyTestCase(TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, 'snapshot.csv')
+        self.server = FakeNeverBounceServer().start()
+        self.addCleanup(self.server.stop)
+        self.server.job_duration = 0
+        now = int(time.time())
+        with io.open(self.path, 'w', encoding='utf-8') as f:
+            f.write('email,result,verified_at\n')
+            f.write('fresh@example.com,valid,{}\n'.format(now - DAY))
+            f.write('stale@example.com,valid,{}\n'.format(now - 365 * DAY))
+            f.write('catchall@example.com,catchall,{}\n'.format(now - 10 * DAY))
+            f.write('removed@example.com,invalid,{}\n'.format(now))
+
+    def test_reverify(self):
+        emails = ['fresh@example.com', 'stale@example.com', 'catchall@example.com', 'new@example.com',
+                  'NEW@example.com ']
+        with NeverBounce('fake_user_name', 'fake_api_key', self.server.base_url) as neverbounce:
+            stats = neverbounce.reverify(self.path, emails, self.path, max_ages={'catchall': 30 * DAY},
+                                         chunk_size=1)
+        self.assertDictEqual(stats, {'total': 4, 'fresh': 2, 'stale': 1, 'new': 1, 'dropped': 1})
+        self.assertEqual(self.server.calls['bulk'], 2)
+        with io.open(self.path, encoding='utf-8') as f:
+            rows = list(csv.reader(f))
+        self.assertListEqual(rows[0], ['email', 'result', 'verified_at'])
+        self.assertListEqual(sorted(row[0] for row in rows[1:]),
+                             ['catchall@example.com', 'fresh@example.com', 'new@example.com', 'stale@example.com'])
+        self.assertGreater(Snapshot(self.path).get('stale@example.com')[1], time.time() - 60)
+
+    def test_nothing_to_verify(self):
+        with NeverBounce('fake_user_name', 'fake_api_key', self.server.base_url) as neverbounce:
+            stats = neverbounce.reverify(Snapshot(self.path), ['fresh@example.com'], self.path + '.new')
+        self.assertEqual(stats['fresh'], 1)
+        self.assertEqual(self.server.calls['bulk'], 0)
+
+    def test_failed_verification_leaves_snapshot(self):
+        handle_status = self.server.handle_status
+        self.server.handle_status = lambda form: dict(handle_status(form), status='5')
+        with io.open(self.path, encoding='utf-8') as f:
+            previous = f.read()
+        with NeverBounce('fake_user_name', 'fake_api_key', self.server.base_url) as neverbounce:
+            with self.assertRaises(JobFailedError):
+                neverbounce.reverify(self.path, ['new@example.com'], self.path)
+        with io.open(self.path, encoding='utf-8') as f:
+            self.assertEqual(f.read(), previous)
+        self.assertFalse(os.path.exists(self.path + '.tmp'))
@@ -0,0 +1,86 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from requests.exceptions import ChunkedEncodingError, ConnectionError
+from neverbounce.client import NeverBounce
+from neverbounce.spool import ResultsSpool
+from neverbounce.testing import FakeNeverBounceServer
+
+
+class DownloadResultsTestCase(TestCase):
+    def setUp(self):
+        self.server = FakeNeverBounceServer().start()
+        self.addCleanup(self.server.stop)
+        self.neverbounce = NeverBounce('fake_user_name', 'fake_api_key', self.server.base_url)
+        self.addCleanup(self.neverbounce.close)
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, 'results.csv')
+        self.emails = ['user{}@example.com'.format(i) for i in range(30000)]
+        self.job_id = self.neverbounce.create_job(self.emails).job_id
+        self.content = ''.join('{},valid\n'.format(email) for email in self.emails).encode('ascii')
+
+    def read(self):
+        with open(self.path, 'rb') as f:
+            return f.read()
+
+    def test_download(self):
+        spool = self.neverbounce.download_results(self.job_id, self.path)
+        self.assertEqual(self.read(), self.content)
+        self.assertTrue(spool.complete)
+        self.assertEqual(spool.rows, 30000)
+        self.assertEqual(spool.bytes, len(self.content))
+
+    def test_results_from_spool(self):
+        first = [result.email for result in self.neverbounce.results(self.job_id, spool=self.path)]
+        second = [result.email for result in self.neverbounce.results(self.job_id, spool=self.path)]
+        self.assertListEqual(first, self.emails)
+        self.assertListEqual(second, self.emails)
+        self.assertEqual(self.server.calls['download'], 1)
+
+    def test_resume_with_range(self):
+        self.server.download_faults.extend([300000, 300000])
+        spool = self.neverbounce.download_results(self.job_id, self.path, retry_delay=0)
+        self.assertEqual(self.read(), self.content)
+        self.assertEqual(spool.rows, 30000)
+        self.assertEqual(self.server.calls['download'], 3)
+
+    def test_resume_without_range(self):
+        self.server.range_requests = False
+        self.server.download_faults.extend([300000, 300000])
+        self.neverbounce.download_results(self.job_id, self.path, retry_delay=0)
+        self.assertEqual(self.read(), self.content)
+
+    def test_resume_after_restart(self):
+        self.server.download_faults.append(600000)
+        with self.assertRaises((ChunkedEncodingError, ConnectionError)):
+            self.neverbounce.download_results(self.job_id, self.path, max_attempts=1)
+        spool = ResultsSpool(self.path, self.job_id)
+        self.assertFalse(spool.complete)
+        self.assertTrue(0 < spool.bytes < len(self.content))
+        self.assertEqual(spool.rows, self.content.count(b'\n', 0, spool.bytes))
+        self.neverbounce.download_results(self.job_id, self.path)
+        self.assertEqual(self.read(), self.content)
+
+    def test_resume_fully_downloaded(self):
+        def chunks():
+            yield self.content
+            raise ConnectionError('Connection reset by peer')
+        with self.assertRaises(ConnectionError):
+            ResultsSpool(self.path, self.job_id).write(chunks())
+        spool = self.neverbounce.download_results(self.job_id, self.path)
+        self.assertTrue(spool.complete)
+        self.assertEqual(self.read(), self.content)
+        self.assertEqual(self.server.calls['download'], 1)
+
+    def test_checkpoint_of_other_job_is_ignored(self):
+        self.neverbounce.download_results(self.job_id, self.path)
+        other_job_id = self.neverbounce.create_job(self.emails[:10]).job_id
+        spool = self.neverbounce.download_results(other_job_id, self.path)
+        self.assertEqual(spool.rows, 10)
+        self.assertEqual(self.read(), self.content[:spool.bytes])
+
+    def test_empty_results(self):
+        job_id = self.neverbounce.create_job([]).job_id
+        self.assertListEqual(list(self.neverbounce.results(job_id, spool=self.path)), [])
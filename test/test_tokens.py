@@ -0,0 +1,128 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+from unittest import TestCase
+try:
+    from unittest import mock
+except ImportError:  # Python 2
+    import mock
+from neverbounce.client import NeverBounce
+from neverbounce.testing import FakeNeverBounceServer
+from neverbounce.tokens import AccessTokenCache, FileTokenStore
+
+
+class AccessTokenCacheTestCase(TestCase):
+    def setUp(self):
+        self.fetched = []
+
+    def fetch(self, expires_in=3600, delay=0):
+        def fetch():
+            time.sleep(delay)
+            self.fetched.append(None)
+            return 'token_{}'.format(len(self.fetched)), expires_in
+        return fetch
+
+    def test_cached(self):
+        cache = AccessTokenCache(self.fetch(), 'user')
+        self.assertEqual(cache.get(), 'token_1')
+        self.assertEqual(cache.get(), 'token_1')
+
+    def test_refreshed_before_expiry(self):
+        cache = AccessTokenCache(self.fetch(expires_in=3600), 'user', refresh_margin=60)
+        self.assertEqual(cache.get(), 'token_1')
+        with mock.patch('time.time', return_value=time.time() + 3550):
+            self.assertEqual(cache.get(), 'token_2')
+
+    def test_refresh_margin_longer_than_lifetime(self):
+        cache = AccessTokenCache(self.fetch(expires_in=30), 'user', refresh_margin=60)
+        self.assertEqual(cache.get(), 'token_1')
+        self.assertEqual(cache.get(), 'token_1')
+        with mock.patch('time.time', return_value=time.time() + 16):
+            self.assertEqual(cache.get(), 'token_2')
+
+    def test_no_expiry(self):
+        cache = AccessTokenCache(self.fetch(expires_in=None), 'user')
+        cache.get()
+        self.assertEqual(cache.get(), 'token_1')
+
+    def test_invalidate(self):
+        cache = AccessTokenCache(self.fetch(), 'user')
+        cache.get()
+        cache.invalidate('token_1')
+        self.assertEqual(cache.get(), 'token_2')
+        cache.invalidate('token_1')
+        self.assertEqual(cache.get(), 'token_2')
+
+    def test_single_flight(self):
+        cache = AccessTokenCache(self.fetch(delay=0.05), 'user')
+        threads = [threading.Thread(target=cache.get) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(self.fetched), 1)
+
+
+class FileTokenStoreTestCase(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.store = FileTokenStore(os.path.join(self.directory, 'tokens.json'))
+
+    def test_load_missing(self):
+        self.assertIsNone(self.store.load('user'))
+
+    def test_save_and_load(self):
+        self.store.save('user', 'token', 1000.0)
+        self.assertEqual(self.store.load('user'), ('token', 1000.0))
+
+    def test_delete(self):
+        self.store.save('user', 'token', None)
+        self.store.delete('user', 'other_token')
+        self.assertEqual(self.store.load('user'), ('token', None))
+        self.store.delete('user', 'token')
+        self.assertIsNone(self.store.load('user'))
+
+    def test_shared_between_clients(self):
+        with FakeNeverBounceServer() as server:
+            for _ in range(3):
+                with NeverBounce('fake_user_name', 'fake_api_key', server.base_url, token_store=self.store) as client:
+                    client.account()
+            self.assertEqual(server.calls['access_token'], 1)
+            self.assertEqual(server.calls['account'], 3)
+
+
+class ClientAccessTokenTestCase(TestCase):
+    def setUp(self):
+        self.server = FakeNeverBounceServer().start()
+        self.addCleanup(self.server.stop)
+        self.neverbounce = NeverBounce('fake_user_name', 'fake_api_key', self.server.base_url)
+        self.addCleanup(self.neverbounce.close)
+
+    def test_concurrent_callers_share_refresh(self):
+        handle_access_token = self.server.handle_access_token
+        self.server.handle_access_token = lambda form: time.sleep(0.05) or handle_access_token(form)
+        threads = [threading.Thread(target=self.neverbounce.account) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.server.calls['access_token'], 1)
+        self.assertEqual(self.server.calls['account'], 10)
+
+    def test_refreshed_before_expiry(self):
+        self.server.handle_access_token = lambda form: {'access_token': 'fake_token', 'expires_in': 30}
+        self.neverbounce.account()
+        with mock.patch('time.time', return_value=time.time() + 16):
+            self.neverbounce.account()
+        self.assertEqual(self.server.calls['access_token'], 2)
+        self.assertEqual(self.server.calls['account'], 2)
+
+    def test_rejected_token_is_refreshed(self):
+        self.neverbounce.account()
+        self.server.access_token = 'new_fake_token'
+        self.neverbounce.account()
+        self.assertEqual(self.server.calls['access_token'], 2)
+        self.assertEqual(self.server.calls['account'], 3)
@@ -0,0 +1,89 @@
+import io
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from neverbounce.client import NeverBounce
+from neverbounce.exceptions import AccessTokenExpired
+from neverbounce.testing import FakeNeverBounceServer
+from neverbounce.upload import EmailSource, encode_form
+
+try:
+    from urllib.parse import parse_qs
+except ImportError:  # Python 2
+    from urlparse import parse_qs
+
+
+class EmailSourceTestCase(TestCase):
+    def setUp(self):
+        self.emails = ['john.doe@example.com', 'jane.doe@example.com', 'admin@example.com']
+        self.content = b'john.doe@example.com\njane.doe@example.com\nadmin@example.com\n'
+
+    def test_list(self):
+        source = EmailSource(self.emails, chunk_size=30)
+        self.assertListEqual(list(source.chunks()), [
+            b'john.doe@example.com\njane.doe@example.com\n', b'admin@example.com\n'
+        ])
+        self.assertTrue(source.replayable)
+        self.assertEqual(b''.join(source.chunks()), self.content)
+
+    def test_generator(self):
+        source = EmailSource(email for email in self.emails)
+        self.assertFalse(source.replayable)
+        self.assertEqual(b''.join(source.chunks()), self.content)
+        with self.assertRaises(ValueError):
+            list(source.chunks())
+
+    def test_file_object(self):
+        f = io.StringIO(self.content.decode('utf-8'))
+        source = EmailSource(f, chunk_size=10)
+        self.assertTrue(source.replayable)
+        self.assertEqual(b''.join(source.chunks()), self.content)
+        self.assertEqual(b''.join(source.chunks()), self.content)
+
+    def test_path(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'emails.csv')
+        with open(path, 'wb') as f:
+            f.write(self.content)
+        self.assertEqual(b''.join(EmailSource(path, chunk_size=7).chunks()), self.content)
+
+
+class EncodeFormTestCase(TestCase):
+    def test_encode_form(self):
+        body = b''.join(encode_form({'access_token': 'token', 'input_location': '1'}, 'input',
+                                    [b'john+doe@example.com\n', b'jane&doe@example.com\n']))
+        self.assertEqual(parse_qs(body.decode('ascii')), {
+            'access_token': ['token'], 'input_location': ['1'],
+            'input': ['john+doe@example.com\njane&doe@example.com\n']
+        })
+
+
+class CreateJobTestCase(TestCase):
+    def setUp(self):
+        self.server = FakeNeverBounceServer().start()
+        self.addCleanup(self.server.stop)
+        self.neverbounce = NeverBounce('fake_user_name', 'fake_api_key', self.server.base_url)
+        self.addCleanup(self.neverbounce.close)
+        self.emails = ['user{}@example.com'.format(i) for i in range(5000)]
+
+    def test_streamed_list(self):
+        job = self.neverbounce.create_job(self.emails)
+        self.assertListEqual(self.server.jobs[job.job_id], self.emails)
+
+    def test_streamed_generator(self):
+        job = self.neverbounce.create_job(email for email in self.emails)
+        self.assertListEqual(self.server.jobs[job.job_id], self.emails)
+
+    def test_expired_access_token_resends_replayable_input(self):
+        self.neverbounce.access_token()
+        self.server.access_token = 'new_fake_token'
+        job = self.neverbounce.create_job(self.emails)
+        self.assertListEqual(self.server.jobs[job.job_id], self.emails)
+
+    def test_expired_access_token_one_shot_input(self):
+        self.neverbounce.access_token()
+        self.server.access_token = 'new_fake_token'
+        with self.assertRaises(AccessTokenExpired):
+            self.neverbounce.create_job(email for email in self.emails)
@@ -0,0 +1,72 @@
+import json
+import time
+from concurrent.futures import TimeoutError
+from unittest import TestCase
+import requests
+from neverbounce.client import NeverBounce
+from neverbounce.exceptions import JobFailedError
+from neverbounce.testing import FakeNeverBounceServer
+from neverbounce.waiter import JobWaiter, WebhookReceiver
+
+
+class JobWaiterTestCase(TestCase):
+    def setUp(self):
+        self.server = FakeNeverBounceServer().start()
+        self.addCleanup(self.server.stop)
+        self.neverbounce = NeverBounce('fake_user_name', 'fake_api_key', self.server.base_url)
+        self.addCleanup(self.neverbounce.close)
+        self.emails = ['user{}@example.com'.format(i) for i in range(100)]
+
+    def test_wait_for_jobs(self):
+        job_ids = [self.neverbounce.create_job(self.emails).job_id for _ in range(3)]
+        completed = []
+        statuses = list(self.neverbounce.wait_for_jobs(job_ids, callback=completed.append))
+        self.assertListEqual(sorted(status.job_id for status in statuses), job_ids)
+        self.assertTrue(all(status.is_completed for status in statuses))
+        time.sleep(0.01)
+        self.assertListEqual(sorted(status.job_id for status in completed), job_ids)
+
+    def test_adaptive_polling(self):
+        self.server.job_duration = 0.5
+        job_ids = [self.neverbounce.create_job(self.emails).job_id for _ in range(10)]
+        waiter = JobWaiter(self.neverbounce, min_poll_interval=0.01, max_poll_interval=1)
+        self.addCleanup(waiter.close)
+        self.assertEqual(len(list(waiter.wait(job_ids))), 10)
+        self.assertLess(self.server.calls['status'], 10 * 15)
+
+    def test_add_after_close(self):
+        job_id = self.neverbounce.create_job(self.emails).job_id
+        waiter = JobWaiter(self.neverbounce, min_poll_interval=0.01)
+        waiter.close()
+        with self.assertRaises(ValueError):
+            waiter.add(job_id)
+
+    def test_failed_job(self):
+        handle_status = self.server.handle_status
+        self.server.handle_status = lambda form: dict(handle_status(form), status='5')
+        job_id = self.neverbounce.create_job(self.emails).job_id
+        with self.assertRaises(JobFailedError) as cm:
+            list(self.neverbounce.wait_for_jobs([job_id]))
+        self.assertEqual(cm.exception.job_status.job_id, job_id)
+
+    def test_timeout(self):
+        self.server.job_duration = 10
+        job_id = self.neverbounce.create_job(self.emails).job_id
+        with self.assertRaises(TimeoutError):
+            list(self.neverbounce.wait_for_jobs([job_id], timeout=0.1))
+
+    def test_webhook_notification(self):
+        self.server.job_duration = 0.2
+        job_id = self.neverbounce.create_job(self.emails).job_id
+        waiter = JobWaiter(self.neverbounce, min_poll_interval=60, max_poll_interval=60)
+        self.addCleanup(waiter.close)
+        with WebhookReceiver(waiter) as receiver:
+            future = waiter.add(job_id)
+            time.sleep(0.3)
+            self.assertFalse(future.done())
+            response = requests.post(receiver.url, data=json.dumps({'job_id': job_id}),
+                                     headers={'Content-Type': 'application/json'})
+            self.assertEqual(response.status_code, 204)
+            self.assertTrue(future.result(timeout=1).is_completed)
+            self.assertEqual(requests.post(receiver.url, data={'job': 1}).status_code, 400)
+        self.assertEqual(self.server.calls['status'], 2)